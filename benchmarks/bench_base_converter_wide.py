@@ -0,0 +1,83 @@
+"""
+基数変換の大きな整数向け関数 (*_wide) と既存関数の比較ベンチマーク
+16 / 64 / 1024 / 4096 ビットで、1回あたりの実行時間と確保メモリ (tracemalloc) を測定する。
+
+実行:
+    python -m benchmarks.bench_base_converter_wide
+"""
+
+import random
+import timeit
+import tracemalloc
+
+from tools.base_converter import (
+    convert_bin_to_dec_hex,
+    convert_bin_to_dec_hex_wide,
+    convert_binary_4digit_grouping,
+    convert_dec_to_bin,
+    convert_dec_to_bin_hex_wide,
+    convert_dec_to_hex,
+    convert_hex_to_bin_dec,
+    convert_hex_to_bin_dec_wide,
+)
+
+BIT_LENGTHS = [16, 64, 1024, 4096]
+
+
+def measure(func, repeat):
+    """1回あたりの実行時間 (マイクロ秒) と、1回の呼び出しで確保されたメモリのピーク (バイト)"""
+    seconds = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds * 1e6, peak
+
+
+def build_cases(bit_length):
+    value = random.getrandbits(bit_length)
+    hex_input = f"{value:0{bit_length // 4}X}"
+    binary_input = f"{value:0{bit_length}b}"
+    signed = value - (1 << bit_length) if value >> (bit_length - 1) else value
+
+    return [
+        (
+            "16進 → 2進/10進 (4桁区切り)",
+            lambda: convert_binary_4digit_grouping(convert_hex_to_bin_dec(hex_input)[0]),
+            lambda: convert_hex_to_bin_dec_wide(hex_input, grouping=True),
+        ),
+        (
+            "2進 → 10進/16進",
+            lambda: convert_bin_to_dec_hex(binary_input),
+            lambda: convert_bin_to_dec_hex_wide(binary_input),
+        ),
+        (
+            "10進 → 2進/16進 (4桁区切り)",
+            lambda: (
+                convert_binary_4digit_grouping(convert_dec_to_bin(signed, bit_length)),
+                convert_dec_to_hex(signed, bit_length),
+            ),
+            lambda: convert_dec_to_bin_hex_wide(signed, bit_length, grouping=True),
+        ),
+    ]
+
+
+def main():
+    random.seed(0)
+    print(f"{'bits':>5}  {'case':<28} {'current us':>11} {'wide us':>9} {'speedup':>8} "
+          f"{'current B':>10} {'wide B':>8}")
+    for bit_length in BIT_LENGTHS:
+        repeat = max(200, 200_000 // bit_length)
+        for name, current, wide in build_cases(bit_length):
+            current_us, current_bytes = measure(current, repeat)
+            wide_us, wide_bytes = measure(wide, repeat)
+            print(
+                f"{bit_length:>5}  {name:<28} {current_us:>11.2f} {wide_us:>9.2f} "
+                f"{current_us / wide_us:>7.1f}x {current_bytes:>10,} {wide_bytes:>8,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
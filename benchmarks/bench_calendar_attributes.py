@@ -0,0 +1,62 @@
+"""
+暦情報（六曜、十二支、月和名、祝日）の計算速度の比較
+日ごとの関数呼び出しと、期間をまとめて計算する build_calendar_attributes を比較する。
+
+実行:
+    python -m benchmarks.bench_calendar_attributes
+"""
+
+import time
+import warnings
+from datetime import date, timedelta
+
+import jpholiday
+
+from tools.datetime_utils import (
+    build_calendar_attributes,
+    calculate_rokuyo,
+    get_month_wamei,
+    get_zyunisi,
+)
+
+# lunardate の fromSolarDate などの非推奨警告を抑止する
+warnings.simplefilter("ignore", DeprecationWarning)
+
+
+def per_date(start, end):
+    rows = []
+    d = start
+    while d <= end:
+        rows.append(
+            (
+                calculate_rokuyo(d),
+                get_zyunisi(d.year),
+                get_month_wamei(d.month),
+                jpholiday.is_holiday_name(d),
+            )
+        )
+        d += timedelta(days=1)
+    return rows
+
+
+def main():
+    for years in (1, 10, 50):
+        start = date(2000, 1, 1)
+        end = date(2000 + years, 1, 1) - timedelta(days=1)
+
+        t = time.perf_counter()
+        per_date(start, end)
+        per_date_seconds = time.perf_counter() - t
+
+        t = time.perf_counter()
+        build_calendar_attributes(start, end)
+        range_seconds = time.perf_counter() - t
+
+        print(
+            f"{years:>3} 年分: 日ごと {per_date_seconds:.3f} 秒, "
+            f"期間まとめて {range_seconds:.3f} 秒 ({per_date_seconds / range_seconds:.0f} 倍)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+最長一致検索インデックス (build_prefix_index / lookup_prefix_batch) の測定
+ランダムな 500,000 個の IPv4 ネットワーク (/8〜/32) に対して、100万件の IPv4 アドレスを検索する。
+
+実行:
+    python -m benchmarks.bench_cidr_index
+"""
+
+import ipaddress
+import time
+
+import numpy as np
+
+from tools.cidr_checker import build_prefix_index, lookup_prefix, lookup_prefix_batch
+
+NETWORK_COUNT = 500_000
+LOOKUP_COUNT = 1_000_000
+
+
+def random_networks(rng, count):
+    prefix_lengths = rng.integers(8, 33, count)
+    addresses = rng.integers(0, 1 << 32, count, dtype=np.uint64)
+    return [
+        ipaddress.IPv4Network((address >> (32 - length) << (32 - length), length))
+        for address, length in zip(addresses.tolist(), prefix_lengths.tolist())
+    ]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    networks = random_networks(rng, NETWORK_COUNT)
+
+    start = time.perf_counter()
+    prefix_index = build_prefix_index(networks)
+    print(
+        f"インデックス作成: {time.perf_counter() - start:.2f} 秒 "
+        f"({NETWORK_COUNT:,} ネットワーク → {len(prefix_index.v4_starts):,} 区間)"
+    )
+
+    ips = rng.integers(0, 1 << 32, LOOKUP_COUNT, dtype=np.uint64).astype(np.uint32)
+
+    start = time.perf_counter()
+    owners = lookup_prefix_batch(prefix_index, ips)
+    elapsed = time.perf_counter() - start
+    print(
+        f"一括検索: {LOOKUP_COUNT:,} 件 {elapsed:.3f} 秒 ({LOOKUP_COUNT / elapsed:,.0f} 件/秒, "
+        f"一致 {(owners >= 0).sum():,} 件)"
+    )
+
+    singles = [str(ipaddress.IPv4Address(int(ip))) for ip in ips[:100_000]]
+    start = time.perf_counter()
+    for ip in singles:
+        lookup_prefix(prefix_index, ip)
+    elapsed = time.perf_counter() - start
+    print(f"1件ずつ検索: {len(singles):,} 件 {elapsed:.3f} 秒 ({len(singles) / elapsed:,.0f} 件/秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+文字コード判定 (detect_encoding) と1文字ごとの復号 (iter_decoded_characters) の速度測定
+日本語のログを模した約 8MB のテキストを各文字コードで符号化し、1MB ずつのチャンクで判定する。
+
+実行:
+    python -m benchmarks.bench_encoding_detection
+"""
+
+import random
+import time
+
+from tools.ascii_converter import TEXT_ENCODINGS, detect_encoding, iter_decoded_characters
+
+CORPUS_SIZE = 8 << 20
+CHUNK_SIZE = 1 << 20
+
+LOG_MESSAGES = [
+    "ユーザー {user} がログインしました",
+    "ファイル /var/log/app{n}.log の書き込みに失敗しました (errno={n})",
+    "接続がタイムアウトしました。再試行します ({n}回目)",
+    "注文番号 {n} の処理を開始: 東京都千代田区 配送センター",
+    "警告: ディスク使用率が {n}% を超えました",
+    "ﾊﾞｯﾁ処理 {n} 件完了",
+]
+
+
+def build_corpus(rng, size):
+    lines = []
+    length = 0
+    while length < size:
+        message = rng.choice(LOG_MESSAGES).format(user=f"user{rng.randrange(1000)}", n=rng.randrange(100))
+        line = f"2026-10-18 10:{rng.randrange(60):02d}:{rng.randrange(60):02d} [INFO] {message}\n"
+        lines.append(line)
+        length += len(line.encode("utf-8"))
+    return "".join(lines)
+
+
+def main():
+    corpus = build_corpus(random.Random(0), CORPUS_SIZE)
+    for label, encoding in TEXT_ENCODINGS.items():
+        data = corpus.encode(encoding)
+        chunks = [data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+        start = time.perf_counter()
+        guess = detect_encoding(chunks)
+        elapsed = time.perf_counter() - start
+
+        window = data[: 1 << 16]
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_decoded_characters([window], encoding))
+        inspect_elapsed = time.perf_counter() - start
+
+        print(
+            f"{label:<18} 判定: {guess.encoding:<10} {len(data) / elapsed / 1e6:7.1f} MB/秒  "
+            f"1文字ごとの復号: {count / inspect_elapsed:,.0f} 文字/秒"
+        )
+
+
+if __name__ == "__main__":
+    main()
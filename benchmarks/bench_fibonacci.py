@@ -0,0 +1,45 @@
+"""
+フィボナッチ数 F(n) の計算速度の比較
+リストを作る generate_fibonacci、足し算で1項ずつ進める iter_fibonacci、
+高速倍加法の fibonacci / fibonacci_mod を比較する。
+n = 10^6 のリストは全項で数十 GB になるため計測しない。
+
+実行:
+    python -m benchmarks.bench_fibonacci
+"""
+
+import time
+from collections import deque
+
+from tools.math.fibonacci import fibonacci, fibonacci_mod, generate_fibonacci, iter_fibonacci
+
+# リストを作る方法で計測する n の上限 (F(0)〜F(10^5) のリストで約 400 MB)
+LIST_MAX_N = 10 ** 5
+
+MODULUS = 10 ** 9 + 7
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    for exponent in range(3, 7):
+        n = 10 ** exponent
+        if n <= LIST_MAX_N:
+            list_seconds = f"{measure(lambda: generate_fibonacci(n + 1)[-1]):8.4f}秒"
+        else:
+            list_seconds = f"{'-':>9}"
+        generator_seconds = measure(lambda: deque(iter_fibonacci(stop=n + 1), maxlen=1))
+        doubling_seconds = measure(lambda: fibonacci(n))
+        mod_seconds = measure(lambda: fibonacci_mod(n, MODULUS))
+        print(
+            f"n = 10^{exponent}: リスト {list_seconds}, ジェネレータ {generator_seconds:8.4f}秒, "
+            f"高速倍加法 {doubling_seconds:8.4f}秒, mod {MODULUS} {mod_seconds * 1e6:6.1f}μ秒"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+カプレカ数の探索速度の比較
+文字列で分割する find_kaprekar_numbers、NumPy で一括判定する find_kaprekar_numbers_fast、
+10^m - 1 の約数から求める find_kaprekar_numbers_by_divisors を比較する。
+
+実行:
+    python -m benchmarks.bench_kaprekar
+"""
+
+import time
+
+from tools.math.kaprekar import (
+    find_kaprekar_numbers,
+    find_kaprekar_numbers_by_divisors,
+    find_kaprekar_numbers_fast,
+)
+
+ENGINES = {
+    "文字列": (find_kaprekar_numbers, 5),
+    "NumPy": (find_kaprekar_numbers_fast, 7),
+    "約数": (find_kaprekar_numbers_by_divisors, 15),
+}
+
+
+def main():
+    for digits in (3, 5, 7, 10, 15):
+        results = []
+        for name, (engine, max_digits) in ENGINES.items():
+            if digits > max_digits:
+                results.append(f"{name} {'-':>8}")
+                continue
+            start = time.perf_counter()
+            count = len(engine(digits))
+            results.append(f"{name} {time.perf_counter() - start:7.3f}秒")
+        print(f"{digits:>2} 桁 ({count:>3} 個): " + ", ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+和暦の一括変換 (convert_seireki_2_wareki_bulk) のスループット測定
+Supabase に接続せず、明治以降の元号データを直接使う。
+
+実行:
+    python -m benchmarks.bench_wareki_bulk
+"""
+
+import time
+
+import numpy as np
+
+from tools.wareki import build_era_index, convert_seireki_2_wareki_bulk
+
+WAREKI_DATA = [
+    {"gengo": "明治", "start_date": "1868-01-25", "end_date": "1912-07-29"},
+    {"gengo": "大正", "start_date": "1912-07-30", "end_date": "1926-12-24"},
+    {"gengo": "昭和", "start_date": "1926-12-25", "end_date": "1989-01-07"},
+    {"gengo": "平成", "start_date": "1989-01-08", "end_date": "2019-04-30"},
+    {"gengo": "令和", "start_date": "2019-05-01", "end_date": "9999-12-31"},
+]
+
+
+def main():
+    era_index = build_era_index(WAREKI_DATA)
+    rng = np.random.default_rng(0)
+    for rows in (100_000, 1_000_000, 5_000_000):
+        # 1900〜2050年の範囲のランダムな日付
+        dates = rng.integers(-25567, 29220, rows).astype("datetime64[D]")
+        start = time.perf_counter()
+        convert_seireki_2_wareki_bulk(era_index, dates)
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>10,} 行: {elapsed:.3f} 秒 ({rows / elapsed:,.0f} 行/秒)")
+
+
+if __name__ == "__main__":
+    main()
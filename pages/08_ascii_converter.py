@@ -1,9 +1,22 @@
+import os
 import streamlit as st
 from tools.ascii_converter import (
+    HEXDUMP_ROOT,
+    HEXDUMP_ROWS,
+    HEXDUMP_WIDTH,
+    TEXT_ENCODINGS,
+    convert_bytes_to_hex,
+    convert_hex_to_bytes,
     convert_string_to_ascii_binary_hex,
     convert_ascii_to_string,
     convert_binary_to_string,
     convert_hex_to_string,
+    detect_encoding,
+    encode_characters,
+    format_hexdump,
+    iter_decoded_characters,
+    read_hexdump_page,
+    resolve_hexdump_path,
 )
 
 # --- アプリの基本設定 ---
@@ -24,6 +37,8 @@ mode = st.radio(
         "ASCII を 文字列 へ",
         "2進数 を 文字列 へ",
         "16進数 を 文字列 へ",
+        "ファイル を 16進ダンプ へ",
+        "文字コード別のバイト列を調べる",
     ),
     horizontal=True,
     label_visibility="collapsed",
@@ -114,3 +129,117 @@ elif mode == "16進数 を 文字列 へ":
             st.write("**文字列:**", result)
         else:
             st.error("無効な16進数が含まれています。")
+
+elif mode == "ファイル を 16進ダンプ へ":
+    # サーバー上のファイルは HEXDUMP_ROOT を設定した場合だけ、その配下から指定できる
+    if HEXDUMP_ROOT:
+        source = st.radio(
+            "ファイルの指定方法",
+            ("アップロード", f"サーバー上のパス ({HEXDUMP_ROOT} 配下、大きなファイル向け)"),
+            horizontal=True,
+        )
+    else:
+        source = "アップロード"
+    page_bytes = HEXDUMP_ROWS * HEXDUMP_WIDTH
+
+    def select_page(size):
+        """表示するページ (0 始まり) を選択する。オフセット (16進数) を指定した場合はそのページへ移動する"""
+        total_pages = max(1, -(-size // page_bytes))
+        col1, col2 = st.columns(2)
+        page = col1.number_input(
+            f"ページ (全 {total_pages:,} ページ, {size:,} バイト)",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+        )
+        offset_input = col2.text_input("オフセットへ移動 (16進数, 例: 1F400)")
+        if offset_input:
+            try:
+                page = min(int(offset_input, 16) // page_bytes, total_pages - 1) + 1
+            except ValueError:
+                st.error("無効なオフセットです。16進数で入力してください。")
+        return page - 1
+
+    if source == "アップロード":
+        uploaded_file = st.file_uploader("ファイルを選択してください")
+        if uploaded_file is not None:
+            # アップロードされたファイルはメモリ上にあるため、コピーせずにビューで切り出す
+            buffer = uploaded_file.getbuffer()
+            page = select_page(len(buffer))
+            start = page * page_bytes
+            st.code(
+                format_hexdump(buffer[start : start + page_bytes], start) or "(空のファイル)",
+                language=None,
+            )
+    else:
+        path = st.text_input(f"ファイルのパスを入力してください ({HEXDUMP_ROOT} からの相対パス)")
+        if path:
+            try:
+                # ファイルの大きさを確認してからページを選び、そのページだけをメモリマップで読み込む
+                path = resolve_hexdump_path(path, HEXDUMP_ROOT)
+                page = select_page(os.path.getsize(path))
+                text, _ = read_hexdump_page(path, page)
+                st.code(text or "(空のファイル)", language=None)
+            except ValueError as e:
+                st.error(f"このパスは指定できません: {e}")
+            except OSError as e:
+                st.error(f"ファイルを開けません: {e}")
+
+elif mode == "文字コード別のバイト列を調べる":
+    direction = st.radio(
+        "変換の方向",
+        ("文字列 を バイト列 へ", "16進数 を 文字列 へ (文字コードを判定)"),
+        horizontal=True,
+    )
+
+    if direction == "文字列 を バイト列 へ":
+        encoding_label = st.selectbox("文字コード", list(TEXT_ENCODINGS))
+        input_string = st.text_input("調べたい文字列を入力してください", value="日本語")
+
+        if input_string:
+            characters = encode_characters(input_string, TEXT_ENCODINGS[encoding_label])
+            encoded = b"".join(data for _, data in characters if data is not None)
+
+            st.subheader("変換結果")
+            st.write(f"**16進数 ({encoding_label}, {len(encoded):,} バイト):**")
+            st.code(convert_bytes_to_hex(encoded))
+            st.code(
+                "\n".join(
+                    f"{char}: ({convert_bytes_to_hex(data)})"
+                    if data is not None
+                    else f"{char}: (この文字コードでは表せません)"
+                    for char, data in characters
+                )
+            )
+
+    else:
+        hex_input = st.text_area("16進数を入力してください (例: 93 FA 96 7B 8C EA)")
+
+        if hex_input:
+            try:
+                data = convert_hex_to_bytes(hex_input)
+            except ValueError:
+                st.error("無効な16進数が含まれています。")
+            else:
+                guess = detect_encoding(data)
+                st.write(f"**判定した文字コード:** {guess.encoding or '判定できません'}")
+
+                # 判定結果を初期値にして、復号する文字コードを選択する
+                codec_names = list(TEXT_ENCODINGS.values())
+                default_index = (
+                    codec_names.index(guess.encoding) if guess.encoding in codec_names else 0
+                )
+                encoding_label = st.selectbox(
+                    "復号する文字コード", list(TEXT_ENCODINGS), index=default_index
+                )
+                characters = list(
+                    iter_decoded_characters([data], TEXT_ENCODINGS[encoding_label])
+                )
+
+                st.subheader("変換結果")
+                st.write("**文字列:**", "".join(text for text, _ in characters))
+                st.code(
+                    "\n".join(
+                        f"{text}: ({convert_bytes_to_hex(raw)})" for text, raw in characters
+                    )
+                )
@@ -1,7 +1,17 @@
 import streamlit as st
 import ipaddress
 
-from tools.cidr_checker import calculate_subnet_mask
+from tools.cidr_checker import (
+    build_cidr_set,
+    calculate_host_range,
+    cidr_set_difference,
+    cidr_set_intersection,
+    cidr_set_num_addresses,
+    cidr_set_to_prefixes,
+    cidr_set_union,
+    format_address,
+    get_subnet_mask,
+)
 
 
 # --- アプリの基本設定 ---
@@ -24,39 +34,68 @@ prefix_length = st.slider(
 
 # --- サブネットマスクの表示 ---
 if "prefix_length" in locals():
-    binary_mask, decimal_mask = calculate_subnet_mask(prefix_length)
+    subnet_mask = get_subnet_mask(prefix_length)
     with st.expander("**サブネットマスクの情報**", expanded=True):
-        st.write(f"- **サブネットマスク (2進数):** {binary_mask}")
-        st.write(f"- **サブネットマスク (10進数):** {decimal_mask}")
+        st.write(f"- **サブネットマスク (2進数):** {subnet_mask.binary}")
+        st.write(f"- **サブネットマスク (10進数):** {subnet_mask.decimal}")
+        st.write(f"- **ワイルドカードマスク:** {subnet_mask.wildcard}")
 
 if ip_input:
     try:
-        # 入力を解析
-        ip_cidr_input = f"{ip_input}/{prefix_length}"
-        network = ipaddress.ip_network(ip_cidr_input, strict=False)
-
-        # ネットワーク情報を取得
-        network_address = network.network_address
-        broadcast_address = network.broadcast_address
-        num_addresses = network.num_addresses
-
-        # ホスト範囲を直接計算
-        if num_addresses > 2:
-            first_host = network.network_address + 1
-            last_host = network.broadcast_address - 1
-            host_range = (first_host, last_host)
+        # 入力を解析し、ネットワーク情報を整数で計算
+        address = ipaddress.ip_address(ip_input.strip())
+        host_range = calculate_host_range(int(address), prefix_length, address.version)
+
+        network_address = format_address(host_range.network, address.version)
+        broadcast_address = format_address(host_range.broadcast, address.version)
+
+        # ホスト範囲
+        if host_range.first_host is not None:
+            first_host = format_address(host_range.first_host, address.version)
+            last_host = format_address(host_range.last_host, address.version)
         else:
-            host_range = ("N/A", "N/A")
+            first_host, last_host = "N/A", "N/A"
 
         # ホスト数をカンマ区切りでフォーマット
-        formatted_host_count = f"{num_addresses - 2:,}" if num_addresses > 2 else "0"
+        formatted_host_count = f"{host_range.host_count:,}"
 
         # 結果を表示
         with st.expander("**ネットワーク情報**", expanded=True):
             st.write(f"- **ネットワークアドレス:** {network_address}")
             st.write(f"- **ブロードキャストアドレス:** {broadcast_address}")
             st.write(f"- **ホスト数:** {formatted_host_count}")
-            st.write(f"- **ホスト範囲:** {host_range[0]} 〜 {host_range[1]}")
+            st.write(f"- **ホスト範囲:** {first_host} 〜 {last_host}")
 
     except ValueError:
         st.error("無効なIPアドレスが入力されました。正しい形式で入力してください。")
+
+# --- CIDR リストの集合演算 ---
+st.subheader("CIDRリストの集合演算")
+st.caption("1行に1つの CIDR を貼り付けてください。重複・包含・隣接するネットワークはまとめて扱います。")
+
+col1, col2 = st.columns(2)
+list_a = col1.text_area("リスト A", value="10.0.0.0/24\n10.0.1.0/24\n10.0.0.128/25")
+list_b = col2.text_area("リスト B (除外リストなど)", value="10.0.1.0/26")
+
+operations = {
+    "集約 (A をまとめる)": None,
+    "和 (A ∪ B)": cidr_set_union,
+    "重なり (A ∩ B)": cidr_set_intersection,
+    "差 (A − B)": cidr_set_difference,
+}
+operation_name = st.radio("演算", list(operations), horizontal=True)
+
+try:
+    set_a = build_cidr_set(list_a.split())
+    operation = operations[operation_name]
+    result = operation(set_a, build_cidr_set(list_b.split())) if operation else set_a
+    prefixes = cidr_set_to_prefixes(result)
+    v4_count, v6_count = cidr_set_num_addresses(result)
+
+    st.write(
+        f"- **結果:** {len(prefixes):,} 個のネットワーク "
+        f"(IPv4 アドレス {v4_count:,} 個, IPv6 アドレス {v6_count:,} 個)"
+    )
+    st.code("\n".join(prefixes) if prefixes else "(なし)")
+except ValueError as e:
+    st.error(f"無効なCIDRが含まれています: {e}")
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from tools.ascii_converter import (
+    convert_ascii_to_string,
+    convert_binary_to_bytes,
+    convert_binary_to_string,
+    convert_bytes_to_ascii_binary_hex,
+    convert_decimal_to_bytes,
+    convert_hex_to_bytes,
+    convert_hex_to_string,
+    convert_string_to_ascii_binary_hex,
+    detect_encoding,
+    encode_characters,
+    format_hexdump,
+    iter_decoded_characters,
+    read_hexdump_page,
+    resolve_hexdump_path,
+    TEXT_ENCODINGS,
+)
+
+
+class TestAsciiConverter(unittest.TestCase):
+    ## バイト列 → 10進/2進/16進 (bytes / bytearray / memoryview) と、その逆変換
+    def test_bytes_round_trip(self):
+        data = bytes(range(256))
+        for source in (data, bytearray(data), memoryview(data)):
+            decimal, binary, hex_text = convert_bytes_to_ascii_binary_hex(source)
+            self.assertEqual(convert_decimal_to_bytes(decimal), data)
+            self.assertEqual(convert_binary_to_bytes(binary), data)
+            self.assertEqual(convert_hex_to_bytes(hex_text), data)
+        self.assertEqual(convert_bytes_to_ascii_binary_hex(b"A\xff", sep=""), ("65255", "0100000111111111", "41FF"))
+        with self.assertRaises(ValueError):
+            convert_binary_to_bytes("0100000")
+        with self.assertRaises(ValueError):
+            convert_binary_to_bytes("01000002")
+
+    ## 文字列の関数 (既存の戻り値と同じであること)
+    def test_string_functions(self):
+        self.assertEqual(
+            convert_string_to_ascii_binary_hex("Aé"),
+            ([65, 233], ["01000001", "11101001"], ["41", "E9"]),
+        )
+        self.assertEqual(convert_string_to_ascii_binary_hex("あ")[2], ["3042"])
+        self.assertEqual(convert_ascii_to_string(["65", "66", "12354"]), "ABあ")
+        self.assertEqual(convert_binary_to_string(["01000001", "01000010"]), "AB")
+        self.assertIsNone(convert_binary_to_string(["0100000x"]))
+        self.assertEqual(convert_hex_to_string(["41", "42"]), "AB")
+        self.assertEqual(convert_hex_to_string(["41", "4"]), "A\x04")
+        self.assertIsNone(convert_hex_to_string(["zz"]))
+
+    ## 16進ダンプ (ページ単位の読み込み)
+    def test_hexdump(self):
+        self.assertEqual(
+            format_hexdump(b"AB\x00\xff", 0x20, width=4), "00000020 | 41 42 00 FF | AB.."
+        )
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(bytes(range(256)) * 10)
+        try:
+            text, size = read_hexdump_page(f.name, 2, rows=4, width=16)
+            self.assertEqual(size, 2560)
+            lines = text.splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertTrue(lines[0].startswith("00000080 | 80 81"))
+            self.assertEqual(read_hexdump_page(f.name, 100)[0], "")
+        finally:
+            os.remove(f.name)
+
+    ## 16進ダンプするファイルのパス (指定したディレクトリの外は不可)
+    def test_resolve_hexdump_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "root")
+            os.makedirs(os.path.join(root, "sub"))
+            with open(os.path.join(tmp, "secret.txt"), "w") as f:
+                f.write("secret")
+            os.symlink(os.path.join(tmp, "secret.txt"), os.path.join(root, "link.txt"))
+            real_root = os.path.realpath(root)
+
+            self.assertEqual(
+                resolve_hexdump_path("sub/a.bin", root), os.path.join(real_root, "sub", "a.bin")
+            )
+            self.assertEqual(
+                resolve_hexdump_path(os.path.join(root, "a.bin"), root),
+                os.path.join(real_root, "a.bin"),
+            )
+            for path in (
+                "../secret.txt",
+                "sub/../../secret.txt",
+                os.path.join(tmp, "secret.txt"),
+                "link.txt",
+                "/etc/passwd",
+                tmp,
+                root + "2/a.bin",
+            ):
+                with self.assertRaises(ValueError, msg=path):
+                    resolve_hexdump_path(path, root)
+            with self.assertRaises(ValueError):
+                resolve_hexdump_path("a.bin", None)
+
+    ## 文字コードごとのバイト列、チャンクをまたぐ復号、文字コードの判定
+    def test_encoding_inspector(self):
+        text = "ログ: ｴﾗｰ発生 (code=42)\n日本語のテキスト"
+        self.assertEqual(encode_characters("aあ", "cp932"), [("a", b"a"), ("あ", b"\x82\xa0")])
+        self.assertEqual(encode_characters("😀", "euc_jp"), [("😀", None)])
+        for encoding in TEXT_ENCODINGS.values():
+            data = text.encode(encoding)
+            chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+            characters = list(iter_decoded_characters(chunks, encoding))
+            self.assertEqual([c for c, _ in characters], list(text))
+            self.assertEqual(b"".join(raw for _, raw in characters), data)
+            self.assertEqual(detect_encoding(chunks).encoding, encoding)
+        self.assertEqual(
+            list(iter_decoded_characters([b"A\xff"], "utf-8")), [("A", b"A"), ("\ufffd", b"\xff")]
+        )
+        self.assertEqual(detect_encoding(b"\xef\xbb\xbfabc").encoding, "utf-8-sig")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
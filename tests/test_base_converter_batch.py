@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from tools.base_converter import (
+    convert_batch,
+    convert_bin_to_dec_hex,
+    convert_dec_to_bin,
+    convert_dec_to_fixed_point,
+    convert_dec_to_hex,
+    convert_dec_to_q88,
+    convert_hex_to_bin_dec,
+    convert_q88_to_dec,
+    decode_fixed_point,
+    encode_fixed_point,
+)
+
+
+class TestBaseConverterBatch(unittest.TestCase):
+    ## 整数配列 → 符号付き/符号なし/16進/2進
+    def test_batch_from_int_array(self):
+        signed, unsigned, hex_out, bin_out = convert_batch(
+            np.array([-45, 45, 32768]), 16
+        )
+        self.assertEqual(signed.tolist(), [-45, 45, -32768])
+        self.assertEqual(unsigned.tolist(), [65491, 45, 32768])
+        self.assertEqual(hex_out.tolist(), ["0xFFD3", "0x002D", "0x8000"])
+        self.assertEqual(bin_out[0], "0b1111111111010011")
+
+    ## 文字列のリスト (2進/16進) → 各値
+    def test_batch_from_strings(self):
+        signed, unsigned, _, _ = convert_batch(["FFD3", "2D"], 16, base=16)
+        self.assertEqual(signed.tolist(), [-45, 45])
+        signed, _, hex_out, _ = convert_batch(["1111111111010011", "101"], 16, base=2)
+        self.assertEqual(signed.tolist(), [-45, 5])
+        self.assertEqual(hex_out.tolist(), ["0xFFD3", "0x0005"])
+        with self.assertRaises(ValueError):
+            convert_batch(["FG"], 16, base=16)
+
+    ## スカラー関数と同じ結果になること
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        for bit_length in (8, 16, 32, 64):
+            values = rng.integers(
+                -(1 << (bit_length - 1)), (1 << (bit_length - 1)) - 1, 500
+            )
+            signed, unsigned, hex_out, bin_out = convert_batch(values, bit_length)
+            for v, s, u, h, b in zip(values.tolist(), signed, unsigned, hex_out, bin_out):
+                self.assertEqual(b, convert_dec_to_bin(v, bit_length))
+                self.assertEqual(h, convert_dec_to_hex(v, bit_length))
+                self.assertEqual(convert_bin_to_dec_hex(b[2:]), (s, u, h))
+                self.assertEqual(convert_hex_to_bin_dec(h[2:]), (b, s, u))
+
+    ## 固定小数点 (Qm.n): Q8.8 プリセットがスカラー関数と一致すること
+    def test_fixed_point_q88_matches_scalar(self):
+        hex_inputs = [f"{i:04X}" for i in range(0, 1 << 16, 97)]
+        decoded = decode_fixed_point(hex_inputs, 8, 8)
+        for h, d in zip(hex_inputs, decoded):
+            self.assertEqual(d, convert_q88_to_dec(h)[0])
+        values = [16.5, -65.0, 1.001, 127.99609375, -128.0, 0.3]
+        _, hex_out = encode_fixed_point(values, 8, 8)
+        self.assertEqual(hex_out.tolist(), [convert_dec_to_q88(v)[0] for v in values])
+
+    ## 固定小数点 (Qm.n): Q1.15 / Q16.16
+    def test_fixed_point_other_formats(self):
+        self.assertEqual(decode_fixed_point(["C000", "8000"], 1, 15).tolist(), [-0.5, -1.0])
+        self.assertEqual(decode_fixed_point(["FFFE8000"], 16, 16).tolist(), [-1.5])
+        raw, hex_out = encode_fixed_point([-1.5, 1.5], 16, 16)
+        self.assertEqual(hex_out.tolist(), ["0xFFFE8000", "0x00018000"])
+        self.assertEqual(convert_dec_to_fixed_point(-0.5, 1, 15)[0], "0xC000")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from tools.base_converter_stream import convert_chunk, main, stream_convert
+
+
+def convert_lines(text, mode, **kwargs):
+    out = io.StringIO()
+    stream_convert(io.StringIO(text), out, mode, **kwargs)
+    return out.getvalue()
+
+
+class TestBaseConverterStream(unittest.TestCase):
+    ## 一括変換 (揃ったチャンク) と1件ずつの変換 (不正なトークンを含むチャンク) が同じ結果になること
+    def test_mixed_chunk_matches_batch(self):
+        for mode, tokens, bits in (
+            ("bin", ["1", "1011", "11111111111111111"], 16),
+            ("hex", ["1", "FFD3", "1ABCD"], 16),
+            ("hex", ["ff", "7"], 12),
+            ("dec", ["-45", "45", "65535"], 16),
+        ):
+            expected = convert_chunk(tokens, mode, bits)
+            mixed = convert_chunk(tokens + ["ZZ"], mode, bits)
+            self.assertEqual(mixed[:-1], expected, (mode, bits))
+            self.assertEqual(mixed[-1][0], "ZZ")
+            self.assertNotEqual(mixed[-1][-1], "")
+
+    ## ビット数を指定した bin / hex はチャンクの内容に関わらずゼロ埋めすること
+    def test_bits_with_invalid_token(self):
+        rows = convert_lines("0b1 ZZ\n", "bin", bit_length=16).splitlines()
+        self.assertEqual(rows[0], "input,signed,unsigned,hex,error")
+        self.assertEqual(rows[1], "1,1,1,0x0001,")
+        self.assertTrue(rows[2].startswith("ZZ,,,,"))
+
+        rows = convert_lines("0x1 ZZ\n", "hex", bit_length=16).splitlines()
+        self.assertEqual(rows[1], "1,1,1,0b0000000000000001,")
+
+    ## ビット数を省略した bin / hex は桁数からビット数を決めること
+    def test_bits_from_digits(self):
+        rows = convert_lines("FFD3 2D\n", "hex", output_format="jsonl").splitlines()
+        self.assertEqual(
+            [json.loads(row) for row in rows],
+            [
+                {"input": "FFD3", "signed": -45, "unsigned": 65491, "bin": "0b1111111111010011"},
+                {"input": "2D", "signed": 45, "unsigned": 45, "bin": "0b00101101"},
+            ],
+        )
+
+    ## Q8.8 の不正なトークンは error 列に入ること
+    def test_q88(self):
+        rows = convert_lines("0x0180 01.80 12\n", "q88").splitlines()
+        self.assertEqual(rows[1], "0180,1.5,1,128,")
+        self.assertEqual(rows[2], "0180,1.5,1,128,")
+        self.assertTrue(rows[3].startswith("12,,,,"))
+
+    ## CLI: ファイルを読み込み、チャンクに分けても同じ結果を出力すること
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "in.txt")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write("-45 45\nXX 32767\n")
+            outputs = []
+            for chunk_size in ("1", "65536"):
+                dst = os.path.join(tmp, f"out{chunk_size}.csv")
+                with redirect_stderr(io.StringIO()):
+                    main(["dec", src, "-o", dst, "--bits", "8", "--chunk-size", chunk_size])
+                with open(dst, encoding="utf-8") as f:
+                    outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        rows = outputs[0].splitlines()
+        self.assertEqual(rows[1], "-45,-45,211,0xD3,0b11010011,")
+        self.assertTrue(rows[3].startswith("XX,,,,,"))
+        self.assertEqual(rows[4], "32767,-1,255,0xFF,0b11111111,")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,82 @@
+import random
+import unittest
+from tools.base_converter import (
+    convert_bin_to_dec_hex,
+    convert_bin_to_dec_hex_wide,
+    convert_binary_4digit_grouping,
+    convert_dec_to_bin,
+    convert_dec_to_bin_hex_wide,
+    convert_dec_to_hex,
+    convert_hex_to_bin_dec,
+    convert_hex_to_bin_dec_wide,
+)
+
+
+class TestBaseConverterWide(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(20240501)
+
+    ## 10進数 → 2進数/16進数: ランダムなビット数・値 (負の値、範囲外の値を含む) で既存関数と一致すること
+    def test_dec_matches_scalar(self):
+        for _ in range(500):
+            bit_length = self.rng.randint(0, 1100)
+            value = self.rng.randint(-(1 << bit_length) - 8, (1 << bit_length) + 8)
+            expected_bin = convert_dec_to_bin(value, bit_length)
+            expected_hex = convert_dec_to_hex(value, bit_length)
+            self.assertEqual(
+                convert_dec_to_bin_hex_wide(value, bit_length),
+                (expected_bin, expected_hex),
+                (value, bit_length),
+            )
+            self.assertEqual(
+                convert_dec_to_bin_hex_wide(value, bit_length, grouping=True),
+                (convert_binary_4digit_grouping(expected_bin), expected_hex),
+                (value, bit_length),
+            )
+
+    ## 16進数/2進数 → 各値: ランダムな桁数 (先頭の 0、小文字を含む) で既存関数と一致すること
+    def test_digits_match_scalar(self):
+        for _ in range(500):
+            hex_input = "".join(
+                self.rng.choice("0123456789abcdefABCDEF") for _ in range(self.rng.randint(1, 300))
+            )
+            expected = convert_hex_to_bin_dec(hex_input)
+            self.assertEqual(convert_hex_to_bin_dec_wide(hex_input), expected, hex_input)
+            self.assertEqual(
+                convert_hex_to_bin_dec_wide(hex_input, grouping=True),
+                (convert_binary_4digit_grouping(expected[0]), *expected[1:]),
+                hex_input,
+            )
+
+            binary_input = "".join(self.rng.choice("01") for _ in range(self.rng.randint(1, 1100)))
+            self.assertEqual(
+                convert_bin_to_dec_hex_wide(binary_input),
+                convert_bin_to_dec_hex(binary_input),
+                binary_input,
+            )
+
+    ## 0 ビット・負のビット数・空文字列・不正な文字は既存関数と同じ結果 (またはエラー) になること
+    def test_edge_cases(self):
+        for value in (-1, 0, 1):
+            self.assertEqual(
+                convert_dec_to_bin_hex_wide(value, 0),
+                (convert_dec_to_bin(value, 0), convert_dec_to_hex(value, 0)),
+            )
+        with self.assertRaises(ValueError):
+            convert_dec_to_bin(1, -1)
+        with self.assertRaises(ValueError):
+            convert_dec_to_bin_hex_wide(1, -1)
+        for wide, scalar, text in (
+            (convert_hex_to_bin_dec_wide, convert_hex_to_bin_dec, ""),
+            (convert_hex_to_bin_dec_wide, convert_hex_to_bin_dec, "FG"),
+            (convert_bin_to_dec_hex_wide, convert_bin_to_dec_hex, ""),
+            (convert_bin_to_dec_hex_wide, convert_bin_to_dec_hex, "102"),
+        ):
+            with self.assertRaises(ValueError):
+                scalar(text)
+            with self.assertRaises(ValueError):
+                wide(text)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
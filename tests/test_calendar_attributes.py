@@ -0,0 +1,61 @@
+import unittest
+import warnings
+from datetime import date, timedelta
+import jpholiday
+import pandas as pd
+from lunardate import LunarDate
+from tools.datetime_utils import (
+    ROKUYO_LIST,
+    build_calendar_attributes,
+    calculate_rokuyo,
+    get_month_wamei,
+    get_zyunisi,
+    iter_lunar_months,
+)
+
+
+class TestCalendarAttributes(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter("ignore", DeprecationWarning)
+
+    ## 1年分 (旧暦の月の途中から始まり、2023年閏2月と年末年始をまたぐ期間) が日ごとの計算と一致すること
+    def test_matches_scalar(self):
+        start, end = date(2022, 12, 15), date(2023, 12, 31)
+        df = build_calendar_attributes(start, end)
+        self.assertEqual(len(df), (end - start).days + 1)
+        for offset, row in enumerate(df.itertuples()):
+            d = start + timedelta(days=offset)
+            lunar_date = LunarDate.fromSolarDate(d.year, d.month, d.day)
+            self.assertEqual(row.date.date(), d)
+            self.assertEqual(
+                (row.lunar_month, row.lunar_day, row.is_leap_month),
+                (lunar_date.month, lunar_date.day, lunar_date.isLeapMonth),
+                d,
+            )
+            self.assertEqual(row.rokuyo, ROKUYO_LIST[(lunar_date.month + lunar_date.day) % 6], d)
+            self.assertEqual(row.rokuyo, calculate_rokuyo(d), d)
+            self.assertEqual(row.zyunisi, get_zyunisi(d.year), d)
+            self.assertEqual(row.month_wamei, get_month_wamei(d.month), d)
+            # 祝日でない日は欠損値 (pandas のバージョンにより None または NaN)
+            holiday_name = jpholiday.is_holiday_name(d)
+            if holiday_name is None:
+                self.assertTrue(pd.isna(row.holiday_name), d)
+            else:
+                self.assertEqual(row.holiday_name, holiday_name, d)
+
+    ## 旧暦の月の初日・日数・閏月が lunardate と一致すること
+    def test_iter_lunar_months(self):
+        start, end = date(2020, 1, 10), date(2021, 1, 31)
+        months = list(iter_lunar_months(start, end))
+        self.assertEqual(months[0][4], LunarDate.fromSolarDate(2020, 1, 10).day)
+        for (month_start, month, is_leap, month_length, _), following in zip(months, months[1:]):
+            lunar_date = LunarDate.fromSolarDate(month_start.year, month_start.month, month_start.day)
+            self.assertEqual((lunar_date.month, lunar_date.day, lunar_date.isLeapMonth), (month, 1, is_leap))
+            self.assertEqual(following[0] - month_start, timedelta(days=month_length))
+        # 2020年は閏4月がある
+        self.assertIn((4, True), [(m[1], m[2]) for m in months])
+        self.assertLessEqual(months[-1][0], end)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,148 @@
+import csv
+import io
+import ipaddress
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+import numpy as np
+from tools import cidr_checker_stream
+from tools.cidr_checker import (
+    build_prefix_index,
+    calculate_host_range,
+    calculate_subnet_mask,
+    enrich_ips,
+    get_subnet_mask,
+    lookup_prefix,
+    lookup_prefix_batch,
+    lookup_prefix_batch_v6,
+    parse_ipv4_batch,
+)
+
+
+def longest_match(networks, address):
+    matches = [n for n in networks if n.version == address.version and address in n]
+    return max(matches, key=lambda n: n.prefixlen) if matches else None
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.networks = [
+            ipaddress.ip_network(n)
+            for n in [
+                "0.0.0.0/1",
+                "10.0.0.0/8",
+                "10.1.0.0/16",
+                "10.1.2.0/24",
+                "10.1.2.128/25",
+                "10.1.3.0/24",
+                "192.168.0.0/16",
+                "192.168.255.255/32",
+                "255.255.255.0/24",
+                "2001:db8::/32",
+                "2001:db8:1::/48",
+            ]
+        ]
+        self.index = build_prefix_index(self.networks)
+
+    ## 1件ずつの検索 (入れ子・連続・アドレス空間の端)
+    def test_lookup_single(self):
+        for ip in [
+            "10.1.2.200", "10.1.2.127", "10.1.3.5", "10.1.4.0", "10.2.0.0",
+            "127.255.255.255", "128.0.0.0", "192.168.255.255", "192.168.255.254",
+            "255.255.255.255", "0.0.0.0", "2001:db8:1::1", "2001:db8:2::1", "::1",
+        ]:
+            address = ipaddress.ip_address(ip)
+            self.assertEqual(lookup_prefix(self.index, ip), longest_match(self.networks, address), ip)
+
+    ## 一括検索 (IPv4: uint32 配列, IPv6: 整数のリスト)
+    def test_lookup_batch(self):
+        rng = random.Random(0)
+        ips = [rng.choice([rng.getrandbits(32), 0x0A010200 | rng.getrandbits(10)]) for _ in range(2000)]
+        owners = lookup_prefix_batch(self.index, np.array(ips, dtype=np.uint32))
+        for ip, owner in zip(ips, owners.tolist()):
+            expected = longest_match(self.networks, ipaddress.IPv4Address(ip))
+            self.assertEqual(self.networks[owner] if owner >= 0 else None, expected)
+
+        v6 = [int(ipaddress.ip_address(ip)) for ip in ["2001:db8:1::5", "2001:db8:ffff::", "fe80::1"]]
+        self.assertEqual(lookup_prefix_batch_v6(self.index, v6), [10, 9, -1])
+
+    ## IPv4 文字列の整数への変換が ipaddress と一致すること
+    def test_parse_ipv4_batch(self):
+        cases = [
+            "1.2.3.4", "255.255.255.255", "0.0.0.0", "10.0.0.10", "256.1.1.1", "1.2.3",
+            "1.2.3.4.5", "01.2.3.4", "1..2.3", "1.2.3.", "1234.1.1.1", "1.2.3.4567", "::1", "",
+            "１.2.3.4", "1.2.3.4é", "1.2.3.\u0664", "\ufffd", "é" * 20,
+        ]
+        addresses, valid = parse_ipv4_batch(cases)
+        for case, address, ok in zip(cases, addresses.tolist(), valid.tolist()):
+            try:
+                expected = int(ipaddress.IPv4Address(case))
+            except ValueError:
+                self.assertFalse(ok, case)
+            else:
+                self.assertTrue(ok, case)
+                self.assertEqual(address, expected, case)
+
+    ## ログの一括付与 (1プロセス / プロセスプールで同じ結果になること)
+    def test_enrich_ips(self):
+        lines = [f"{ip} - - \"GET / HTTP/1.1\" 200\n" for ip in ["10.1.2.200", "2001:db8:1::1", "bogus", "8.8.8.8"] * 3]
+        rows = [row for chunk in enrich_ips(lines, self.index, chunk_size=5) for row in chunk]
+        self.assertEqual(rows[0], ("10.1.2.200", "10.1.2.128/25", "10.1.2.255", 25, ""))
+        self.assertEqual(rows[1], ("2001:db8:1::1", "2001:db8:1::/48", "2001:db8:1:ffff:ffff:ffff:ffff:ffff", 48, ""))
+        self.assertEqual(rows[2][:4], ("bogus", "", "", ""))
+        self.assertTrue(rows[2][4])
+        self.assertEqual(rows[3], ("8.8.8.8", "0.0.0.0/1", "127.255.255.255", 1, ""))
+        parallel = [row for chunk in enrich_ips(lines, self.index, chunk_size=5, workers=2) for row in chunk]
+        self.assertEqual(parallel, rows)
+
+    ## ASCII 以外の文字を含む行はその行だけエラーになること (CLI では不正なバイト列も同様)
+    def test_enrich_non_ascii(self):
+        lines = ["10.1.2.200 ok\n", "１０.1.2.3 全角\n", "ホスト名 -\n", "8.8.8.8 ok\n"]
+        rows = [row for chunk in enrich_ips(lines, self.index) for row in chunk]
+        self.assertEqual(rows[0][:4], ("10.1.2.200", "10.1.2.128/25", "10.1.2.255", 25))
+        for row in rows[1:3]:
+            self.assertEqual(row[1:4], ("", "", ""))
+            self.assertTrue(row[4])
+        self.assertEqual(rows[3][:4], ("8.8.8.8", "0.0.0.0/1", "127.255.255.255", 1))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            networks_path = os.path.join(tmp, "networks.txt")
+            log_path = os.path.join(tmp, "access.log")
+            out_path = os.path.join(tmp, "out.csv")
+            with open(networks_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(str(n) for n in self.networks) + "\n")
+            with open(log_path, "wb") as f:
+                f.write(b"10.1.2.200 ok\n\xff\xfe.1.2.3 bad\n" + "ホスト名 -\n".encode() + b"8.8.8.8 ok\n")
+            with redirect_stderr(io.StringIO()):
+                cidr_checker_stream.main([networks_path, log_path, "-o", out_path])
+            with open(out_path, encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[1][1], "10.1.2.128/25")
+        self.assertTrue(rows[2][4] and rows[3][4])
+        self.assertEqual(rows[4][1], "0.0.0.0/1")
+
+    ## サブネットマスクの表とホスト範囲 (ipaddress と一致すること)
+    def test_subnet_mask_table(self):
+        self.assertEqual(
+            calculate_subnet_mask(20), ("11111111 11111111 11110000 00000000", "255.255.240.0")
+        )
+        for version, base in ((4, "0.0.0.0"), (6, "::")):
+            for prefix_length in range(33 if version == 4 else 129):
+                network = ipaddress.ip_network(f"{base}/{prefix_length}")
+                mask = get_subnet_mask(prefix_length, version)
+                self.assertEqual(mask.decimal, str(network.netmask))
+                self.assertEqual(mask.wildcard, str(network.hostmask))
+        self.assertEqual(
+            calculate_host_range(int(ipaddress.IPv4Address("192.168.1.77")), 26),
+            (0xC0A80140, 0xC0A8017F, 64, 62, 0xC0A80141, 0xC0A8017E),
+        )
+        self.assertEqual(calculate_host_range(5, 31)[3:], (0, None, None))
+        with self.assertRaises(ValueError):
+            get_subnet_mask(33)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,64 @@
+import ipaddress
+import random
+import unittest
+from tools.cidr_checker import (
+    build_cidr_set,
+    cidr_set_difference,
+    cidr_set_intersection,
+    cidr_set_num_addresses,
+    cidr_set_to_prefixes,
+    cidr_set_union,
+)
+
+
+def random_networks(rng, count):
+    networks = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            length = rng.randint(0, 128)
+            networks.append(str(ipaddress.IPv6Network((rng.getrandbits(128), length), strict=False)))
+        else:
+            networks.append(f"{ipaddress.IPv4Address(rng.getrandbits(32))}/{rng.randint(0, 32)}")
+    return networks
+
+
+def collapse(networks):
+    parsed = [ipaddress.ip_network(n, strict=False) for n in networks]
+    return [
+        str(n)
+        for version in (4, 6)
+        for n in ipaddress.collapse_addresses(p for p in parsed if p.version == version)
+    ]
+
+
+class TestCidrSet(unittest.TestCase):
+    ## 集約と和集合が ipaddress.collapse_addresses と一致すること
+    def test_matches_collapse_addresses(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            a = random_networks(rng, rng.randint(0, 10))
+            b = random_networks(rng, rng.randint(0, 10))
+            self.assertEqual(cidr_set_to_prefixes(build_cidr_set(a)), collapse(a))
+            union = cidr_set_union(build_cidr_set(a), build_cidr_set(b))
+            self.assertEqual(cidr_set_to_prefixes(union), collapse(a + b))
+
+    ## 積集合・差集合 (アドレス空間の端、IPv6 全体を含む)
+    def test_intersection_and_difference(self):
+        a = build_cidr_set(["0.0.0.0/0", "::/0"])
+        b = build_cidr_set(["10.0.0.0/8", "255.255.255.255/32", "2001:db8::/32"])
+        self.assertEqual(
+            cidr_set_to_prefixes(cidr_set_intersection(a, b)),
+            ["10.0.0.0/8", "255.255.255.255/32", "2001:db8::/32"],
+        )
+        difference = cidr_set_difference(a, b)
+        self.assertEqual(
+            cidr_set_num_addresses(difference), ((1 << 32) - (1 << 24) - 1, (1 << 128) - (1 << 96))
+        )
+        self.assertEqual(cidr_set_to_prefixes(difference)[:2], ["0.0.0.0/5", "8.0.0.0/7"])
+        self.assertEqual(cidr_set_to_prefixes(cidr_set_difference(b, a)), [])
+        with self.assertRaises(ValueError):
+            build_cidr_set(["10.0.0.0/33"])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
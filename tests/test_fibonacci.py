@@ -0,0 +1,35 @@
+import itertools
+import unittest
+from tools.math.fibonacci import (
+    fibonacci,
+    fibonacci_mod,
+    generate_fibonacci,
+    iter_fibonacci,
+)
+
+
+class TestFibonacci(unittest.TestCase):
+    def setUp(self):
+        self.expected = generate_fibonacci(1000)
+
+    ## 高速倍加法がリストを作る方法と一致すること
+    def test_fast_doubling(self):
+        for n, value in enumerate(self.expected):
+            self.assertEqual(fibonacci(n), value, n)
+            self.assertEqual(fibonacci_mod(n, 97), value % 97, n)
+        self.assertEqual(fibonacci_mod(10 ** 18, 1), 0)
+        with self.assertRaises(ValueError):
+            fibonacci(-1)
+
+    ## ジェネレータが途中の番号から必要な分だけ返すこと
+    def test_iter_fibonacci(self):
+        self.assertEqual(list(iter_fibonacci(stop=10)), self.expected[:10])
+        self.assertEqual(list(iter_fibonacci(500, 600)), self.expected[500:600])
+        self.assertEqual(
+            list(itertools.islice(iter_fibonacci(900, modulus=1000), 50)),
+            [value % 1000 for value in self.expected[900:950]],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
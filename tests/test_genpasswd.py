@@ -0,0 +1,99 @@
+import math
+import string
+import unittest
+from collections import Counter
+from tools.genpasswd import (
+    SIMILAR_CHARACTERS,
+    PasswordPolicy,
+    generate_password,
+    generate_passwords,
+    generate_passwords_from_policy,
+    iter_passwords,
+    policy_entropy_bits,
+    secure_random_indices,
+)
+
+
+class TestGenpasswd(unittest.TestCase):
+    ## 一括生成: 長さ・使用文字・各種類の文字が必ず含まれること
+    def test_bulk_contains_every_class(self):
+        passwords = generate_passwords(2000, 8, True, True, "!#$")
+        self.assertEqual(len(passwords), 2000)
+        allowed = set(string.ascii_letters + string.digits + "!#$")
+        for password in passwords:
+            self.assertEqual(len(password), 8)
+            self.assertTrue(set(password) <= allowed)
+            self.assertTrue(any(c.islower() for c in password))
+            self.assertTrue(any(c.isupper() for c in password))
+            self.assertTrue(any(c.isdigit() for c in password))
+            self.assertTrue(any(c in "!#$" for c in password))
+
+    ## 棄却サンプリング: 範囲内で、偏りがないこと
+    def test_secure_random_indices(self):
+        counts = Counter(secure_random_indices(100_000, 100).tolist())
+        self.assertEqual(set(counts), set(range(100)))
+        self.assertLess(max(counts.values()) - min(counts.values()), 400)
+
+    ## 単体の生成 (長さが種類数より短い場合は None)
+    def test_single_password(self):
+        self.assertEqual(len(generate_password(16, False, False, "")), 16)
+        self.assertIsNone(generate_password(3, True, True, "!"))
+
+    ## 生成ルール: 最小文字数・見間違えやすい文字の除外・同じ文字の連続の制限
+    def test_policy(self):
+        policy = PasswordPolicy(
+            length=10, special_chars="!|", min_digits=3, exclude_similar=True, max_repeat=1
+        )
+        passwords = list(iter_passwords(policy, 3000, chunk_size=1000))
+        self.assertEqual(len(passwords), 3000)
+        for password in passwords:
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 3)
+            self.assertIn("!", password)
+            self.assertFalse(set(password) & set(SIMILAR_CHARACTERS))
+            self.assertTrue(all(a != b for a, b in zip(password, password[1:])))
+        self.assertIsNone(generate_password(policy=policy._replace(min_special=11)))
+
+    ## 同じ文字の連続の制限を満たせないルール: 1文字だけの種類を区切る文字が足りない
+    def test_unsatisfiable_max_repeat(self):
+        policy = PasswordPolicy(
+            length=10,
+            include_numbers=False,
+            special_chars="!",
+            min_lowercase=0,
+            min_uppercase=0,
+            min_special=6,
+            max_repeat=1,
+        )
+        with self.assertRaises(ValueError):
+            policy_entropy_bits(policy)
+        with self.assertRaises(ValueError):
+            generate_passwords_from_policy(1, policy)
+        self.assertIsNone(generate_password(policy=policy))
+        # 2文字まで連続してよい、または1文字長ければ生成できる
+        for relaxed in (policy._replace(max_repeat=2), policy._replace(length=11)):
+            for password in generate_passwords_from_policy(5, relaxed):
+                self.assertGreaterEqual(password.count("!"), 6)
+                self.assertNotIn("!" * (relaxed.max_repeat + 1), password)
+
+    ## 作り直しの回数が上限を超えた場合は ValueError
+    def test_retry_limit(self):
+        policy = PasswordPolicy(
+            length=11,
+            include_numbers=False,
+            special_chars="!",
+            min_lowercase=0,
+            min_uppercase=0,
+            min_special=6,
+            max_repeat=1,
+        )
+        with self.assertRaises(ValueError):
+            generate_passwords_from_policy(200, policy, max_retries=0)
+
+    ## エントロピー: 小文字と大文字を1文字以上含む3文字 = 52^3 - 2 * 26^3 通り
+    def test_entropy_bits(self):
+        policy = PasswordPolicy(length=3, include_numbers=False)
+        self.assertAlmostEqual(policy_entropy_bits(policy), math.log2(52**3 - 2 * 26**3))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,38 @@
+import unittest
+from tools.math.kaprekar import (
+    find_kaprekar_numbers,
+    find_kaprekar_numbers_by_divisors,
+    find_kaprekar_numbers_fast,
+    is_kaprekar_number,
+)
+
+
+class TestKaprekar(unittest.TestCase):
+    ## 高速版が文字列による判定と一致すること
+    def test_engines_match_reference(self):
+        expected = find_kaprekar_numbers(4)
+        self.assertEqual(find_kaprekar_numbers_fast(4, chunk_size=1000), expected)
+        self.assertEqual(find_kaprekar_numbers_by_divisors(4), expected)
+        self.assertEqual(find_kaprekar_numbers_fast(6), find_kaprekar_numbers_by_divisors(6))
+
+    ## 既知のカプレカ数 (右側が 0 になる分割は数えない)
+    def test_known_values(self):
+        numbers = find_kaprekar_numbers_by_divisors(4)
+        for n in (1, 9, 45, 55, 99, 297, 703, 999, 2223, 2728, 4879, 5292, 7272, 7777, 9999):
+            self.assertIn(n, numbers)
+        self.assertNotIn(10, numbers)
+        self.assertNotIn(100, numbers)
+
+    ## 10桁以上も約数から求められ、結果が文字列による判定と一致すること
+    def test_large_digits(self):
+        numbers = find_kaprekar_numbers_by_divisors(12)
+        self.assertTrue(all(is_kaprekar_number(n) for n in numbers))
+        self.assertIn(999999999999, numbers)
+        with self.assertRaises(ValueError):
+            find_kaprekar_numbers_by_divisors(16)
+        with self.assertRaises(ValueError):
+            find_kaprekar_numbers_fast(10)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
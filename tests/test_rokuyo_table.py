@@ -0,0 +1,56 @@
+import unittest
+import warnings
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from lunardate import LunarDate
+from tools.datetime_utils import (
+    ROKUYO_LIST,
+    ROKUYO_TABLE_END,
+    ROKUYO_TABLE_START,
+    calculate_rokuyo,
+    load_rokuyo_table,
+    lookup_rokuyo_range,
+)
+
+
+def rokuyo_by_lunardate(d):
+    lunar_date = LunarDate.fromSolarDate(d.year, d.month, d.day)
+    return ROKUYO_LIST[(lunar_date.month + lunar_date.day) % 6]
+
+
+class TestRokuyoTable(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter("ignore", DeprecationWarning)
+        self.table = load_rokuyo_table()
+        self.assertIsNotNone(self.table, "tools/rokuyo_table.npy が読み込めません")
+
+    ## 変換表が lunardate の計算結果と一致すること (全期間から間引いて確認)
+    def test_table_matches_lunardate(self):
+        days = (ROKUYO_TABLE_END - ROKUYO_TABLE_START).days
+        for offset in list(range(0, days, 11)) + [days]:
+            d = ROKUYO_TABLE_START + timedelta(days=offset)
+            self.assertEqual(ROKUYO_LIST[self.table[offset]], rokuyo_by_lunardate(d), d)
+            self.assertEqual(calculate_rokuyo(d), rokuyo_by_lunardate(d), d)
+
+    ## 範囲での取得 (旧暦の閏月をまたぐ期間: 2023年閏2月)
+    def test_lookup_range(self):
+        start = LunarDate(2023, 1, 1).toSolarDate()
+        end = start + timedelta(days=120)
+        codes = lookup_rokuyo_range(start, end)
+        self.assertEqual(len(codes), 121)
+        for offset, code in enumerate(codes):
+            d = start + timedelta(days=offset)
+            self.assertEqual(ROKUYO_LIST[code], rokuyo_by_lunardate(d), d)
+
+    ## datetime (タイムゾーン付き、変換表の範囲外を含む) はその日付の六曜になること
+    def test_datetime_argument(self):
+        for dt in (
+            datetime(2024, 1, 1, 23, 59),
+            datetime(2024, 1, 1, 0, 0, tzinfo=ZoneInfo("Asia/Tokyo")),
+            datetime(1900, 1, 1, 12, 0),
+        ):
+            self.assertEqual(calculate_rokuyo(dt), rokuyo_by_lunardate(dt.date()), dt)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
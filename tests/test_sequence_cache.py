@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from tools.math.kaprekar import find_kaprekar_numbers_by_divisors
+from tools.math.sequence_cache import (
+    clear_sequence_cache,
+    get_sequence,
+    get_sequence_cache_stats,
+    sequence_cache_path,
+)
+
+
+class TestSequenceCache(unittest.TestCase):
+    def setUp(self):
+        clear_sequence_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.calls = []
+
+    def extend(self, start, end):
+        self.calls.append((start, end))
+        return find_kaprekar_numbers_by_divisors(end, min_digits=start + 1)
+
+    def get(self, digits, version=1):
+        return get_sequence("kaprekar", digits, self.extend, version=version, cache_dir=self.tmp.name)
+
+    ## 少ない桁数はメモリから返し、多い桁数は足りない桁だけを計算すること
+    def test_hit_and_extend(self):
+        self.assertEqual(self.get(4), find_kaprekar_numbers_by_divisors(4))
+        self.assertEqual(self.get(2), [1, 9, 45, 55, 99])
+        self.assertEqual(self.get(8), find_kaprekar_numbers_by_divisors(8))
+        self.assertEqual(self.calls, [(0, 4), (4, 8)])
+        self.assertEqual(tuple(get_sequence_cache_stats()), (1, 0, 1, 1))
+
+    ## メモリをクリアしてもディスクから読み込み、バージョンが異なれば計算し直すこと
+    def test_disk_and_version(self):
+        self.get(5)
+        clear_sequence_cache()
+        self.assertEqual(self.get(5), find_kaprekar_numbers_by_divisors(5))
+        self.assertEqual(tuple(get_sequence_cache_stats()), (0, 1, 0, 0))
+
+        self.get(5, version=2)
+        self.assertEqual(self.calls, [(0, 5), (0, 5)])
+        with open(sequence_cache_path("kaprekar", self.tmp.name), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["version"], 2)
+
+    ## 壊れたキャッシュファイルは無視すること
+    def test_broken_file(self):
+        os.makedirs(self.tmp.name, exist_ok=True)
+        with open(sequence_cache_path("kaprekar", self.tmp.name), "w", encoding="utf-8") as f:
+            f.write("{")
+        self.assertEqual(self.get(3), find_kaprekar_numbers_by_divisors(3))
+        self.assertEqual(get_sequence_cache_stats().misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,344 @@
+import calendar
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+import pandas as pd
+from tools import wareki
+from tools.wareki import (
+    build_era_index,
+    build_wareki_snapshot,
+    convert_seireki_2_wareki,
+    convert_seireki_2_wareki_bulk,
+    convert_wareki_2_seireki,
+    convert_wareki_2_seireki_bulk,
+    DAY_OPTIONS,
+    fetch_wareki_data,
+    find_era,
+    format_wareki,
+    get_month_length,
+    load_wareki_snapshot,
+    refresh_wareki_snapshot,
+    save_wareki_snapshot,
+    set_wareki_snapshot,
+    WAREKI_SNAPSHOT_RETRY_INTERVAL,
+    WAREKI_SNAPSHOT_TTL,
+)
+
+WAREKI_ROWS = [
+    {"gengo": "明治", "start_date": "1868-01-25", "end_date": "1912-07-29"},
+    {"gengo": "大正", "start_date": "1912-07-30", "end_date": "1926-12-24"},
+    {"gengo": "昭和", "start_date": "1926-12-25", "end_date": "1989-01-07"},
+    {"gengo": "平成", "start_date": "1989-01-08", "end_date": "2019-04-30"},
+    {"gengo": "令和", "start_date": "2019-05-01", "end_date": "9999-12-31"},
+]
+
+
+class FakeSupabase:
+    """get_era_date の RPC だけを返す Supabase クライアントの代わり"""
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.data)
+
+
+class FakeWarekiTable:
+    """warekis テーブルの select だけを返す Supabase クライアントの代わり"""
+
+    def __init__(self, rows=None, error=None, block=False):
+        self.rows = rows
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        # block=True の場合は release.set() まで execute が返らない
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def table(self, name):
+        self.calls += 1
+        return self
+
+    def select(self, columns):
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def execute(self):
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(data=self.rows)
+
+
+class TestEraIndex(unittest.TestCase):
+    def setUp(self):
+        # 行の順序に関わらず start_date の昇順で検索できること
+        self.era_index = build_era_index(list(reversed(WAREKI_ROWS)))
+
+    ## 改元の前日・当日で元号が切り替わること
+    def test_boundaries(self):
+        for target, expected in (
+            (date(1868, 1, 24), None),
+            (date(1868, 1, 25), "明治元年1月25日"),
+            (date(1912, 7, 29), "明治45年7月29日"),
+            (date(1912, 7, 30), "大正元年7月30日"),
+            (date(1989, 1, 7), "昭和64年1月7日"),
+            (date(1989, 1, 8), "平成元年1月8日"),
+            (date(2019, 4, 30), "平成31年4月30日"),
+            (date(2019, 5, 1), "令和元年5月1日"),
+            (date(2020, 1, 1), "令和2年1月1日"),
+        ):
+            era_info = find_era(self.era_index, target)
+            self.assertEqual(era_info and format_wareki(era_info, target), expected, target)
+
+    ## 元号の間に空白期間がある場合は見つからないこと
+    def test_gap(self):
+        era_index = build_era_index([WAREKI_ROWS[0], WAREKI_ROWS[2]])
+        self.assertIsNone(find_era(era_index, date(1920, 1, 1)))
+        self.assertEqual(find_era(era_index, date(1930, 1, 1))["gengo"], "昭和")
+
+    ## convert_seireki_2_wareki: 元号インデックスで変換し、verify=True なら RPC と照合すること
+    def test_convert_seireki_2_wareki(self):
+        with mock.patch("tools.wareki.get_era_index", return_value=self.era_index):
+            supabase = FakeSupabase("令和元年5月1日")
+            self.assertEqual(convert_seireki_2_wareki(supabase, 2019, 5, 1), "令和元年5月1日")
+            self.assertEqual(supabase.calls, [])
+
+            self.assertEqual(convert_seireki_2_wareki(supabase, 2019, 5, 1, verify=True), "令和元年5月1日")
+            self.assertEqual(supabase.calls, [("get_era_date", {"seireki_date": "2019-05-01"})])
+
+            # RPC と食い違う場合は警告を記録して RPC の結果を返す
+            supabase = FakeSupabase("平成31年5月1日")
+            with self.assertLogs("tools.wareki", "WARNING"):
+                self.assertEqual(
+                    convert_seireki_2_wareki(supabase, 2019, 5, 1, verify=True), "平成31年5月1日"
+                )
+
+            self.assertEqual(
+                convert_seireki_2_wareki(supabase, 1800, 1, 1), "日付に対応する元号が見つかりません"
+            )
+            self.assertEqual(convert_seireki_2_wareki(supabase, 2019, 2, 30), "正しい日付を入力してください")
+
+
+class TestWarekiBulk(unittest.TestCase):
+    def setUp(self):
+        self.era_index = build_era_index(WAREKI_ROWS)
+
+    ## 西暦 → 和暦: 改元日の前後と範囲外・NaT を含む日付で1件ずつの変換と一致すること
+    def test_seireki_2_wareki_bulk(self):
+        dates = [date(1868, 1, 20) + timedelta(days=i) for i in range(10)]
+        for boundary in (date(1912, 7, 30), date(1926, 12, 25), date(1989, 1, 8), date(2019, 5, 1)):
+            dates += [boundary + timedelta(days=i) for i in range(-3, 3)]
+        dates += [date(1800, 1, 1), date(2100, 12, 31)]
+        series = pd.Series(pd.to_datetime(dates + [None]), index=range(100, 100 + len(dates) + 1))
+
+        result = convert_seireki_2_wareki_bulk(self.era_index, series)
+        self.assertEqual(list(result.index), list(series.index))
+        for d, row in zip(dates, result.itertuples()):
+            era_info = find_era(self.era_index, d)
+            if era_info is None:
+                self.assertTrue(pd.isna(row.era) and pd.isna(row.wareki) and pd.isna(row.era_year), d)
+                self.assertEqual((row.month, row.day), (d.month, d.day))
+                continue
+            self.assertEqual(row.wareki, format_wareki(era_info, d), d)
+            self.assertEqual(row.era, era_info["gengo"], d)
+            self.assertEqual(row.era_year, d.year - int(era_info["start_date"][:4]) + 1, d)
+        # NaT の行はすべて欠損値
+        self.assertTrue(result.iloc[-1].isna().all())
+
+    ## 和暦 → 西暦: 存在しない日付・未知の元号は NaT、それ以外は1件ずつの変換と一致すること
+    def test_wareki_2_seireki_bulk(self):
+        rows = [
+            ("令和", 1, 5, 1),
+            ("平成", 31, 4, 30),
+            ("平成", 12, 2, 29),
+            ("平成", 13, 2, 29),
+            ("昭和", 64, 1, 7),
+            ("明治", 1, 13, 1),
+            ("不明", 1, 1, 1),
+        ]
+        gengo, year, month, day = zip(*rows)
+        result = convert_wareki_2_seireki_bulk(
+            self.era_index, list(gengo), np.array(year), np.array(month), np.array(day)
+        )
+        start_years = {r["gengo"]: int(r["start_date"][:4]) for r in WAREKI_ROWS}
+        for (g, y, m, d), value in zip(rows, result):
+            if g not in start_years:
+                self.assertTrue(np.isnat(value))
+                continue
+            expected = convert_wareki_2_seireki(start_years[g], "元年" if y == 1 else f"{y}年", m, d)
+            if expected == "存在する正しい日付を入力してください":
+                self.assertTrue(np.isnat(value), (g, y, m, d))
+            else:
+                self.assertEqual(pd.Timestamp(value).strftime("%Y年%m月%d日"), expected)
+
+
+class TestMonthLength(unittest.TestCase):
+    ## 2月はうるう年 (4で割り切れる、100年は除く、400年は含む) だけ29日
+    def test_february(self):
+        for year, expected in ((2023, 28), (2024, 29), (1900, 28), (2000, 29), (2100, 28)):
+            self.assertEqual(get_month_length(year, 2), expected, year)
+
+    ## すべての年月で calendar.monthrange と一致し、日の選択肢が用意されていること
+    def test_matches_calendar(self):
+        for year in range(1861, 2101):
+            for month in range(1, 13):
+                length = get_month_length(year, month)
+                self.assertEqual(length, calendar.monthrange(year, month)[1], (year, month))
+                self.assertEqual(DAY_OPTIONS[length][-1], length)
+
+
+class TestWarekiSnapshot(unittest.TestCase):
+    ## 複数スレッドから同時に保存しても、壊れたファイルや一時ファイルが残らないこと
+    def test_concurrent_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "warekis.json")
+            snapshots = [build_wareki_snapshot(WAREKI_ROWS[: i + 1]) for i in range(len(WAREKI_ROWS))]
+            threads = [
+                threading.Thread(target=lambda s=s: [save_wareki_snapshot(s, path) for _ in range(20)])
+                for s in snapshots
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(os.listdir(tmp), ["warekis.json"])
+            with open(path, encoding="utf-8") as f:
+                self.assertIn(json.load(f)["etag"], [s["etag"] for s in snapshots])
+            self.assertIsNotNone(load_wareki_snapshot(path))
+
+
+class TestWarekiSnapshotRefresh(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "warekis.json")
+        # スナップショットの保存先とプロセス内の状態は、テストごとに元に戻す
+        for patcher in (
+            mock.patch.object(wareki, "WAREKI_SNAPSHOT_PATH", self.path),
+            mock.patch.dict(wareki.wareki_snapshot_state),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.old_rows = WAREKI_ROWS[:4]
+        self.new_rows = WAREKI_ROWS
+
+    def set_stale_snapshot(self):
+        snapshot = build_wareki_snapshot(self.old_rows)
+        snapshot["fetched_at"] -= WAREKI_SNAPSHOT_TTL + 10
+        set_wareki_snapshot(snapshot)
+        return snapshot
+
+    def wait_refresh(self):
+        deadline = time.monotonic() + 5
+        while wareki.wareki_snapshot_state["refreshing"]:
+            self.assertLess(time.monotonic(), deadline, "再検証が終わりません")
+            time.sleep(0.01)
+
+    ## 古いスナップショットはクライアントを待たずに返し、バックグラウンドで更新すること
+    def test_stale_snapshot_returned_immediately(self):
+        self.set_stale_snapshot()
+        client = FakeWarekiTable(self.new_rows, block=True)
+
+        started = time.monotonic()
+        self.assertEqual(fetch_wareki_data(client), self.old_rows)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(client.started.wait(5))
+        self.assertTrue(wareki.wareki_snapshot_state["refreshing"])
+
+        client.release.set()
+        self.wait_refresh()
+        self.assertEqual(fetch_wareki_data(client), self.new_rows)
+        self.assertEqual(load_wareki_snapshot(self.path)["rows"], self.new_rows)
+
+    ## 再検証中 (refreshing) は何度呼ばれても再検証を1つしか始めないこと
+    def test_single_background_refresh(self):
+        self.set_stale_snapshot()
+        client = FakeWarekiTable(self.new_rows, block=True)
+
+        threads = [threading.Thread(target=fetch_wareki_data, args=(client,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(client.started.wait(5))
+        fetch_wareki_data(client)
+        self.assertEqual(client.calls, 1)
+
+        client.release.set()
+        self.wait_refresh()
+        self.assertEqual(client.calls, 1)
+
+    ## ディスク上に新しいスナップショットがあれば、Supabase から取得せずに使うこと
+    def test_fresher_snapshot_on_disk(self):
+        self.set_stale_snapshot()
+        fresh = build_wareki_snapshot(self.new_rows)
+        save_wareki_snapshot(fresh, self.path)
+        client = FakeWarekiTable(self.new_rows)
+
+        wareki.wareki_snapshot_state["refreshing"] = True
+        refresh_wareki_snapshot(client)
+        self.assertEqual(client.calls, 0)
+        self.assertFalse(wareki.wareki_snapshot_state["refreshing"])
+        self.assertEqual(wareki.wareki_snapshot_state["snapshot"]["etag"], fresh["etag"])
+        self.assertEqual(fetch_wareki_data(client), self.new_rows)
+
+    ## 再検証に失敗しても古いデータを返し続け、次の再検証を WAREKI_SNAPSHOT_RETRY_INTERVAL 後にすること
+    def test_failed_refresh(self):
+        self.set_stale_snapshot()
+        for client in (FakeWarekiTable(error=ConnectionError("offline")), FakeWarekiTable([])):
+            wareki.wareki_snapshot_state["refreshing"] = True
+            before = time.time()
+            with self.assertLogs("tools.wareki", "WARNING"):
+                refresh_wareki_snapshot(client)
+            after = time.time()
+
+            state = wareki.wareki_snapshot_state
+            self.assertFalse(state["refreshing"])
+            self.assertGreaterEqual(state["refresh_at"], before + WAREKI_SNAPSHOT_RETRY_INTERVAL)
+            self.assertLessEqual(state["refresh_at"], after + WAREKI_SNAPSHOT_RETRY_INTERVAL)
+            self.assertIsNone(load_wareki_snapshot(self.path))
+
+            # 再実行までの間は古いデータを返し、再検証を始めない
+            self.assertEqual(fetch_wareki_data(client), self.old_rows)
+            self.assertFalse(state["refreshing"])
+            self.assertEqual(client.calls, 1)
+
+    ## 元号インデックスは etag が変わった場合だけ作り直すこと
+    def test_era_index_rebuilt_on_etag_change(self):
+        self.set_stale_snapshot()
+        era_index = wareki.wareki_snapshot_state["era_index"]
+        self.assertIsNone(find_era(era_index, date(2020, 1, 1)))
+
+        # 同じ行を取得し直した場合は、有効期限だけ延ばしてインデックスはそのまま
+        refresh_wareki_snapshot(FakeWarekiTable(self.old_rows))
+        state = wareki.wareki_snapshot_state
+        self.assertIs(state["era_index"], era_index)
+        self.assertGreater(state["refresh_at"], time.time())
+
+        # 行が変わった場合は作り直す (ディスクのスナップショットを消して Supabase から取得させる)
+        os.remove(self.path)
+        refresh_wareki_snapshot(FakeWarekiTable(self.new_rows))
+        self.assertIsNot(state["era_index"], era_index)
+        self.assertEqual(find_era(state["era_index"], date(2020, 1, 1))["gengo"], "令和")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,12 +1,128 @@
+import codecs
+import mmap
+import os
+import string
+from itertools import chain
+from typing import NamedTuple
+import numpy as np
+
+# 0〜255 の各値の表現 (10進数 / 2進数8桁)。bytes の各値をこの表で文字列にする
+DECIMAL_TABLE = tuple(str(i) for i in range(256))
+BINARY_TABLE = tuple(f"{i:08b}" for i in range(256))
+
+HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# 16進ダンプの1行のバイト数と、1ページの行数
+HEXDUMP_WIDTH = 16
+HEXDUMP_ROWS = 64
+
+# 16進ダンプでサーバー上のファイルを指定できるディレクトリ (環境変数 HEXDUMP_ROOT)
+# 未設定の場合はサーバー上のファイルを指定できない (アップロードのみ)
+HEXDUMP_ROOT = os.environ.get("HEXDUMP_ROOT") or None
+
+# 16進ダンプの ASCII 列: 表示できる文字 (0x20〜0x7E) 以外は "." にする変換表
+HEXDUMP_ASCII_TABLE = bytes(i if 0x20 <= i <= 0x7E else ord(".") for i in range(256))
+
+# 文字コードの調査で選択できる文字コード (表示名: Python のコーデック名)
+TEXT_ENCODINGS = {
+    "UTF-8": "utf-8",
+    "UTF-16 (LE)": "utf-16-le",
+    "UTF-16 (BE)": "utf-16-be",
+    "Shift_JIS (CP932)": "cp932",
+    "EUC-JP": "euc_jp",
+}
+
+# 文字コード判定の候補 (評価が同じ場合は先の方を選ぶ)
+DETECT_ENCODINGS = ("utf-8", "cp932", "euc_jp", "utf-16-le", "utf-16-be")
+
+# BOM (先頭にあれば文字コードを確定する)
+DETECT_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# 入力から取り除く空白文字
+WHITESPACE_BYTES = string.whitespace.encode("ascii")
+
+
+def iter_byte_values(data):
+    """bytes / bytearray はそのまま、memoryview などは1バイト単位のビューにして、各バイトの値を返す"""
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    return memoryview(data).cast("B")
+
+
+def convert_bytes_to_decimal(data, sep=" "):
+    """bytes / bytearray / memoryview の各バイトを10進数にし、sep で区切った文字列を返す"""
+    return sep.join(map(DECIMAL_TABLE.__getitem__, iter_byte_values(data)))
+
+
+def convert_bytes_to_binary(data, sep=" "):
+    """bytes / bytearray / memoryview の各バイトを2進数8桁にし、sep で区切った文字列を返す"""
+    return sep.join(map(BINARY_TABLE.__getitem__, iter_byte_values(data)))
+
+
+def convert_bytes_to_hex(data, sep=" "):
+    """bytes / bytearray / memoryview の各バイトを16進数2桁 (大文字) にし、sep で区切った文字列を返す"""
+    view = memoryview(data).cast("B")
+    return (view.hex(sep) if sep else view.hex()).upper()
+
+
+def convert_bytes_to_ascii_binary_hex(data, sep=" "):
+    """バイト列を (10進数, 2進数, 16進数) の文字列に変換する (各バイトを sep で区切る)"""
+    return (
+        convert_bytes_to_decimal(data, sep),
+        convert_bytes_to_binary(data, sep),
+        convert_bytes_to_hex(data, sep),
+    )
+
+
+def convert_decimal_to_bytes(text):
+    """空白区切りの10進数 (0〜255) をバイト列に変換する。不正な値は ValueError"""
+    return bytes(map(int, text.split()))
+
+
+def convert_binary_to_bytes(text):
+    """
+    2進数 (空白は無視、8桁ごとに1バイト) をバイト列に変換する。不正な値は ValueError
+    各桁を 0 / 1 の配列にし、np.packbits で8桁ずつまとめる。
+    """
+    digits = np.frombuffer(
+        text.encode("ascii").translate(None, WHITESPACE_BYTES), dtype=np.uint8
+    ) - ord("0")
+    if len(digits) % 8 or (digits > 1).any():
+        raise ValueError("2進数は 0 と 1 の8桁ごとに入力してください")
+    return np.packbits(digits).tobytes()
+
+
+def convert_hex_to_bytes(text):
+    """16進数 (空白は無視、2桁ごとに1バイト) をバイト列に変換する。不正な値は ValueError"""
+    return bytes.fromhex(text)
+
 
 def convert_string_to_ascii_binary_hex(input_string):
-    ascii_codes = [ord(char) for char in input_string]
-    binary_codes = [bin(ord(char))[2:].zfill(8) for char in input_string]
-    hex_codes = [hex(ord(char))[2:].upper().zfill(2) for char in input_string]
+    # 1バイトで表せる文字列 (U+0000〜U+00FF) はバイト列として変換する
+    try:
+        data = input_string.encode("latin-1")
+    except UnicodeEncodeError:
+        ascii_codes = [ord(char) for char in input_string]
+        binary_codes = [bin(code)[2:].zfill(8) for code in ascii_codes]
+        hex_codes = [hex(code)[2:].upper().zfill(2) for code in ascii_codes]
+        return ascii_codes, binary_codes, hex_codes
+
+    ascii_codes = list(data)
+    binary_codes = list(map(BINARY_TABLE.__getitem__, data))
+    hex_codes = convert_bytes_to_hex(data).split()
     return ascii_codes, binary_codes, hex_codes
 
 
 def convert_ascii_to_string(ascii_codes):
+    try:
+        return bytes(map(int, ascii_codes)).decode("latin-1")
+    except ValueError:
+        pass
+    # 256 以上のコードを含む場合は1文字ずつ変換する
     try:
         return "".join(chr(int(code)) for code in ascii_codes)
     except ValueError:
@@ -14,6 +130,10 @@ def convert_ascii_to_string(ascii_codes):
 
 
 def convert_binary_to_string(binary_codes):
+    # すべて 0 / 1 の8桁の場合はまとめて変換する
+    joined = "".join(binary_codes)
+    if all(len(code) == 8 for code in binary_codes) and not joined.strip("01"):
+        return convert_binary_to_bytes(joined).decode("latin-1")
     try:
         return "".join(chr(int(code, 2)) for code in binary_codes)
     except ValueError:
@@ -21,7 +141,189 @@ def convert_binary_to_string(binary_codes):
 
 
 def convert_hex_to_string(hex_codes):
+    # すべて16進数の2桁の場合はまとめて変換する
+    joined = "".join(hex_codes)
+    if all(len(code) == 2 for code in hex_codes) and not joined.strip(HEX_DIGITS):
+        return convert_hex_to_bytes(joined).decode("latin-1")
     try:
         return "".join(chr(int(code, 16)) for code in hex_codes)
     except ValueError:
         return None
+
+
+def format_hexdump(data, offset=0, width=HEXDUMP_WIDTH):
+    """
+    バイト列を「オフセット | 16進数 | ASCII」形式の16進ダンプにする
+    Args:
+        data (bytes | bytearray | memoryview): 表示するバイト列 (表示範囲の分だけ渡す)
+        offset (int): data の先頭のオフセット (ファイル内の位置)
+        width (int): 1行のバイト数
+    Returns:
+        str: 16進ダンプ (1行ずつ改行で区切る)
+    """
+    data = bytes(iter_byte_values(data))
+    hex_width = width * 3 - 1
+    lines = []
+    for start in range(0, len(data), width):
+        row = data[start : start + width]
+        lines.append(
+            f"{offset + start:08X} | {row.hex(' ').upper():<{hex_width}} | "
+            f"{row.translate(HEXDUMP_ASCII_TABLE).decode('ascii')}"
+        )
+    return "\n".join(lines)
+
+
+def resolve_hexdump_path(path, root=HEXDUMP_ROOT):
+    """
+    16進ダンプするファイルのパスを、root 配下の実際のパスにする
+    相対パスは root からの位置として扱う。シンボリックリンクや ".." を解決した結果が
+    root の外になるパスは受け付けない。
+    Raises:
+        ValueError: root が設定されていない、またはパスが root の外を指す場合
+    """
+    if not root:
+        raise ValueError("サーバー上のファイルは指定できません")
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{root} 配下のファイルを指定してください")
+    return resolved
+
+
+def read_hexdump_page(path, page, rows=HEXDUMP_ROWS, width=HEXDUMP_WIDTH):
+    """
+    ファイルをメモリマップで開き、page ページ目 (0 始まり) の16進ダンプだけを作る
+    読み込むのは表示する1ページ分 (rows * width バイト) のみで、ファイルの大きさに依存しない。
+    Returns:
+        tuple: (16進ダンプ (str), ファイルのサイズ (int))
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # 空のファイルはメモリマップできない
+        if size == 0:
+            return "", 0
+        start = page * rows * width
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return format_hexdump(mapped[start : start + rows * width], start, width), size
+
+
+def encode_characters(text, encoding):
+    """
+    文字列の1文字ごとに、指定した文字コードでのバイト列を返す
+    その文字コードで表せない文字のバイト列は None。
+    Returns:
+        list[tuple[str, bytes | None]]: (文字, バイト列) のリスト
+    """
+    encoder = codecs.getincrementalencoder(encoding)()
+    result = []
+    for char in text:
+        try:
+            result.append((char, encoder.encode(char)))
+        except UnicodeEncodeError:
+            result.append((char, None))
+    return result
+
+
+def iter_decoded_characters(chunks, encoding):
+    """
+    バイト列のチャンクを順に復号し、(文字, その文字のバイト列) を1文字ずつ返すジェネレーター
+    codecs のインクリメンタルデコーダーを全チャンクで共有するため、チャンクの境目で
+    分かれたマルチバイト文字も正しく扱える。不正なバイト列は U+FFFD (�) になる。
+    不正なバイト列の直後の文字と区別できない場合は、2文字をまとめて返す。
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = b""
+    for chunk in chain(chunks, [None]):
+        # 最後 (None) はデコーダーに残ったバイト列を確定させる
+        pieces = (bytes([b]) for b in iter_byte_values(chunk)) if chunk is not None else [b""]
+        for piece in pieces:
+            pending += piece
+            text = decoder.decode(piece, final=chunk is None)
+            if not text:
+                continue
+            if len(text) > 1:
+                # 最後の文字のバイト列が末尾と一致すれば分けて返す
+                try:
+                    tail = text[-1].encode(encoding)
+                except UnicodeEncodeError:
+                    tail = b""
+                if tail and len(pending) > len(tail) and pending.endswith(tail):
+                    yield text[:-1], pending[: -len(tail)]
+                    yield text[-1], tail
+                    pending = b""
+                    continue
+            yield text, pending
+            pending = b""
+
+
+def score_japanese_text(text):
+    """
+    復号した文字列が日本語のテキストらしいほど大きくなる評価値 (合計) を返す
+    ASCII の表示文字・空白、かな (半角カナを含む)、全角記号を 1、漢字を 0.5 とする (誤った文字コードで復号すると、
+    制御文字や、かなの少ない漢字・ハングルの並びになりやすい)。
+    """
+    codes = np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+    ascii_count = np.count_nonzero(
+        ((codes >= 0x20) & (codes < 0x7F)) | (codes == 0x09) | (codes == 0x0A) | (codes == 0x0D)
+    )
+    kana_count = np.count_nonzero(
+        ((codes >= 0x3000) & (codes <= 0x30FF)) | ((codes >= 0xFF01) & (codes <= 0xFF9F))
+    )
+    kanji_count = np.count_nonzero((codes >= 0x4E00) & (codes <= 0x9FFF))
+    return float(ascii_count + kana_count + 0.5 * kanji_count)
+
+
+class EncodingGuess(NamedTuple):
+    """文字コードの判定結果"""
+
+    # 判定した文字コード (どの候補でも復号できなかった場合は None)
+    encoding: str | None
+    # 最後までエラーなく復号できた候補ごとの、1文字あたりの評価値 (0〜1)
+    scores: dict
+
+
+def detect_encoding(chunks, candidates=DETECT_ENCODINGS):
+    """
+    バイト列 (またはバイト列のチャンクのイテレータ) の文字コードを判定する
+    先頭に BOM があればその文字コードに決める。なければ候補ごとにインクリメンタルデコーダーで
+    チャンクを順に復号し (エラーになった候補は除外)、score_japanese_text の1文字あたりの値が
+    最も大きい候補を選ぶ。メモリに保持するのは1チャンク分のみ。
+    """
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    first = bytes(next(chunks, b""))
+
+    for bom, encoding in DETECT_BOMS:
+        if first.startswith(bom):
+            return EncodingGuess(encoding, {encoding: 1.0})
+
+    decoders = {encoding: codecs.getincrementaldecoder(encoding)() for encoding in candidates}
+    totals = {encoding: [0.0, 0] for encoding in candidates}
+    for chunk in chain([first], chunks, [None]):
+        for encoding, decoder in list(decoders.items()):
+            try:
+                text = decoder.decode(b"", final=True) if chunk is None else decoder.decode(chunk)
+            except UnicodeDecodeError:
+                del decoders[encoding]
+                continue
+            totals[encoding][0] += score_japanese_text(text)
+            totals[encoding][1] += len(text)
+        if not decoders:
+            break
+
+    scores = {
+        encoding: (score / count if count else 1.0)
+        for encoding, (score, count) in totals.items()
+        if encoding in decoders
+    }
+    if not scores:
+        return EncodingGuess(None, {})
+    best = max(scores, key=lambda encoding: (scores[encoding], -candidates.index(encoding)))
+    return EncodingGuess(best, scores)
+
+
+def detect_file_encoding(path, chunk_size=1 << 20, candidates=DETECT_ENCODINGS):
+    """ファイルを chunk_size バイトずつ読み込みながら文字コードを判定する"""
+    with open(path, "rb") as f:
+        return detect_encoding(iter(lambda: f.read(chunk_size), b""), candidates)
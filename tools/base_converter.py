@@ -1,3 +1,8 @@
+from functools import lru_cache
+
+import numpy as np
+
+
 def convert_bin_to_dec_hex(binary_input_cleaned):
     """
     2進数文字列を、16ビットの符号付き整数と16進数に変換する
@@ -194,19 +199,203 @@ def convert_q88_to_dec(q88_hex_4digit):
     Raises:
         ValueError: 入力が4桁の16進数でない場合。
     """
-    integer_part_hex = q88_hex_4digit[0:2]
-    fractional_part_hex = q88_hex_4digit[2:4]
+    return convert_fixed_point_to_dec(q88_hex_4digit, *Q_FORMATS["Q8.8"])
+
+
+def convert_dec_to_q88(decimal_value_float):
+    """
+    10進数 を 16進 固定小数点 (8.8) へ変換
+    例:
+    - 入力: 16.5 (10進数)
+      出力: "0x1080" (16進 固定小数点 8.8), 16 (整数部), 128 (小数部整数), 0.5 (小数部)
+    - 入力: -65.0 (10進数)
+      出力: "0xBF00" (16進 固定小数点 8.8), -65 (整数部), 0 (小数部整数), 0.0 (小数部)
+    なお、入力値は -128 以上 128 未満とする。
+    例: -130.0 や 130.0 はエラー。
+    Args:
+        decimal_value_float (float): 変換する10進数値 (例: 16.5)
+    Returns:
+        tuple: (16進数文字列 (str), 整数部 (int), 小数部整数 (int), 小数部 (float))
+    Raises:
+        ValueError: 入力が -128 未満または 128 以上の場合。
+    """
+
+    return convert_dec_to_fixed_point(decimal_value_float, *Q_FORMATS["Q8.8"])
+
+
+# -------------------------
+# バッチ変換 (NumPy 配列で一括処理)
+# -------------------------
+# 16進/2進の1文字 (ASCII) → 数値 の変換表。不正な文字は 255 とする
+DIGIT_VALUE_TABLE = np.full(256, 255, dtype=np.uint8)
+DIGIT_VALUE_TABLE[np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)] = np.arange(16)
+DIGIT_VALUE_TABLE[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+
+# 数値 → 16進の1文字 (ASCII, 大文字) の変換表
+HEX_CHAR_TABLE = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+
+def parse_batch_strings(strings, base):
+    """
+    2進数/10進数/16進数文字列のリストを、符号なし64ビット整数の配列に一括変換する
+    文字列を uint8 の2次元配列として扱い、変換表と桁のシフトで値を組み立てる。
+    例:
+    - 入力: ["FFD3", "002D"], 16
+      出力: array([65491, 45], dtype=uint64)
+    - 入力: ["-45", "45"], 10
+      出力: array([18446744073709551571, 45], dtype=uint64) (2の補数)
+    Args:
+        strings (list[str]): 変換する文字列のリスト (接頭辞 0x/0b は除去済み)
+        base (int): 基数 (2, 10, 16)
+    Returns:
+        numpy.ndarray: 符号なし64ビット整数の配列
+    Raises:
+        ValueError: 不正な文字が含まれる場合、または64ビットを超える場合。
+    """
+    if base == 10:
+        return np.asarray(strings).astype(np.int64).astype(np.uint64)
+
+    if base not in (2, 16):
+        raise ValueError(f"未対応の基数です: {base}")
+
+    digit_bits = 1 if base == 2 else 4
+    encoded = np.asarray(strings, dtype=np.bytes_)
+    max_digits = encoded.dtype.itemsize
+    if max_digits * digit_bits > 64:
+        raise ValueError("64ビットを超える入力は一括変換できません。")
+
+    # (件数, 最大桁数) の uint8 配列。短い文字列の右側は b"\x00" で埋まる
+    chars = encoded.view(np.uint8).reshape(len(encoded), max_digits)
+    filled = chars != 0
+    digits = DIGIT_VALUE_TABLE[chars]
+    if np.any((digits[filled] >= base)) or not np.all(filled.any(axis=1)):
+        raise ValueError("不正な文字が含まれています。")
+    digits[~filled] = 0
+
+    # 左詰めのまま値を組み立て、足りない桁数分だけ右シフトして桁位置を揃える
+    shifts = np.arange(max_digits - 1, -1, -1, dtype=np.uint64) * np.uint64(digit_bits)
+    values = np.bitwise_or.reduce(digits.astype(np.uint64) << shifts, axis=1)
+    missing = (max_digits - filled.sum(axis=1)).astype(np.uint64) * np.uint64(digit_bits)
+    return values >> missing
+
+
+def convert_batch(values, bit_length, base=10):
+    """
+    整数配列 (または文字列のリスト) を一括で変換する
+    2の補数表現を使用し、配列全体にマスクを掛けて符号付き/符号なしを求める。
+    結果は各スカラー関数と同じになる。
+    - 符号付き/符号なし: convert_bin_to_dec_hex, convert_hex_to_bin_dec と同じ
+    - 16進数: convert_bin_to_dec_hex と同じ (bit_length / 4 切り上げ桁でゼロ埋め)
+    - 2進数: convert_dec_to_bin と同じ ("0b" + bit_length 桁でゼロ埋め)
+    例:
+    - 入力: np.array([-45, 45]), 16
+      出力: (array([-45, 45]), array([65491, 45]),
+             array(["0xFFD3", "0x002D"]),
+             array(["0b1111111111010011", "0b0000000000101101"]))
+    Args:
+        values (numpy.ndarray | list[str]): 変換する整数配列、または文字列のリスト
+        bit_length (int): ビット数 (1〜64)
+        base (int): values が文字列の場合の基数 (2, 10, 16)
+    Returns:
+        tuple: (符号付き整数 (int64配列), 符号なし整数 (uint64配列),
+                16進数文字列 (str配列), 2進数文字列 (str配列))
+    Raises:
+        ValueError: bit_length が1〜64の範囲外の場合、または文字列が不正な場合。
+    """
+    if not 1 <= bit_length <= 64:
+        raise ValueError("bit_length は 1〜64 で指定してください。")
+
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        raw = values.astype(np.uint64)  # 負の値は2の補数として折り返される
+    else:
+        raw = parse_batch_strings(values, base)
+
+    # unsigned: bit_length マスク
+    mask = np.uint64((1 << bit_length) - 1)
+    decimal_unsigned = raw & mask
+
+    # signed（2の補数）: 符号ビットが立っている要素から 2**bit_length を引く
+    if bit_length == 64:
+        decimal_signed = decimal_unsigned.view(np.int64)
+    else:
+        decimal_signed = decimal_unsigned.astype(np.int64)
+        sign_bit = (decimal_signed >> (bit_length - 1)) & 1
+        decimal_signed = decimal_signed - (sign_bit << bit_length)
+
+    hex_output = render_batch_digits(decimal_unsigned, bit_length, 4, "0x")
+    binary_output = render_batch_digits(decimal_unsigned, bit_length, 1, "0b")
+
+    return decimal_signed, decimal_unsigned, hex_output, binary_output
+
+
+def render_batch_digits(decimal_unsigned, bit_length, digit_bits, prefix):
+    """
+    符号なし整数配列を、固定桁の16進数/2進数文字列の配列に一括変換する
+    各桁をシフトとマスクで取り出し、ASCII 変換表で文字コードに置き換えて
+    1つのバイト列配列として組み立てる。
+    Args:
+        decimal_unsigned (numpy.ndarray): 符号なし整数 (uint64配列)
+        bit_length (int): ビット数
+        digit_bits (int): 1桁あたりのビット数 (16進数: 4, 2進数: 1)
+        prefix (str): 接頭辞 (例: "0x")
+    Returns:
+        numpy.ndarray: 文字列 (str) の配列
+    """
+    width = (bit_length + digit_bits - 1) // digit_bits
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64) * np.uint64(digit_bits)
+    digit_mask = np.uint64((1 << digit_bits) - 1)
+    digits = (decimal_unsigned[:, None] >> shifts) & digit_mask
 
-    integer_part_dec = int(integer_part_hex, 16)
-    fractional_part_dec_int = int(fractional_part_hex, 16)
+    prefix_bytes = prefix.encode("ascii")
+    chars = np.empty((len(decimal_unsigned), len(prefix_bytes) + width), dtype=np.uint8)
+    chars[:, : len(prefix_bytes)] = np.frombuffer(prefix_bytes, dtype=np.uint8)
+    chars[:, len(prefix_bytes) :] = HEX_CHAR_TABLE[digits]
 
-    fractional_part_dec = fractional_part_dec_int / 256.0
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(str)
+
+
+# -------------------------
+# 固定小数点 (Qm.n)
+# -------------------------
+# m: 符号ビットを含む整数部のビット数, n: 小数部のビット数 (全体 m + n ビット)
+Q_FORMATS = {
+    "Q1.15": (1, 15),
+    "Q4.12": (4, 12),
+    "Q8.8": (8, 8),
+    "Q16.16": (16, 16),
+}
+
+
+def convert_fixed_point_to_dec(fixed_point_hex, integer_bits, fraction_bits):
+    """
+    16進 固定小数点 (Qm.n) を、10進数へ変換
+    例:
+    - 入力: "1080", 8, 8 (Q8.8 で 16.5)
+      出力: 16.5 (10進数), 16 (整数部), 128 (小数部整数), 0.5 (小数部)
+    - 入力: "C000", 1, 15 (Q1.15 で -0.5)
+      出力: -0.5 (10進数), -1 (整数部), 16384 (小数部整数), 0.5 (小数部)
+    整数部は符号付き (2の補数) として解釈し、小数部は常に正の値とする。
+    Args:
+        fixed_point_hex (str): 変換する16進固定小数点文字列 (例: "1080")
+        integer_bits (int): 符号ビットを含む整数部のビット数 (m)
+        fraction_bits (int): 小数部のビット数 (n)
+    Returns:
+        tuple: (10進数値 (float), 整数部 (int), 小数部整数 (int), 小数部 (float))
+    Raises:
+        ValueError: 入力が16進数でない場合。
+    """
+    bit_length = integer_bits + fraction_bits
+    raw = int(fixed_point_hex, 16) & ((1 << bit_length) - 1)
 
     # 符号付き整数として解釈
-    if integer_part_dec >= 128:
-        integer_part_dec -= 256
+    if raw & (1 << (bit_length - 1)):
+        raw -= 1 << bit_length
+
+    integer_part_dec = raw >> fraction_bits
+    fractional_part_dec_int = raw & ((1 << fraction_bits) - 1)
+    fractional_part_dec = fractional_part_dec_int / (1 << fraction_bits)
 
-    final_decimal_value = integer_part_dec + fractional_part_dec
+    final_decimal_value = raw / (1 << fraction_bits)
 
     return (
         final_decimal_value,
@@ -216,42 +405,265 @@ def convert_q88_to_dec(q88_hex_4digit):
     )
 
 
-def convert_dec_to_q88(decimal_value_float):
+def convert_dec_to_fixed_point(decimal_value_float, integer_bits, fraction_bits):
     """
-    10進数 を 16進 固定小数点 (8.8) へ変換
+    10進数 を 16進 固定小数点 (Qm.n) へ変換
     例:
-    - 入力: 16.5 (10進数)
-      出力: "0x1080" (16進 固定小数点 8.8), 16 (整数部), 128 (小数部整数), 0.5 (小数部)
-    - 入力: -65.0 (10進数)
-      出力: "0xBF00" (16進 固定小数点 8.8), -65 (整数部), 0 (小数部整数), 0.0 (小数部)
-    なお、入力値は -128 以上 128 未満とする。
-    例: -130.0 や 130.0 はエラー。
+    - 入力: 16.5, 8, 8 (Q8.8)
+      出力: "0x1080", 16 (整数部), 128 (小数部整数), 0.5 (小数部)
+    - 入力: -0.5, 1, 15 (Q1.15)
+      出力: "0xC000", 1 (整数部), 16384 (小数部整数), 0.5 (小数部)
+    整数部は2の補数表現 (符号なし) で返す。小数部は 2**n 倍して丸める (偶数丸め)。
+    なお、入力値は -2**(m-1) 以上 2**(m-1) 未満とする。
     Args:
         decimal_value_float (float): 変換する10進数値 (例: 16.5)
+        integer_bits (int): 符号ビットを含む整数部のビット数 (m)
+        fraction_bits (int): 小数部のビット数 (n)
     Returns:
         tuple: (16進数文字列 (str), 整数部 (int), 小数部整数 (int), 小数部 (float))
-    Raises:
-        ValueError: 入力が -128 未満または 128 以上の場合。
     """
-
-    if decimal_value_float < -128 or decimal_value_float >= 128:
+    limit = 1 << (integer_bits - 1)
+    if decimal_value_float < -limit or decimal_value_float >= limit:
         # この関数は範囲チェックをしない。Streamlit側で警告を出す
         return None, None
 
-    temp_value = decimal_value_float
-    if temp_value < 0:
-        temp_value += 256  # 2の補数表現に変換
+    bit_length = integer_bits + fraction_bits
+    raw = round(decimal_value_float * (1 << fraction_bits)) & ((1 << bit_length) - 1)
 
-    integer_part = int(temp_value)
-    fractional_part = temp_value - integer_part
-    fractional_part_hex_int = int(round(fractional_part * 256))
+    # 2の補数表現での整数部・小数部 (丸め前)
+    temp_value = decimal_value_float % (1 << integer_bits)
+    fractional_part = temp_value - int(temp_value)
 
-    # 丸め処理によるオーバーフローを防ぐ
-    if fractional_part_hex_int == 256:
-        fractional_part_hex_int = 0
-        integer_part += 1
+    integer_part = raw >> fraction_bits
+    fractional_part_hex_int = raw & ((1 << fraction_bits) - 1)
 
     # 16進数出力: 0xは小文字、値は大文字に
-    q88_hex = f"0x{integer_part:02X}{fractional_part_hex_int:02X}"
+    width = (bit_length + 3) // 4
+    fixed_point_hex = f"0x{raw:0{width}X}"
+
+    return fixed_point_hex, integer_part, fractional_part_hex_int, fractional_part
+
+
+@lru_cache(maxsize=None)
+def build_fixed_point_decode_table(integer_bits, fraction_bits):
+    """
+    16ビット以下の固定小数点 (Qm.n) の全ビットパターンに対する10進数値の表を作る
+    表は一度だけ作成してキャッシュする。decode_fixed_point はこの表を引くだけで変換できる。
+    Args:
+        integer_bits (int): 符号ビットを含む整数部のビット数 (m)
+        fraction_bits (int): 小数部のビット数 (n)
+    Returns:
+        numpy.ndarray: 長さ 2**(m+n) の float64 配列 (読み取り専用)
+    Raises:
+        ValueError: m + n が16ビットを超える場合。
+    """
+    bit_length = integer_bits + fraction_bits
+    if bit_length > 16:
+        raise ValueError("変換表は16ビット以下の形式のみ作成できます。")
+
+    raw = np.arange(1 << bit_length, dtype=np.int64)
+    raw[raw >= (1 << (bit_length - 1))] -= 1 << bit_length
+    table = raw / float(1 << fraction_bits)
+    table.flags.writeable = False
+    return table
+
+
+def decode_fixed_point(values, integer_bits, fraction_bits):
+    """
+    固定小数点 (Qm.n) のビットパターンの配列を、10進数値の配列に一括変換する
+    16ビット以下の形式は変換表を1回引くだけ、それ以上は配列演算で変換する。
+    例:
+    - 入力: ["1080", "BF00"], 8, 8
+      出力: array([ 16.5, -65. ])
+    Args:
+        values (numpy.ndarray | list[str]): ビットパターンの整数配列、または16進数文字列のリスト
+        integer_bits (int): 符号ビットを含む整数部のビット数 (m)
+        fraction_bits (int): 小数部のビット数 (n)
+    Returns:
+        numpy.ndarray: 10進数値 (float64配列)
+    Raises:
+        ValueError: m + n が1〜64の範囲外の場合、または文字列が不正な場合。
+    """
+    bit_length = integer_bits + fraction_bits
+    if not 1 <= bit_length <= 64:
+        raise ValueError("m + n は 1〜64 で指定してください。")
+
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        raw = values.astype(np.uint64)
+    else:
+        raw = parse_batch_strings(values, 16)
+    raw &= np.uint64((1 << bit_length) - 1)
+
+    if bit_length <= 16:
+        return build_fixed_point_decode_table(integer_bits, fraction_bits)[raw]
+
+    signed, _, _, _ = convert_batch(raw, bit_length)
+    return signed / float(1 << fraction_bits)
+
+
+def encode_fixed_point(values, integer_bits, fraction_bits):
+    """
+    10進数値の配列を、固定小数点 (Qm.n) のビットパターンと16進数文字列に一括変換する
+    2**n 倍して偶数丸めし、m + n ビットでマスクした2の補数表現とする。
+    範囲外の値はスカラー関数の丸め桁上がりと同様に折り返される。
+    例:
+    - 入力: np.array([16.5, -65.0]), 8, 8
+      出力: (array([4224, 48896], dtype=uint64), array(["0x1080", "0xBF00"]))
+    Args:
+        values (numpy.ndarray | list[float]): 変換する10進数値
+        integer_bits (int): 符号ビットを含む整数部のビット数 (m)
+        fraction_bits (int): 小数部のビット数 (n)
+    Returns:
+        tuple: (ビットパターン (uint64配列), 16進数文字列 (str配列))
+    Raises:
+        ValueError: m + n が1〜64の範囲外の場合。
+    """
+    bit_length = integer_bits + fraction_bits
+    if not 1 <= bit_length <= 64:
+        raise ValueError("m + n は 1〜64 で指定してください。")
+
+    scaled = np.rint(np.asarray(values, dtype=np.float64) * float(1 << fraction_bits))
+    raw = scaled.astype(np.int64).astype(np.uint64) & np.uint64((1 << bit_length) - 1)
+
+    return raw, render_batch_digits(raw, bit_length, 4, "0x")
+
+
+# -------------------------
+# 任意ビット幅の変換 (256〜4096 ビットなどの大きな整数向け)
+# -------------------------
+# 16進の1文字 → 4桁の2進数文字列 の変換表 (str.translate 用)
+NIBBLE_BIT_TABLE = str.maketrans(
+    {c: f"{int(c, 16):04b}" for c in "0123456789abcdefABCDEF"}
+)
+# 4桁区切り用: 各4桁の後ろに空白を付ける (末尾の空白は最後に除去する)
+NIBBLE_BIT_GROUPED_TABLE = str.maketrans(
+    {c: f"{int(c, 16):04b} " for c in "0123456789abcdefABCDEF"}
+)
+
+
+def convert_hex_digits_to_binary(hex_digits, bit_length, grouping=False):
+    """
+    16進数字列 (接頭辞なし) を、bit_length 桁の2進数文字列に変換する
+    変換表を使った str.translate の1パスで変換し、途中の文字列を作らない。
+    例:
+    - 入力: "FFD3", 16
+      出力: "0b1111111111010011"
+    - 入力: "FFD3", 16, grouping=True
+      出力: "0b1111 1111 1101 0011"
+    Args:
+        hex_digits (str): 16進数字列 (桁数 = bit_length / 4 切り上げ)
+        bit_length (int): 2進数でのビット数
+        grouping (bool): 4桁区切りにする場合 True
+    Returns:
+        str: 2進数文字列 ("0b" 付き)
+    """
+    extra_bits = len(hex_digits) * 4 - bit_length
+    if not grouping:
+        return "0b" + hex_digits.translate(NIBBLE_BIT_TABLE)[extra_bits:]
+    if extra_bits == 0:
+        return "0b" + hex_digits.translate(NIBBLE_BIT_GROUPED_TABLE)[:-1]
+
+    # 4の倍数でないビット数は、先頭から4桁ずつ区切る既存の書式に合わせる
+    return convert_binary_4digit_grouping(
+        "0b" + hex_digits.translate(NIBBLE_BIT_TABLE)[extra_bits:]
+    )
+
+
+def convert_unsigned_to_hex_digits(decimal_unsigned, bit_length):
+    """
+    符号なし整数を、bit_length / 4 切り上げ桁の16進数字列 (大文字、接頭辞なし) に変換する
+    int.to_bytes と bytes.hex で変換する。
+    Args:
+        decimal_unsigned (int): 符号なし整数 (0 以上 2**bit_length 未満)
+        bit_length (int): ビット数
+    Returns:
+        str: 16進数字列 (例: "FFD3")
+    """
+    width = (bit_length + 3) // 4
+    hex_digits = decimal_unsigned.to_bytes((bit_length + 7) // 8, "big").hex().upper()
+    return hex_digits[len(hex_digits) - width :]
+
+
+def convert_hex_to_bin_dec_wide(hex_input_cleaned, grouping=False):
+    """
+    任意桁数の16進数文字列を、2進数と10進数に変換 (convert_hex_to_bin_dec の大きな整数向け版)
+    2進数は入力の16進数字を変換表で直接置き換えるため、桁数が多くても1パスで済む。
+    例:
+    - 入力: "FFD3"
+      出力: "0b1111111111010011" (2進数), -45 (符号付き), 65491 (符号なし)
+    Args:
+        hex_input_cleaned (str): 変換する16進数文字列 (例: "FFD3")
+        grouping (bool): 2進数を4桁区切りにする場合 True
+    Returns:
+        tuple: (2進数文字列 (str), 符号付き10進数値 (int), 符号なし10進数値 (int))
+    Raises:
+        ValueError: 入力が16進数でない場合。
+    """
+    decimal_unsigned = int(hex_input_cleaned, 16)
+    bit_length = len(hex_input_cleaned) * 4
+
+    # 符号付き整数（2の補数）
+    if decimal_unsigned >> (bit_length - 1):
+        decimal_signed = decimal_unsigned - (1 << bit_length)
+    else:
+        decimal_signed = decimal_unsigned
+
+    binary_output = convert_hex_digits_to_binary(hex_input_cleaned, bit_length, grouping)
+
+    return binary_output, decimal_signed, decimal_unsigned
+
+
+def convert_bin_to_dec_hex_wide(binary_input_cleaned):
+    """
+    任意桁数の2進数文字列を、10進数と16進数に変換 (convert_bin_to_dec_hex の大きな整数向け版)
+    例:
+    - 入力: "1111111111010011"
+      出力: -45 (符号付き), 65491 (符号なし), "0xFFD3" (16進数)
+    Args:
+        binary_input_cleaned (str): 変換する2進数文字列
+    Returns:
+        tuple: (符号付き10進数値 (int), 符号なし10進数値 (int), 16進数文字列 (str))
+    Raises:
+        ValueError: 入力が2進数でない場合。
+    """
+    bit_length = len(binary_input_cleaned)
+    decimal_unsigned = int(binary_input_cleaned, 2)
+
+    # 符号付き整数（2の補数）
+    if decimal_unsigned >> (bit_length - 1):
+        decimal_signed = decimal_unsigned - (1 << bit_length)
+    else:
+        decimal_signed = decimal_unsigned
+
+    hex_output = "0x" + convert_unsigned_to_hex_digits(decimal_unsigned, bit_length)
+
+    return decimal_signed, decimal_unsigned, hex_output
+
+
+def convert_dec_to_bin_hex_wide(decimal_value, bit_length, grouping=False):
+    """
+    10進数値を、bit_length 桁の2進数と16進数に変換 (大きな整数向け)
+    convert_dec_to_bin / convert_dec_to_hex と同じく2の補数でマスクする。
+    例:
+    - 入力: -45, 16
+      出力: "0b1111111111010011" (2進数), "0xFFD3" (16進数)
+    Args:
+        decimal_value (int): 変換する10進数値
+        bit_length (int): ビット数
+        grouping (bool): 2進数を4桁区切りにする場合 True
+    Returns:
+        tuple: (2進数文字列 (str), 16進数文字列 (str))
+    """
+    masked_value = convert_dec_to_masked_value(decimal_value, bit_length)
+    if bit_length == 0:
+        # convert_dec_to_bin / convert_dec_to_hex と同じく 0 を1桁で表す
+        return "0b0", "0x0"
+    hex_digits = convert_unsigned_to_hex_digits(masked_value, bit_length)
+
+    binary_output = convert_hex_digits_to_binary(hex_digits, bit_length, grouping)
+
+    # convert_dec_to_hex と同じく、16進数は bit_length / 4 切り捨て桁 (最低1桁) でゼロ埋めする
+    if bit_length % 4 and len(hex_digits) > 1 and hex_digits[0] == "0":
+        hex_digits = hex_digits[1:]
 
-    return q88_hex, integer_part, fractional_part_hex_int, fractional_part
+    return binary_output, "0x" + hex_digits
@@ -0,0 +1,308 @@
+"""
+基数変換のストリーミング処理 (ヘッドレス / CLI)
+ファイルまたは標準入力からトークンを1行ずつ読み込み、一定件数のチャンク単位で
+変換して CSV / JSONL を逐次出力する。入力サイズに関わらずメモリ使用量は一定。
+
+使い方:
+    python -m tools.base_converter_stream hex dump.txt --format jsonl
+    cat words.txt | python -m tools.base_converter_stream dec --bits 32
+    python -m tools.base_converter_stream q88 --q-format Q1.15 telemetry.txt
+"""
+
+import argparse
+import csv
+import json
+import string
+import sys
+import time
+from itertools import islice, repeat
+
+import numpy as np
+
+from tools.base_converter import (
+    convert_batch,
+    convert_bin_to_dec_hex,
+    convert_dec_to_bin,
+    convert_fixed_point_to_dec,
+    convert_hex_to_bin_dec,
+    decode_fixed_point,
+    parse_batch_strings,
+    Q_FORMATS,
+)
+
+# モードごとの出力列
+FIELDS = {
+    "bin": ["input", "signed", "unsigned", "hex", "error"],
+    "dec": ["input", "signed", "unsigned", "hex", "bin", "error"],
+    "hex": ["input", "signed", "unsigned", "bin", "error"],
+    "q88": ["input", "decimal", "integer_part", "fractional_part_int", "error"],
+}
+
+# 入力トークンから除去する接頭辞
+PREFIXES = {"bin": ("0b", "0B"), "hex": ("0x", "0X"), "q88": ("0x", "0X")}
+
+# ビット数を指定した場合に、1件ずつの変換で受け付ける文字
+DIGIT_CHARS = {"bin": frozenset("01"), "hex": frozenset(string.hexdigits)}
+
+
+def iter_tokens(lines, mode):
+    """
+    行のイテレータから、空白区切りのトークンを1つずつ取り出す
+    接頭辞 (0b / 0x) は除去する。Q8.8 の場合は "." も除去する。
+    Args:
+        lines (Iterable[str]): 入力行
+        mode (str): 変換モード ("bin", "dec", "hex", "q88")
+    Yields:
+        str: 変換対象のトークン
+    """
+    prefixes = PREFIXES.get(mode, ())
+    for line in lines:
+        for token in line.split():
+            if mode == "q88":
+                token = token.replace(".", "")
+            if prefixes and token.startswith(prefixes):
+                token = token[2:]
+            yield token
+
+
+def iter_chunks(tokens, chunk_size):
+    """
+    トークンのイテレータを chunk_size 件ずつのリストに分割する
+    Args:
+        tokens (Iterable[str]): トークン
+        chunk_size (int): 1チャンクの件数
+    Yields:
+        list[str]: トークンのリスト
+    """
+    tokens = iter(tokens)
+    while chunk := list(islice(tokens, chunk_size)):
+        yield chunk
+
+
+def convert_token(token, mode, bit_length, q_format="Q8.8"):
+    """
+    1トークンを既存のスカラー関数で変換し、出力行 (dict) を返す
+    変換できない場合は error 列にメッセージを入れる。
+    Args:
+        token (str): 変換するトークン
+        mode (str): 変換モード ("bin", "dec", "hex", "q88")
+        bit_length (int | None): ビット数 (dec モードでは必須。bin / hex では指定した場合、
+            convert_batch と同じくこのビット数でマスク・ゼロ埋めする)
+        q_format (str): 固定小数点形式 (q88 モードで使用、Q_FORMATS のキー)
+    Returns:
+        dict: 出力行
+    """
+    try:
+        match mode:
+            case "bin" | "hex" if bit_length is not None:
+                if not set(token) <= DIGIT_CHARS[mode]:
+                    raise ValueError("不正な文字が含まれています。")
+                value = int(token, 2 if mode == "bin" else 16) & ((1 << bit_length) - 1)
+                binary_value = "0b" + bin(value)[2:].zfill(bit_length)
+                signed, unsigned, hex_value = convert_bin_to_dec_hex(binary_value[2:])
+                row = {"input": token, "signed": signed, "unsigned": unsigned}
+                if mode == "bin":
+                    return row | {"hex": hex_value}
+                return row | {"bin": binary_value}
+            case "bin":
+                signed, unsigned, hex_value = convert_bin_to_dec_hex(token)
+                return {"input": token, "signed": signed, "unsigned": unsigned, "hex": hex_value}
+            case "dec":
+                binary_value = convert_dec_to_bin(int(token), bit_length)
+                signed, unsigned, hex_value = convert_bin_to_dec_hex(binary_value[2:])
+                return {
+                    "input": token,
+                    "signed": signed,
+                    "unsigned": unsigned,
+                    "hex": hex_value,
+                    "bin": binary_value,
+                }
+            case "hex":
+                binary_value, signed, unsigned = convert_hex_to_bin_dec(token)
+                return {"input": token, "signed": signed, "unsigned": unsigned, "bin": binary_value}
+            case "q88":
+                integer_bits, fraction_bits = Q_FORMATS[q_format]
+                width = (integer_bits + fraction_bits + 3) // 4
+                if len(token) != width:
+                    raise ValueError(
+                        f"固定小数点{q_format}形式は、16進数{width}桁で入力してください。"
+                    )
+                decimal_value, integer_part, fractional_int, _ = (
+                    convert_fixed_point_to_dec(token, integer_bits, fraction_bits)
+                )
+                return {
+                    "input": token,
+                    "decimal": decimal_value,
+                    "integer_part": integer_part,
+                    "fractional_part_int": fractional_int,
+                }
+    except ValueError as e:
+        return {"input": token, "error": str(e)}
+
+
+def convert_chunk(chunk, mode, bit_length=None, q_format="Q8.8"):
+    """
+    チャンク (トークンのリスト) を変換し、出力行のリストを返す
+    bin / dec / hex は convert_batch で一括変換する。bin / hex でビット数が
+    指定されていない場合は、既存関数と同じくトークンの桁数からビット数を決めるため、
+    チャンク内の桁数が揃っているときだけ一括変換し、揃っていなければ1件ずつ変換する。
+    q88 は decode_fixed_point で一括変換する (q_format で Q1.15 などにも対応)。
+    不正なトークンを含むチャンクも1件ずつ変換し、該当行に error を入れる。
+    Args:
+        chunk (list[str]): トークンのリスト
+        mode (str): 変換モード ("bin", "dec", "hex", "q88")
+        bit_length (int | None): ビット数
+        q_format (str): 固定小数点形式 (q88 モードで使用、Q_FORMATS のキー)
+    Returns:
+        list[tuple]: 出力行 (FIELDS[mode] の列順、値がない列は "") のリスト
+    """
+    batch_bits = bit_length
+    if mode in ("bin", "hex") and batch_bits is None:
+        digit_bits = 1 if mode == "bin" else 4
+        lengths = {len(token) for token in chunk}
+        if len(lengths) == 1:
+            batch_bits = lengths.pop() * digit_bits
+
+    if mode != "q88" and batch_bits is not None and batch_bits <= 64:
+        base = {"bin": 2, "dec": 10, "hex": 16}[mode]
+        try:
+            signed, unsigned, hex_out, bin_out = convert_batch(chunk, batch_bits, base)
+        except (ValueError, OverflowError):
+            pass
+        else:
+            columns = [chunk, signed.tolist(), unsigned.tolist()]
+            if mode != "hex":
+                columns.append(hex_out.tolist())
+            if mode != "bin":
+                columns.append(bin_out.tolist())
+            columns.append(repeat("", len(chunk)))
+            return list(zip(*columns))
+
+    if mode == "q88":
+        integer_bits, fraction_bits = Q_FORMATS[q_format]
+        width = (integer_bits + fraction_bits + 3) // 4
+        if all(len(token) == width for token in chunk):
+            try:
+                raw = parse_batch_strings(chunk, 16)
+            except ValueError:
+                pass
+            else:
+                decimal_values = decode_fixed_point(raw, integer_bits, fraction_bits)
+                signed = raw.astype(np.int64)
+                signed[signed >= (1 << (integer_bits + fraction_bits - 1))] -= (
+                    1 << (integer_bits + fraction_bits)
+                )
+                return list(
+                    zip(
+                        chunk,
+                        decimal_values.tolist(),
+                        (signed >> fraction_bits).tolist(),
+                        (signed & ((1 << fraction_bits) - 1)).tolist(),
+                        repeat("", len(chunk)),
+                    )
+                )
+
+    fields = FIELDS[mode]
+    rows = []
+    for token in chunk:
+        row = convert_token(token, mode, bit_length, q_format)
+        rows.append(tuple(row.get(field, "") for field in fields))
+    return rows
+
+
+def stream_convert(
+    lines, out, mode, output_format="csv", bit_length=None, chunk_size=65536, q_format="Q8.8"
+):
+    """
+    入力行を読み込みながら変換し、CSV / JSONL を out に逐次書き出す
+    一度に保持するのは1チャンク分のトークンと出力行のみ。
+    JSONL では値のない列 (正常時の error など) は出力しない。
+    Args:
+        lines (Iterable[str]): 入力行 (ファイルオブジェクトなど)
+        out (TextIO): 出力先
+        mode (str): 変換モード ("bin", "dec", "hex", "q88")
+        output_format (str): 出力形式 ("csv", "jsonl")
+        bit_length (int | None): ビット数 (dec モードでは必須)
+        chunk_size (int): 1チャンクの件数
+        q_format (str): 固定小数点形式 (q88 モードで使用、Q_FORMATS のキー)
+    Returns:
+        int: 変換したトークン数
+    Raises:
+        ValueError: mode / output_format が不正な場合、または dec モードでビット数がない場合。
+    """
+    if mode not in FIELDS:
+        raise ValueError(f"未対応の変換モードです: {mode}")
+    if output_format not in ("csv", "jsonl"):
+        raise ValueError(f"未対応の出力形式です: {output_format}")
+    if mode == "dec" and bit_length is None:
+        raise ValueError("dec モードではビット数を指定してください。")
+    if q_format not in Q_FORMATS:
+        raise ValueError(f"未対応の固定小数点形式です: {q_format}")
+
+    fields = FIELDS[mode]
+    writer = None
+    if output_format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(fields)
+
+    count = 0
+    for chunk in iter_chunks(iter_tokens(lines, mode), chunk_size):
+        rows = convert_chunk(chunk, mode, bit_length, q_format)
+        if writer:
+            writer.writerows(rows)
+        else:
+            out.writelines(
+                json.dumps(
+                    {f: v for f, v in zip(fields, row) if v != ""}, ensure_ascii=False
+                )
+                + "\n"
+                for row in rows
+            )
+        count += len(rows)
+
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="2進数/10進数/16進数/Q8.8 のトークンを一括変換して CSV / JSONL を出力します。"
+    )
+    parser.add_argument("mode", choices=list(FIELDS), help="入力トークンの形式")
+    parser.add_argument("input", nargs="?", default="-", help="入力ファイル (省略時または - は標準入力)")
+    parser.add_argument("-o", "--output", default="-", help="出力ファイル (省略時または - は標準出力)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv", help="出力形式")
+    parser.add_argument(
+        "-b", "--bits", type=int, default=None,
+        help="ビット数 (dec は既定16。bin / hex は省略時トークンの桁数から決定)",
+    )
+    parser.add_argument(
+        "-q", "--q-format", choices=list(Q_FORMATS), default="Q8.8",
+        help="固定小数点形式 (q88 モードで使用、既定 Q8.8)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=65536, help="1チャンクの件数")
+    args = parser.parse_args(argv)
+
+    bit_length = args.bits
+    if args.mode == "dec" and bit_length is None:
+        bit_length = 16
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        start = time.perf_counter()
+        count = stream_convert(
+            src, dst, args.mode, args.format, bit_length, args.chunk_size, args.q_format
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"{count:,} 件を {elapsed:.3f} 秒で変換しました ({rate:,.0f} 件/秒)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
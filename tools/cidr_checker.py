@@ -1,4 +1,64 @@
 import ipaddress
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, NamedTuple
+import numpy as np
+
+
+class SubnetMask(NamedTuple):
+    """プレフィックス長ごとのサブネットマスクの表現"""
+
+    mask: int
+    decimal: str  # IPv4: "255.255.255.0" / IPv6: "ffff:ffff::"
+    wildcard: str  # マスクの反転 (IPv4: "0.0.0.255")
+    binary: str  # IPv4 は8ビット、IPv6 は16ビットごとに空白で区切った2進数
+
+
+def format_address(value: int, version=4) -> str:
+    """整数のアドレスを文字列にする (IPv4 は ipaddress を使わずに組み立てる)"""
+    if version == 4:
+        return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+    return str(ipaddress.IPv6Address(value))
+
+
+def build_subnet_mask_table(version=4) -> tuple[SubnetMask, ...]:
+    """プレフィックス長 0〜32 (IPv6 は 0〜128) のサブネットマスクの表を作る"""
+    bits, group = (32, 8) if version == 4 else (128, 16)
+    all_ones = (1 << bits) - 1
+    table = []
+    for prefix_length in range(bits + 1):
+        mask = all_ones ^ (all_ones >> prefix_length)
+        binary = f"{mask:0{bits}b}"
+        table.append(
+            SubnetMask(
+                mask=mask,
+                decimal=format_address(mask, version),
+                wildcard=format_address(all_ones ^ mask, version),
+                binary=" ".join(binary[i : i + group] for i in range(0, bits, group)),
+            )
+        )
+    return tuple(table)
+
+
+# IPv4 のサブネットマスクの表 (プレフィックス長 0〜32)
+IPV4_SUBNET_MASKS = build_subnet_mask_table(4)
+
+
+@lru_cache(maxsize=1)
+def get_ipv6_subnet_masks() -> tuple[SubnetMask, ...]:
+    """IPv6 のサブネットマスクの表 (プレフィックス長 0〜128、初回の呼び出しで作成する)"""
+    return build_subnet_mask_table(6)
+
+
+def get_subnet_mask(prefix_length, version=4) -> SubnetMask:
+    """プレフィックス長のサブネットマスクを表から返す"""
+    table = IPV4_SUBNET_MASKS if version == 4 else get_ipv6_subnet_masks()
+    if not 0 <= prefix_length < len(table):
+        raise ValueError(f"プレフィックス長は 0〜{len(table) - 1} の範囲で指定してください")
+    return table[prefix_length]
 
 
 def calculate_subnet_mask(prefix_length):
@@ -9,11 +69,542 @@ def calculate_subnet_mask(prefix_length):
     Returns:
         tuple: (binary_mask (str), decimal_mask (str))
     """
-    # 2進数表現
-    binary_mask = "1" * prefix_length + "0" * (32 - prefix_length)
-    binary_mask_formatted = " ".join([binary_mask[i : i + 8] for i in range(0, 32, 8)])
+    subnet_mask = get_subnet_mask(prefix_length)
+    return subnet_mask.binary, subnet_mask.decimal
+
+
+class HostRange(NamedTuple):
+    """ネットワークの範囲 (アドレスはすべて整数)"""
+
+    network: int
+    broadcast: int
+    num_addresses: int
+    # ネットワークアドレスとブロードキャストアドレスを除いたホスト数 (アドレス数が2以下なら 0)
+    host_count: int
+    first_host: int | None
+    last_host: int | None
+
+
+def calculate_host_range(address: int, prefix_length: int, version=4) -> HostRange:
+    """
+    整数のアドレスとプレフィックス長から、ネットワークの範囲を整数だけで求める
+    (ipaddress のオブジェクトは作らない)。
+    """
+    mask = get_subnet_mask(prefix_length, version).mask
+    bits = 32 if version == 4 else 128
+    network = address & mask
+    num_addresses = 1 << (bits - prefix_length)
+    broadcast = network + num_addresses - 1
+    if num_addresses > 2:
+        return HostRange(
+            network, broadcast, num_addresses, num_addresses - 2, network + 1, broadcast - 1
+        )
+    return HostRange(network, broadcast, num_addresses, 0, None, None)
+
+
+class PrefixIndex(NamedTuple):
+    """
+    最長一致検索 (longest-prefix match) 用のインデックス
+    重なり合うネットワークを、互いに重ならない区間に分割して保持する。
+    区間 i は starts[i] から次の区間の開始の直前までで、そこに含まれるアドレスの
+    最も長いプレフィックスのネットワークが networks[owners[i]] (なければ -1)。
+    """
+
+    networks: list
+    v4_starts: np.ndarray  # uint32 (番兵の 0 を含めて昇順)
+    v4_owners: np.ndarray  # int64
+    v6_starts: list[int]
+    v6_owners: list[int]
+
+
+def flatten_prefixes(prefixes, max_address):
+    """
+    (開始アドレス, 終了アドレス, ネットワークの番号) のリストを、重ならない区間
+    (開始アドレスのリスト, ネットワークの番号のリスト) に変換する。
+    開始アドレスの昇順・範囲の広い順に並べ、含んでいるネットワークをスタックに積みながら走査する。
+    """
+    starts = [0]
+    owners = [-1]
+
+    def emit(start, owner):
+        if start > max_address:
+            return
+        # 同じ開始アドレスは後から決まった方 (より内側、または範囲の終わり) を使う
+        if starts[-1] == start:
+            owners[-1] = owner
+        else:
+            starts.append(start)
+            owners.append(owner)
+
+    stack = []
+    for start, end, owner in sorted(prefixes, key=lambda p: (p[0], -p[1])):
+        # start より前に終わるネットワークを取り除き、その直後を外側のネットワークに戻す
+        while stack and stack[-1][0] < start:
+            stack_end, _ = stack.pop()
+            emit(stack_end + 1, stack[-1][1] if stack else -1)
+        stack.append((end, owner))
+        emit(start, owner)
+    while stack:
+        stack_end, _ = stack.pop()
+        emit(stack_end + 1, stack[-1][1] if stack else -1)
+
+    # 隣り合う区間で番号が同じものはまとめる
+    merged_starts = [starts[0]]
+    merged_owners = [owners[0]]
+    for start, owner in zip(starts[1:], owners[1:]):
+        if owner != merged_owners[-1]:
+            merged_starts.append(start)
+            merged_owners.append(owner)
+    return merged_starts, merged_owners
+
+
+def build_prefix_index(networks) -> PrefixIndex:
+    """
+    IPv4 / IPv6 のネットワーク (文字列 "10.0.0.0/8" または ipaddress のネットワーク) のリストから、
+    最長一致検索のインデックスを作成する。ホスト部が 0 でない表記も受け付ける (strict=False)。
+    """
+    networks = [
+        n if isinstance(n, (ipaddress.IPv4Network, ipaddress.IPv6Network))
+        else ipaddress.ip_network(n, strict=False)
+        for n in networks
+    ]
+
+    v4_prefixes = []
+    v6_prefixes = []
+    for i, network in enumerate(networks):
+        start = int(network.network_address)
+        end = start | ((1 << (network.max_prefixlen - network.prefixlen)) - 1)
+        (v4_prefixes if network.version == 4 else v6_prefixes).append((start, end, i))
+
+    v4_starts, v4_owners = flatten_prefixes(v4_prefixes, (1 << 32) - 1)
+    v6_starts, v6_owners = flatten_prefixes(v6_prefixes, (1 << 128) - 1)
+    return PrefixIndex(
+        networks=networks,
+        v4_starts=np.array(v4_starts, dtype=np.uint32),
+        v4_owners=np.array(v4_owners, dtype=np.int64),
+        v6_starts=v6_starts,
+        v6_owners=v6_owners,
+    )
+
+
+def find_prefix_owner(prefix_index: PrefixIndex, address) -> int:
+    """ipaddress のアドレスを含む、最も長いプレフィックスのネットワークの番号 (なければ -1)"""
+    if address.version == 4:
+        i = np.searchsorted(prefix_index.v4_starts, np.uint32(int(address)), side="right") - 1
+        return int(prefix_index.v4_owners[i])
+    i = bisect_right(prefix_index.v6_starts, int(address)) - 1
+    return prefix_index.v6_owners[i]
+
+
+def lookup_prefix(prefix_index: PrefixIndex, ip):
+    """
+    IP アドレス (文字列または ipaddress のアドレス) を含む、最も長いプレフィックスの
+    ネットワークを O(log n) で返す。該当がなければ None を返す。
+    """
+    owner = find_prefix_owner(prefix_index, ipaddress.ip_address(ip))
+    return prefix_index.networks[owner] if owner >= 0 else None
+
+
+def lookup_prefix_batch(prefix_index: PrefixIndex, ips: np.ndarray) -> np.ndarray:
+    """
+    IPv4 アドレスの配列 (uint32) をまとめて検索し、networks の番号の配列 (int64) を返す。
+    該当するネットワークがないアドレスは -1。
+    """
+    ips = np.asarray(ips, dtype=np.uint32)
+    positions = np.searchsorted(prefix_index.v4_starts, ips, side="right") - 1
+    return prefix_index.v4_owners[positions]
+
+
+def lookup_prefix_batch_v6(prefix_index: PrefixIndex, ips) -> list[int]:
+    """IPv6 アドレス (128ビットの整数) のリストをまとめて検索し、networks の番号のリストを返す"""
+    starts = prefix_index.v6_starts
+    owners = prefix_index.v6_owners
+    return [owners[bisect_right(starts, ip) - 1] for ip in ips]
+
+
+# 一括付与 (enrich) の出力列
+ENRICH_FIELDS = ["ip", "network", "broadcast", "prefix_length", "error"]
+
+# IPv4 アドレス文字列の最大長 ("255.255.255.255")
+IPV4_MAX_LENGTH = 15
+
+# 一括付与で一度に処理する行数
+ENRICH_CHUNK_SIZE = 65536
+
+# プロセスプールの各ワーカーが保持するインデックス (init_enrich_worker で設定)
+enrich_worker_state = {}
+
+
+def parse_ipv4_batch(strings) -> tuple[np.ndarray, np.ndarray]:
+    """
+    IPv4 アドレスの文字列のリストを、ipaddress のオブジェクトを作らずに整数へ変換する。
+    文字列を固定長のバイト配列にし、列 (文字の位置) ごとに全行をまとめて処理する。
+    ipaddress と同じく、各オクテットは 0〜255 の 1〜3 桁で、先頭の 0 (例: "010") は不正とする。
+    ASCII 以外の文字を含む行も不正とする。
+    Returns:
+        tuple: (アドレスの配列 (uint32), 正しく変換できた行の配列 (bool))
+    """
+    count = len(strings)
+    # ASCII 以外の文字を含んでいてもエラーにしないよう、Unicode の固定長配列を経由する。
+    # 255 を超える文字は 255 にまとめる (数字・"."・NUL 以外なので、その行は不正になる)
+    raw = np.array(strings, dtype=f"U{IPV4_MAX_LENGTH + 1}") if count else np.empty(0, "U16")
+    wide_codes = raw.view(np.uint32).reshape(count, IPV4_MAX_LENGTH + 1)
+    codes = np.minimum(wide_codes, 255).astype(np.uint8)
+
+    address = np.zeros(count, dtype=np.uint32)
+    octet = np.zeros(count, dtype=np.uint32)
+    digits = np.zeros(count, dtype=np.uint8)
+    leading_zero = np.zeros(count, dtype=bool)
+    dots = np.zeros(count, dtype=np.uint8)
+    ended = np.zeros(count, dtype=bool)
+    # 長さ 16 以上の文字列 (最後の列が埋まっている) は不正
+    valid = codes[:, IPV4_MAX_LENGTH] == 0
+
+    for column in range(IPV4_MAX_LENGTH + 1):
+        c = codes[:, column]
+        is_digit = (c >= 48) & (c <= 57) & ~ended
+        # オクテットの終わり: "." または文字列の終わり (NUL)
+        is_end = ((c == 46) | (c == 0)) & ~ended
+
+        valid &= is_digit | is_end | ended
+        # 終わったオクテットの確認と、アドレスへの追加
+        valid &= ~is_end | ((digits >= 1) & (octet <= 255) & ~(leading_zero & (digits > 1)))
+        address = np.where(is_end, (address << 8) | (octet & 0xFF), address)
+        dots += is_end & (c == 46)
+        ended |= is_end & (c == 0)
+        octet = np.where(is_end, 0, octet)
+        digits = np.where(is_end, 0, digits)
+
+        # 数字の追加 (3桁を超えたら不正)
+        leading_zero = np.where(is_digit & (digits == 0), c == 48, leading_zero)
+        octet = np.where(is_digit, octet * 10 + (c - 48), octet)
+        digits = digits + is_digit
+        valid &= digits <= 3
+
+    valid &= ended & (dots == 3)
+    return address, valid
+
+
+def build_enrichment_table(prefix_index: PrefixIndex) -> tuple[list, list, list]:
+    """
+    networks の番号ごとの出力値 (ネットワーク, ブロードキャストアドレス, プレフィックス長) の列のリスト。
+    各列の末尾に該当なし (番号 -1) の値 "" を加える。
+    """
+    networks = [str(n) for n in prefix_index.networks] + [""]
+    broadcasts = [str(n.broadcast_address) for n in prefix_index.networks] + [""]
+    prefix_lengths = [n.prefixlen for n in prefix_index.networks] + [""]
+    return networks, broadcasts, prefix_lengths
+
+
+def enrich_chunk(prefix_index: PrefixIndex, table: tuple, ips: list[str]) -> list[tuple]:
+    """
+    IP アドレスの文字列のリストに、含まれるネットワークの情報を付与する。
+    IPv4 は parse_ipv4_batch と lookup_prefix_batch でまとめて処理し、
+    それ以外 (IPv6 や不正な文字列) だけ ipaddress で1件ずつ処理する。
+    Returns:
+        list[tuple]: ENRICH_FIELDS の列順の出力行 (値がない列は "")
+    """
+    addresses, valid = parse_ipv4_batch(ips)
+    owners = lookup_prefix_batch(prefix_index, addresses).tolist()
+    errors = [""] * len(ips)
+
+    for i in np.flatnonzero(~valid).tolist():
+        try:
+            owners[i] = find_prefix_owner(prefix_index, ipaddress.ip_address(ips[i]))
+        except ValueError as e:
+            owners[i] = -1
+            errors[i] = str(e)
+
+    # 列ごとに値を引いて、行にまとめる
+    networks, broadcasts, prefix_lengths = table
+    return list(
+        zip(
+            ips,
+            map(networks.__getitem__, owners),
+            map(broadcasts.__getitem__, owners),
+            map(prefix_lengths.__getitem__, owners),
+            errors,
+        )
+    )
+
+
+def iter_ip_chunks(lines, chunk_size=ENRICH_CHUNK_SIZE, ip_field=0) -> Iterator[list[str]]:
+    """
+    ログの行から IP アドレスの列 (空白区切りで ip_field 番目) を取り出し、chunk_size 件ずつ返す。
+    空行は読み飛ばす。
+    """
+    split_count = ip_field + 1
+    ips = (
+        fields[ip_field]
+        for fields in (line.split(None, split_count) for line in lines)
+        if len(fields) > ip_field
+    )
+    while chunk := list(islice(ips, chunk_size)):
+        yield chunk
+
+
+def init_enrich_worker(prefix_index: PrefixIndex):
+    """プロセスプールのワーカーの初期化: インデックスと出力値の表を1回だけ受け取る"""
+    enrich_worker_state["prefix_index"] = prefix_index
+    enrich_worker_state["table"] = build_enrichment_table(prefix_index)
+
+
+def enrich_chunk_in_worker(ips: list[str]) -> list[tuple]:
+    """プロセスプールのワーカーで enrich_chunk を実行する"""
+    return enrich_chunk(
+        enrich_worker_state["prefix_index"], enrich_worker_state["table"], ips
+    )
+
+
+def enrich_ips(
+    lines, prefix_index: PrefixIndex, chunk_size=ENRICH_CHUNK_SIZE, ip_field=0, workers=1
+) -> Iterator[list[tuple]]:
+    """
+    ログの行 (ファイルオブジェクトやイテレータ) を読み込みながら、各行の IP アドレスに
+    ネットワーク・ブロードキャストアドレス・プレフィックス長を付与し、チャンクごとに出力行を返す。
+    workers が 2 以上の場合はプロセスプールで並列に処理する。入力の順序は保ち、
+    処理中のチャンクは workers の2倍までに抑えるため、メモリ使用量は入力サイズに依存しない。
+    """
+    chunks = iter_ip_chunks(lines, chunk_size, ip_field)
+
+    if workers <= 1:
+        table = build_enrichment_table(prefix_index)
+        for ips in chunks:
+            yield enrich_chunk(prefix_index, table, ips)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_enrich_worker, initargs=(prefix_index,)
+    ) as executor:
+        pending = deque()
+        for ips in chunks:
+            pending.append(executor.submit(enrich_chunk_in_worker, ips))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class CidrSet(NamedTuple):
+    """
+    IP アドレスの集合 (区間表現)
+    互いに重ならず、隣接もしない区間 [開始, 終了) を開始アドレスの昇順に保持する。
+    IPv4 は uint64 の1列、IPv6 は 2^128 (終了アドレスの上限) を表せるように
+    uint64 の3列 (2^128 の桁, 上位64ビット, 下位64ビット) で表す。
+    """
+
+    v4_starts: np.ndarray  # uint64, shape (n, 1)
+    v4_ends: np.ndarray
+    v6_starts: np.ndarray  # uint64, shape (m, 3)
+    v6_ends: np.ndarray
+
+
+def ints_to_v6_keys(values) -> np.ndarray:
+    """128ビット (終了アドレスは 2^128 まで) の整数のリストを、uint64 の3列の配列にする"""
+    mask = (1 << 64) - 1
+    return np.array(
+        [(v >> 128, (v >> 64) & mask, v & mask) for v in values], dtype=np.uint64
+    ).reshape(-1, 3)
+
+
+def v6_keys_to_ints(keys: np.ndarray) -> list[int]:
+    """uint64 の3列の配列を、128ビットの整数のリストに戻す"""
+    return [(top << 128) | (hi << 64) | lo for top, hi, lo in keys.tolist()]
+
+
+def sweep_intervals(intervals, operation):
+    """
+    区間の集まりを開始・終了の点の列として走査し、operation を満たす範囲を区間にまとめて返す。
+    Args:
+        intervals (list[tuple]): 集合ごとの (開始の配列, 終了の配列)。配列は shape (n, k) の uint64 で、
+            各行を上位の列から比べた順序をアドレスの順序とする
+        operation (Callable): 集合ごとの「その範囲を含む区間の数」(int の配列) のリストを受け取り、
+            結果に含める範囲を True とする配列を返す関数
+    Returns:
+        tuple: (開始の配列, 終了の配列) 重ならず隣接しない区間 (開始の昇順)
+    """
+    width = intervals[0][0].shape[1]
+    points = np.concatenate([keys for starts, ends in intervals for keys in (starts, ends)])
+    count = len(points)
+    if not count:
+        return points.reshape(0, width), points.reshape(0, width)
+
+    # 集合ごとの変化量: 開始の点で +1、終了の点で -1 (ほかの集合の点では 0)
+    deltas = []
+    offset = 0
+    for starts, ends in intervals:
+        delta = np.zeros(count, dtype=np.int64)
+        delta[offset : offset + len(starts)] = 1
+        offset += len(starts)
+        delta[offset : offset + len(ends)] = -1
+        offset += len(ends)
+        deltas.append(delta)
+
+    # 点を昇順に並べ、同じ点の変化をまとめてから各範囲の区間の数を求める
+    order = np.lexsort(points.T[::-1])
+    points = points[order]
+    last_of_point = np.ones(count, dtype=bool)
+    last_of_point[:-1] = np.any(points[1:] != points[:-1], axis=1)
+    coverages = [np.cumsum(delta[order])[last_of_point] for delta in deltas]
+    points = points[last_of_point]
+
+    inside = operation(coverages)
+    before = np.concatenate([[False], inside[:-1]])
+    return points[inside & ~before], points[~inside & before]
+
+
+def parse_cidr_list(networks):
+    """
+    CIDR 表記 (文字列または ipaddress のネットワーク) のリストを、区間に変換する。
+    "a.b.c.d/n" 形式の IPv4 は parse_ipv4_batch でまとめて変換し、それ以外は ipaddress で変換する。
+    ホスト部が 0 でない表記も受け付ける (strict=False)。
+    Returns:
+        tuple: (IPv4 の開始の配列, IPv4 の終了の配列, IPv6 の (開始, 終了) のリスト)
+    Raises:
+        ValueError: 不正な表記が含まれる場合
+    """
+    strings = [n.strip() if isinstance(n, str) else "" for n in networks]
+    addresses, prefix_strings = zip(*(s.partition("/")[::2] for s in strings)) if strings else ((), ())
+    parsed, valid = parse_ipv4_batch(list(addresses))
+    prefix_lengths = np.array(
+        [int(p) if p.isdigit() and len(p) <= 2 else (32 if not p else 99) for p in prefix_strings],
+        dtype=np.uint64,
+    )
+    valid &= prefix_lengths <= 32
+
+    sizes = np.left_shift(np.uint64(1), np.uint64(32) - prefix_lengths[valid])
+    v4_starts = [parsed[valid].astype(np.uint64) & ~(sizes - np.uint64(1))]
+    v4_ends = [v4_starts[0] + sizes]
+
+    v6 = []
+    extra_v4 = []
+    for i in np.flatnonzero(~valid).tolist():
+        network = networks[i]
+        if not isinstance(network, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+            network = ipaddress.ip_network(strings[i], strict=False)
+        start = int(network.network_address)
+        end = start + network.num_addresses
+        (extra_v4 if network.version == 4 else v6).append((start, end))
+    if extra_v4:
+        v4_starts.append(np.array([s for s, _ in extra_v4], dtype=np.uint64))
+        v4_ends.append(np.array([e for _, e in extra_v4], dtype=np.uint64))
+
+    return np.concatenate(v4_starts), np.concatenate(v4_ends), v6
+
+
+def union_operation(coverages):
+    """sweep_intervals の演算: いずれかの集合に含まれる範囲"""
+    return np.logical_or.reduce([c > 0 for c in coverages])
+
+
+def intersection_operation(coverages):
+    """sweep_intervals の演算: すべての集合に含まれる範囲"""
+    return np.logical_and.reduce([c > 0 for c in coverages])
+
+
+def difference_operation(coverages):
+    """sweep_intervals の演算: 1つ目の集合に含まれ、2つ目の集合に含まれない範囲"""
+    return (coverages[0] > 0) & (coverages[1] == 0)
+
+
+def build_cidr_set(networks) -> CidrSet:
+    """CIDR 表記のリストから、重複・包含・隣接をまとめた集合を作る (O(n log n))"""
+    v4_starts, v4_ends, v6 = parse_cidr_list(networks)
+    v4 = sweep_intervals([(v4_starts.reshape(-1, 1), v4_ends.reshape(-1, 1))], union_operation)
+    v6 = sweep_intervals(
+        [(ints_to_v6_keys(s for s, _ in v6), ints_to_v6_keys(e for _, e in v6))], union_operation
+    )
+    return CidrSet(*v4, *v6)
+
+
+def combine_cidr_sets(a: CidrSet, b: CidrSet, operation) -> CidrSet:
+    """2つの集合を operation (union_operation など) で組み合わせる"""
+    v4 = sweep_intervals([(a.v4_starts, a.v4_ends), (b.v4_starts, b.v4_ends)], operation)
+    v6 = sweep_intervals([(a.v6_starts, a.v6_ends), (b.v6_starts, b.v6_ends)], operation)
+    return CidrSet(*v4, *v6)
+
+
+def cidr_set_union(a: CidrSet, b: CidrSet) -> CidrSet:
+    """和集合 (どちらかに含まれるアドレス)"""
+    return combine_cidr_sets(a, b, union_operation)
+
+
+def cidr_set_intersection(a: CidrSet, b: CidrSet) -> CidrSet:
+    """積集合 (両方に含まれるアドレス、2つの割り当てリストの重なり)"""
+    return combine_cidr_sets(a, b, intersection_operation)
+
+
+def cidr_set_difference(a: CidrSet, b: CidrSet) -> CidrSet:
+    """差集合 (a に含まれ、b に含まれないアドレス)"""
+    return combine_cidr_sets(a, b, difference_operation)
+
+
+def cidr_set_num_addresses(cidr_set: CidrSet) -> tuple[int, int]:
+    """集合に含まれる (IPv4 のアドレス数, IPv6 のアドレス数)"""
+    v4 = int((cidr_set.v4_ends - cidr_set.v4_starts).sum())
+    v6 = sum(
+        e - s
+        for s, e in zip(v6_keys_to_ints(cidr_set.v6_starts), v6_keys_to_ints(cidr_set.v6_ends))
+    )
+    return v4, v6
+
+
+def split_v4_intervals(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    IPv4 の区間を最小個数の CIDR ブロックに分割し、(ネットワークアドレス, プレフィックス長) の配列を返す。
+    各区間の先頭から「開始アドレスの境界に揃い、区間に収まる最大の 2 の累乗」のブロックを
+    切り出す処理を、全区間まとめて繰り返す (1区間あたり最大 64 回)。
+    """
+    starts = starts.astype(np.uint64).copy()
+    ends = ends.astype(np.uint64)
+    block_starts = []
+    block_sizes = []
+    active = np.flatnonzero(starts < ends)
+    while len(active):
+        s = starts[active]
+        # 開始アドレスの最下位の 1 のビット (0 の場合は 2^32)
+        aligned = np.where(s == 0, np.uint64(1 << 32), s & (~s + np.uint64(1)))
+        # 区間の長さ以下の最大の 2 の累乗 (2^32 以下なので float64 で正確に求まる)
+        span = ends[active] - s
+        fits = np.left_shift(np.uint64(1), np.floor(np.log2(span.astype(np.float64))).astype(np.uint64))
+        size = np.minimum(aligned, fits)
+        block_starts.append(s)
+        block_sizes.append(size)
+        starts[active] = s + size
+        active = active[starts[active] < ends[active]]
+
+    if not block_starts:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    block_starts = np.concatenate(block_starts)
+    block_sizes = np.concatenate(block_sizes)
+    order = np.argsort(block_starts, kind="stable")
+    prefix_lengths = 32 - np.log2(block_sizes[order].astype(np.float64)).astype(np.int64)
+    return block_starts[order], prefix_lengths
+
+
+def split_v6_interval(start: int, end: int) -> list[tuple[int, int]]:
+    """IPv6 の区間 [start, end) を最小個数の (ネットワークアドレス, プレフィックス長) に分割する"""
+    blocks = []
+    while start < end:
+        aligned = start & -start if start else 1 << 128
+        size = min(aligned, 1 << ((end - start).bit_length() - 1))
+        blocks.append((start, 128 - (size.bit_length() - 1)))
+        start += size
+    return blocks
 
-    # 10進数表現
-    decimal_mask = str(ipaddress.IPv4Address(int(binary_mask, 2)))
 
-    return binary_mask_formatted, decimal_mask
+def cidr_set_to_prefixes(cidr_set: CidrSet) -> list[str]:
+    """集合を最小個数の CIDR 表記のリスト (IPv4, IPv6 の順に昇順) にする"""
+    addresses, prefix_lengths = split_v4_intervals(
+        cidr_set.v4_starts.ravel(), cidr_set.v4_ends.ravel()
+    )
+    prefixes = [
+        f"{format_address(a)}/{p}" for a, p in zip(addresses.tolist(), prefix_lengths.tolist())
+    ]
+    for start, end in zip(
+        v6_keys_to_ints(cidr_set.v6_starts), v6_keys_to_ints(cidr_set.v6_ends)
+    ):
+        prefixes.extend(
+            f"{format_address(a, 6)}/{p}" for a, p in split_v6_interval(start, end)
+        )
+    return prefixes
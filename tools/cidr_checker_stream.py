@@ -0,0 +1,106 @@
+"""
+アクセスログの IP アドレスへのネットワーク情報の付与 (ヘッドレス / CLI)
+割り当てリスト (1行に1つの CIDR) から最長一致検索のインデックスを作り、
+ログをチャンク単位で読み込みながら、ネットワーク・ブロードキャストアドレス・
+プレフィックス長を付与した CSV / JSONL を逐次出力する。
+
+使い方:
+    python -m tools.cidr_checker_stream allocations.txt access.log -o enriched.csv
+    cat access.log | python -m tools.cidr_checker_stream allocations.txt --format jsonl
+    python -m tools.cidr_checker_stream allocations.txt huge.log --workers 8
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from tools.cidr_checker import (
+    ENRICH_CHUNK_SIZE,
+    ENRICH_FIELDS,
+    build_prefix_index,
+    enrich_ips,
+)
+
+
+def read_networks(path):
+    """割り当てリストを読み込む (空行と # 以降のコメントは無視する)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line for line in (raw.split("#", 1)[0].strip() for raw in f) if line]
+
+
+def stream_enrich(
+    lines, out, prefix_index, output_format="csv", chunk_size=ENRICH_CHUNK_SIZE, ip_field=0, workers=1
+):
+    """
+    ログの行を読み込みながらネットワーク情報を付与し、CSV / JSONL を out に逐次書き出す
+    JSONL では値のない列 (正常時の error など) は出力しない。
+    Returns:
+        int: 処理した行数
+    """
+    if output_format not in ("csv", "jsonl"):
+        raise ValueError(f"未対応の出力形式です: {output_format}")
+
+    writer = None
+    if output_format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(ENRICH_FIELDS)
+
+    count = 0
+    for rows in enrich_ips(lines, prefix_index, chunk_size, ip_field, workers):
+        if writer:
+            writer.writerows(rows)
+        else:
+            out.writelines(
+                json.dumps(
+                    {f: v for f, v in zip(ENRICH_FIELDS, row) if v != ""}, ensure_ascii=False
+                )
+                + "\n"
+                for row in rows
+            )
+        count += len(rows)
+
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="ログの IP アドレスに、割り当てリストのネットワーク情報を付与して CSV / JSONL を出力します。"
+    )
+    parser.add_argument("networks", help="割り当てリスト (1行に1つの CIDR)")
+    parser.add_argument("input", nargs="?", default="-", help="入力ログ (省略時または - は標準入力)")
+    parser.add_argument("-o", "--output", default="-", help="出力ファイル (省略時または - は標準出力)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv", help="出力形式")
+    parser.add_argument("--field", type=int, default=0, help="IP アドレスの列 (空白区切り、0 始まり)")
+    parser.add_argument("--workers", type=int, default=1, help="並列処理のプロセス数")
+    parser.add_argument("--chunk-size", type=int, default=ENRICH_CHUNK_SIZE, help="1チャンクの行数")
+    args = parser.parse_args(argv)
+
+    prefix_index = build_prefix_index(read_networks(args.networks))
+
+    # UTF-8 として不正なバイト列を含む行も、その行だけエラーとして出力する
+    if args.input == "-":
+        sys.stdin.reconfigure(errors="replace")
+        src = sys.stdin
+    else:
+        src = open(args.input, "r", encoding="utf-8", errors="replace")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        start = time.perf_counter()
+        count = stream_enrich(
+            src, dst, prefix_index, args.format, args.chunk_size, args.field, args.workers
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"{count:,} 行を {elapsed:.3f} 秒で処理しました ({rate:,.0f} 行/秒)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
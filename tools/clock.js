@@ -1,41 +1,14 @@
 // Clock script extracted from Python HTML embed
-// This file expects the following DOM elements to exist in the host HTML:
-// - #analog_clock_jst
-// - #analog_clock_utc
-// - #analog_clock_other
-// - #digital_clock_display_jst
-// - #digital_clock_display_utc
-// - #digital_clock_display_other
-// The placeholder /*OTHER_OFFSET_PLACEHOLDER*/ will be replaced by Python with the numeric offset.
+// This file expects #clock_container to exist in the host HTML.
+// Settings are passed from Python as JSON in window.CLOCK_CONFIG:
+// - clocks: list of { label, offsetMinutes, transitions, showUnixTime }
+//   - offsetMinutes: UTC offset (minutes) at the start of the current UTC day
+//   - transitions: [[unixMillis, offsetMinutes], ...] upcoming offset changes (DST), sorted by time
+//   - showUnixTime: also display UNIX time (UTC clock)
 
-// three chart containers (JST / UTC / Other)
-const chartDomJst = document.getElementById("analog_clock_jst");
-const chartDomUtc = document.getElementById("analog_clock_utc");
-const chartDomOther = document.getElementById("analog_clock_other");
-const myChartJst = chartDomJst ? echarts.init(chartDomJst) : null;
-const myChartUtc = chartDomUtc ? echarts.init(chartDomUtc) : null;
-const myChartOther = chartDomOther ? echarts.init(chartDomOther) : null;
-
-const digitalClockDomJst = document.getElementById("digital_clock_display_jst");
-const digitalClockDomUtc = document.getElementById("digital_clock_display_utc");
-const digitalClockDomOther = document.getElementById(
-  "digital_clock_display_other"
-);
-
-// JST is fixed
-const jstOffsetHours = 9;
-
-// otherOffsetHours placeholder: replaced by Python with numeric offset
-const otherOffsetHours =
-  typeof OTHER_OFFSET_PLACEHOLDER !== "undefined"
-    ? OTHER_OFFSET_PLACEHOLDER
-    : -8;
-
-// City label placeholder: replaced by Python with a JS string literal for the "other" timezone
-const cityLabel =
-  typeof CITY_LABEL_PLACEHOLDER !== "undefined"
-    ? CITY_LABEL_PLACEHOLDER
-    : "Other (UTC)";
+// config injected by Python (see plot_all_clocks_js_only)
+const clockConfig = window.CLOCK_CONFIG || {};
+const clockSettings = Array.isArray(clockConfig.clocks) ? clockConfig.clocks : [];
 
 // アナログ時計のオプション
 const option = {
@@ -122,101 +95,83 @@ const option = {
   ],
 };
 
-if (myChartJst) myChartJst.setOption(option);
-if (myChartUtc) myChartUtc.setOption(option);
-if (myChartOther) myChartOther.setOption(option);
+// 時刻 utcMillis における UTC オフセット (分): 過ぎた切り替わりのうち最後のものを使う
+function offsetMinutesAt(setting, utcMillis) {
+  let offset = setting.offsetMinutes || 0;
+  for (const [at, next] of setting.transitions || []) {
+    if (at > utcMillis) break;
+    offset = next;
+  }
+  return offset;
+}
 
-// 時計を更新する関数
-function updateAllClocks() {
-  const localNow = new Date();
-  const localOffsetMinutes = localNow.getTimezoneOffset();
-  const utcMillis = localNow.getTime() + localOffsetMinutes * 60 * 1000;
+// "UTC+9" "UTC+5:30" "UTC-3:30" の形式
+function formatUtcOffset(offsetMinutes) {
+  const sign = offsetMinutes < 0 ? "-" : "+";
+  const abs = Math.abs(offsetMinutes);
+  const hours = Math.floor(abs / 60);
+  const minutes = abs % 60;
+  return minutes
+    ? `UTC${sign}${hours}:${String(minutes).padStart(2, "0")}`
+    : `UTC${sign}${hours}`;
+}
 
-  // JST clock
-  const jstMillis = utcMillis + jstOffsetHours * 60 * 60 * 1000;
-  const nowJst = new Date(jstMillis);
-  const hJst = (nowJst.getHours() % 12) + nowJst.getMinutes() / 60;
-  const mJst = nowJst.getMinutes() + nowJst.getSeconds() / 60;
-  const sJst = nowJst.getSeconds();
-  if (myChartJst) {
-    myChartJst.setOption({
-      series: [
-        {},
-        { data: [{ value: hJst }] },
-        { data: [{ value: mJst }] },
-        { data: [{ value: sJst }] },
-      ],
-    });
-  }
+// 時計ごとにデジタル表示とアナログ時計の要素を作る
+const container = document.getElementById("clock_container");
+const clocks = clockSettings.map(function (setting) {
+  const column = document.createElement("div");
+  column.style.cssText = "flex:0 0 33%; min-width:200px;";
 
-  // UTC clock
-  function getUtcTime() {
-    const nowUtc = new Date();
-    const hUtc = (nowUtc.getUTCHours() % 12) + nowUtc.getUTCMinutes() / 60;
-    const mUtc = nowUtc.getUTCMinutes() + nowUtc.getUTCSeconds() / 60;
-    const sUtc = nowUtc.getUTCSeconds();
-    const utc_h = String(nowUtc.getUTCHours()).padStart(2, "0");
-    const utc_m = String(nowUtc.getUTCMinutes()).padStart(2, "0");
-    const utc_s = String(nowUtc.getUTCSeconds()).padStart(2, "0");
-    return {
-      hUtc,
-      mUtc,
-      sUtc,
-      utc_h,
-      utc_m,
-      utc_s,
-      unixMillis: nowUtc.getTime(),
-    };
-  }
+  const digitalDom = document.createElement("div");
+  digitalDom.style.cssText =
+    "text-align:center; font-family: Consolas, Menlo, Monaco, monospace; font-size:1.1rem; padding:0.5rem; min-height:3em;";
+  digitalDom.innerText = `${setting.label}: --:--:--`;
 
-  const utcTime = getUtcTime();
-  if (myChartUtc) {
-    myChartUtc.setOption({
-      series: [
-        {},
-        { data: [{ value: utcTime.hUtc }] },
-        { data: [{ value: utcTime.mUtc }] },
-        { data: [{ value: utcTime.sUtc }] },
-      ],
-    });
-  }
+  const chartDom = document.createElement("div");
+  chartDom.style.cssText = "width:100%; height:300px;";
+
+  column.appendChild(digitalDom);
+  column.appendChild(chartDom);
+  if (container) container.appendChild(column);
 
-  // UTC digital display
-  if (digitalClockDomUtc)
-    digitalClockDomUtc.innerHTML = `UTC: ${utcTime.utc_h}:${utcTime.utc_m}:${
-      utcTime.utc_s
-    }<br>UNIX Time: ${Math.floor(utcTime.unixMillis / 1000)}`;
+  const chart = echarts.init(chartDom);
+  chart.setOption(option);
+  return { setting, digitalDom, chartDom, chart };
+});
 
-  // Other clock (selected offset)
-  const otherMillis = utcMillis + otherOffsetHours * 60 * 60 * 1000;
-  const nowOther = new Date(otherMillis);
-  const hOther = (nowOther.getHours() % 12) + nowOther.getMinutes() / 60;
-  const mOther = nowOther.getMinutes() + nowOther.getSeconds() / 60;
-  const sOther = nowOther.getSeconds();
-  if (myChartOther) {
-    myChartOther.setOption({
+// 時計を更新する関数
+function updateAllClocks() {
+  const utcMillis = Date.now();
+
+  for (const clock of clocks) {
+    const offsetMinutes = offsetMinutesAt(clock.setting, utcMillis);
+    // オフセット分ずらした時刻を UTC として読む
+    const now = new Date(utcMillis + offsetMinutes * 60 * 1000);
+    const hours = now.getUTCHours();
+    const minutes = now.getUTCMinutes();
+    const seconds = now.getUTCSeconds();
+
+    clock.chart.setOption({
       series: [
         {},
-        { data: [{ value: hOther }] },
-        { data: [{ value: mOther }] },
-        { data: [{ value: sOther }] },
+        { data: [{ value: (hours % 12) + minutes / 60 }] },
+        { data: [{ value: minutes + seconds / 60 }] },
+        { data: [{ value: seconds }] },
       ],
     });
-  }
 
-  // デジタル表示（JST 固定）
-  const digital_h = String(nowJst.getHours()).padStart(2, "0");
-  const digital_m = String(nowJst.getMinutes()).padStart(2, "0");
-  const digital_s = String(nowJst.getSeconds()).padStart(2, "0");
-  if (digitalClockDomJst)
-    digitalClockDomJst.innerText = `JST(UTC+9): ${digital_h}:${digital_m}:${digital_s}`;
-
-  // Other（選択されたオフセット）の計算と表示
-  const other_h = String(nowOther.getHours()).padStart(2, "0");
-  const other_m = String(nowOther.getMinutes()).padStart(2, "0");
-  const other_s = String(nowOther.getSeconds()).padStart(2, "0");
-  if (digitalClockDomOther) {
-    digitalClockDomOther.innerText = `${cityLabel}: ${other_h}:${other_m}:${other_s}`;
+    const h = String(hours).padStart(2, "0");
+    const m = String(minutes).padStart(2, "0");
+    const s = String(seconds).padStart(2, "0");
+    if (clock.setting.showUnixTime) {
+      clock.digitalDom.innerHTML = `${clock.setting.label}: ${h}:${m}:${s}<br>UNIX Time: ${Math.floor(
+        utcMillis / 1000
+      )}`;
+    } else {
+      clock.digitalDom.innerText = `${clock.setting.label} (${formatUtcOffset(
+        offsetMinutes
+      )}): ${h}:${m}:${s}`;
+    }
   }
 }
 
@@ -235,24 +190,15 @@ function applyDarkModeStyles(isDarkMode) {
   const textColor = isDarkMode ? "#FFFFFF" : "#000000";
   const backgroundColor = isDarkMode ? "#333333" : "#FFFFFF";
 
-  if (digitalClockDomJst) {
-    digitalClockDomJst.style.color = textColor;
-    digitalClockDomJst.style.backgroundColor = backgroundColor;
-  }
-  if (digitalClockDomUtc) {
-    digitalClockDomUtc.style.color = textColor;
-    digitalClockDomUtc.style.backgroundColor = backgroundColor;
-  }
-  if (digitalClockDomOther) {
-    digitalClockDomOther.style.color = textColor;
-    digitalClockDomOther.style.backgroundColor = backgroundColor;
+  for (const clock of clocks) {
+    clock.digitalDom.style.color = textColor;
+    clock.digitalDom.style.backgroundColor = backgroundColor;
+    clock.chartDom.style.backgroundColor = backgroundColor;
   }
-  if (chartDomJst) chartDomJst.style.backgroundColor = backgroundColor;
-  if (chartDomUtc) chartDomUtc.style.backgroundColor = backgroundColor;
-  if (chartDomOther) chartDomOther.style.backgroundColor = backgroundColor;
 }
 
 // 初期起動
+updateAllClocks();
 tick();
 
 // ダークモード監視
@@ -1,81 +1,199 @@
 import streamlit as st
 import streamlit.components.v1 as components
-from datetime import datetime
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple
 from zoneinfo import ZoneInfo
-import locale
+import threading
 from supabase import Client
 import os
 import json
+import re
 import jpholiday
 
 from libs.supabase_client import get_supabase_client
-from tools.wareki import convert_seireki_2_wareki
+from tools.wareki import find_era, format_wareki, get_era_index
 from tools.datetime_utils import (
     calculate_rokuyo,
     get_month_wamei,
+    find_tz_transitions,
     format_us_date,
+    get_utc_offset_minutes,
     get_zyunisi,
 )
 
+JST = ZoneInfo("Asia/Tokyo")
 
-def plot_all_clocks_js_only(other_offset_hours=-8, city_label="L.A. (UTC-8)"):
+# echarts: リポジトリに同梱した static/echarts.min.js を Streamlit の静的ファイル配信 (app/static/) から読み込む。
+# 配信できない場合だけ同じバージョンを CDN から読み込む
+ECHARTS_VERSION = "6.0.0"
+ECHARTS_CDN_URL = f"https://cdn.jsdelivr.net/npm/echarts@{ECHARTS_VERSION}/dist/echarts.min.js"
+ECHARTS_LOCAL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "static", "echarts.min.js"
+)
+ECHARTS_LOCAL_URL = "app/static/echarts.min.js"
+
+# 曜日 (ロケールに依存しない日本語表記、date.weekday() の順)
+WEEKDAY_JA = "月火水木金土日"
+
+# 世界時計の都市 (表示名, IANA タイムゾーン名)。UTC オフセットと夏時間は tzdata から求める
+WORLD_CLOCK_CITIES = [
+    ("ロンドン", "Europe/London"),
+    ("パリ", "Europe/Paris"),
+    ("カイロ", "Africa/Cairo"),
+    ("モスクワ", "Europe/Moscow"),
+    ("ドバイ", "Asia/Dubai"),
+    ("イスラマバード", "Asia/Karachi"),
+    ("ムンバイ", "Asia/Kolkata"),
+    ("カトマンズ", "Asia/Kathmandu"),
+    ("ダッカ", "Asia/Dhaka"),
+    ("バンコク", "Asia/Bangkok"),
+    ("北京", "Asia/Shanghai"),
+    ("東京", "Asia/Tokyo"),
+    ("アデレード", "Australia/Adelaide"),
+    ("シドニー", "Australia/Sydney"),
+    ("ホニアラ", "Pacific/Guadalcanal"),
+    ("カムチャッカ", "Asia/Kamchatka"),
+    ("オークランド", "Pacific/Auckland"),
+    ("ベーカー島", "Etc/GMT+12"),
+    ("ミッドウェー島", "Pacific/Midway"),
+    ("ホノルル", "Pacific/Honolulu"),
+    ("アラスカ州", "America/Anchorage"),
+    ("L.A.", "America/Los_Angeles"),
+    ("デンバー", "America/Denver"),
+    ("シカゴ", "America/Chicago"),
+    ("ニューヨーク", "America/New_York"),
+    ("サンティアゴ", "America/Santiago"),
+    ("セントジョンズ", "America/St_Johns"),
+    ("ブエノスアイレス", "America/Argentina/Buenos_Aires"),
+    ("サウスジョージア", "Atlantic/South_Georgia"),
+    ("アゾレス諸島", "Atlantic/Azores"),
+]
+WORLD_CLOCK_DEFAULT_CITIES = ["L.A."]
+
+# 日付ヘッダーのキャッシュ (プロセス内で共有)
+date_header_lock = threading.Lock()
+date_header_cache = {"header": None}
+
+
+@lru_cache(maxsize=1)
+def load_clock_script() -> str:
     """
-    デジタル時計とアナログ時計の両方をJSで自己更新する
-    HTMLコンポーネントを「1回だけ」描画する関数
-    （アナログ秒針をデジタルと同期させ、体感ズレを解消）
+    clock.js を読み込み、コメントと空白を取り除いて返す (プロセスで1回だけ)
+    行単位の簡易的な縮小のため、改行は残して自動セミコロン挿入の挙動を変えない。
     """
-
-    # read external JS
-    this_dir = os.path.dirname(__file__)
-    js_path = os.path.join(this_dir, "clock.js")
+    js_path = os.path.join(os.path.dirname(__file__), "clock.js")
     try:
         with open(js_path, "r", encoding="utf-8") as f:
             js_content = f.read()
     except Exception:
-        js_content = ""
-
-    # inject offsets and city label into JS placeholders (always run)
-    # jst is fixed in JS; replace only the other offset placeholder
-    js_content = js_content.replace("OTHER_OFFSET_PLACEHOLDER", str(other_offset_hours))
-    # replace CITY_LABEL_PLACEHOLDER with a JS string literal (properly escaped)
-    js_content = js_content.replace(
-        "CITY_LABEL_PLACEHOLDER", json.dumps(city_label, ensure_ascii=False)
-    )
+        return ""
 
-    # layout: three time columns aligned horizontally, and three analog clocks below (JST / UTC / Other)
-    html_code = (
-        '<script src="https://cdn.jsdelivr.net/npm/echarts@5.5.0/dist/echarts.min.js"></script>'
-        + "\n"
-        + '<div style="display:flex; gap:1rem; align-items:center; justify-content:space-around; margin-bottom:1rem;">'
-        + '<div id="digital_clock_display_jst" style="flex:1; text-align:center; font-family: Consolas, Menlo, Monaco, monospace; font-size:1.1rem; padding:0.5rem;">JST: --:--:--</div>'
-        + '<div id="digital_clock_display_utc" style="flex:1; text-align:center; font-family: Consolas, Menlo, Monaco, monospace; font-size:1.1rem; padding:0.5rem;">UTC: --:--:--</div>'
-        + '<div id="digital_clock_display_other" style="flex:1; text-align:center; font-family: Consolas, Menlo, Monaco, monospace; font-size:1.1rem; padding:0.5rem;">Other: --:--:--</div>'
-        + "</div>"
+    js_content = re.sub(r"/\*.*?\*/", "", js_content, flags=re.DOTALL)
+    lines = (re.sub(r"^\s*//.*$", "", line).strip() for line in js_content.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+@lru_cache(maxsize=1)
+def build_clock_html_template() -> tuple[str, str]:
+    """
+    時計コンポーネントの HTML を、設定 (JSON) の前後に分けて返す (プロセスで1回だけ)
+    echarts は static/echarts.min.js を Streamlit の静的ファイル配信から読み込み、
+    読み込めない場合だけ CDN から読み込む。HTML に含まれるのは時計の要素と clock.js と設定だけ。
+    """
+    if os.path.exists(ECHARTS_LOCAL_PATH):
+        echarts_script = (
+            f'<script src="{ECHARTS_LOCAL_URL}"></script>'
+            + "<script>window.echarts || document.write("
+            + json.dumps(f'<script src="{ECHARTS_CDN_URL}"></script>').replace("</", "<\\/")
+            + ");</script>"
+        )
+    else:
+        echarts_script = f'<script src="{ECHARTS_CDN_URL}"></script>'
+
+    # layout: clocks are created by clock.js from CLOCK_CONFIG (digital time above each analog clock)
+    head = (
+        echarts_script
         + "\n"
-        + '<div style="display:flex; gap:1rem; align-items:flex-start; justify-content:space-around; margin-bottom:1rem;">'
-        + '<div id="analog_clock_jst" style="flex:1; width:33%; height:300px;"></div>'
-        + '<div id="analog_clock_utc" style="flex:1; width:33%; height:300px;"></div>'
-        + '<div id="analog_clock_other" style="flex:1; width:33%; height:300px;"></div>'
-        + "</div>"
+        + '<div id="clock_container" style="display:flex; flex-wrap:wrap; gap:1rem 0; justify-content:space-around; margin-bottom:1rem;"></div>'
         + "\n\n"
-        + "<script>"
-        + js_content
-        + "</script>"
+        + "<script>window.CLOCK_CONFIG = "
     )
+    tail = ";</script>\n<script>" + load_clock_script() + "</script>"
+    return head, tail
 
-    components.html(html_code, height=500)
 
+def format_utc_offset(offset_minutes: int) -> str:
+    """UTC オフセット (分) を "UTC+9" "UTC+5:30" "UTC-3:30" の形式にする"""
+    sign = "-" if offset_minutes < 0 else "+"
+    hours, minutes = divmod(abs(offset_minutes), 60)
+    return f"UTC{sign}{hours}:{minutes:02d}" if minutes else f"UTC{sign}{hours}"
 
-def print_date(supabase: Client):
-    locale.setlocale(locale.LC_TIME, "ja_JP.UTF-8")
-    today = datetime.now(ZoneInfo("Asia/Tokyo"))
 
+def build_world_clock(label: str, tz_name: str, now: datetime) -> dict:
+    """
+    1つの時計の設定 (JSON 用) を作成する。
+    現在の UTC オフセットと、この先の切り替わり (夏時間の開始・終了) の一覧をブラウザに渡し、
+    ブラウザ側で時刻に応じたオフセットを選ぶ (Python の再実行なしで切り替わる)。
+    切り替わりはタイムゾーンごと・UTC の1日ごとに1回だけ計算する (find_tz_transitions のキャッシュ)。
+    """
+    day_start = int(now.timestamp()) // 86400 * 86400
+    transitions = find_tz_transitions(tz_name, day_start)
+    return {
+        "label": label,
+        "offsetMinutes": get_utc_offset_minutes(tz_name, day_start),
+        # [UNIX 時刻 (ミリ秒), 切り替わり後のオフセット (分)]
+        "transitions": [[ts * 1000, offset] for ts, offset in transitions],
+    }
+
+
+def plot_all_clocks_js_only(cities=WORLD_CLOCK_DEFAULT_CITIES):
+    """
+    デジタル時計とアナログ時計の両方をJSで自己更新する
+    HTMLコンポーネントを「1回だけ」描画する関数
+    （アナログ秒針をデジタルと同期させ、体感ズレを解消）
+    HTML とスクリプトはプロセスで1回だけ作成し、描画ごとに変わるのは設定 (JSON) のみ。
+    JST と UTC の時計に続けて、cities (WORLD_CLOCK_CITIES の表示名) の時計を並べる。
+    """
+    head, tail = build_clock_html_template()
+
+    now = datetime.now(timezone.utc)
+    tz_by_city = dict(WORLD_CLOCK_CITIES)
+    clocks = [build_world_clock("JST", "Asia/Tokyo", now)]
+    clocks.append(dict(build_world_clock("UTC", "UTC", now), showUnixTime=True))
+    clocks.extend(
+        build_world_clock(city, tz_by_city[city], now)
+        for city in cities
+        if city in tz_by_city
+    )
+
+    # 時計の設定は JSON として渡す (</script> で閉じられないようにエスケープ)
+    config = json.dumps({"clocks": clocks}, ensure_ascii=False).replace("</", "<\\/")
+
+    # 1行に3つずつ並べる
+    rows = -(-len(clocks) // 3)
+    components.html(head + config + tail, height=rows * 370 + 20)
+
+
+class DateHeader(NamedTuple):
+    """日付ヘッダーの表示文字列 (JSTの1日ごとに1回だけ作成し、全セッションで共有する)"""
+
+    date: date
+    standard: str
+    japanese: str
+    american: str
+
+
+def build_date_header(supabase: Client, today: date) -> DateHeader:
+    """指定日 (JST) の日付ヘッダーを作成する。曜日はロケールに依存せず日本語で表記する"""
     # 標準の日付表示
-    formatted_standard_date = today.strftime("%Y年%m月%d日(%a)")
+    formatted_standard_date = (
+        f"{today.year}年{today.month:02d}月{today.day:02d}日({WEEKDAY_JA[today.weekday()]})"
+    )
 
     # 日本語表記の日付
-    wareki = convert_seireki_2_wareki(supabase, today.year, today.month, today.day)
-    wareki_year = wareki.split("年")[0]
+    era_info = find_era(get_era_index(supabase), today)
+    wareki_year = format_wareki(era_info, today).split("年")[0] if era_info else ""
 
     # 六曜計算
     rokuyo = calculate_rokuyo(today)
@@ -97,13 +215,36 @@ def print_date(supabase: Client):
     # アメリカ表記の日付（曜日をフルスペル、月を除外）
     formatted_american_date = format_us_date(today)
 
-    st.header(formatted_standard_date)
+    return DateHeader(
+        today, formatted_standard_date, formatted_japanese_date, formatted_american_date
+    )
+
+
+def get_date_header(supabase: Client) -> DateHeader:
+    """
+    今日 (JST) の日付ヘッダーを返す。プロセス内で1日1回だけ作成し、JSTの日付が変わったら作り直す。
+    元号データが取得できなかった場合はキャッシュせず、次回の描画で再作成する。
+    """
+    today = datetime.now(JST).date()
+    with date_header_lock:
+        header = date_header_cache["header"]
+        if header is None or header.date != today:
+            header = build_date_header(supabase, today)
+            if find_era(get_era_index(supabase), today):
+                date_header_cache["header"] = header
+    return header
+
+
+def print_date(supabase: Client):
+    header = get_date_header(supabase)
+
+    st.header(header.standard)
 
     col1, col2 = st.columns(2)
-    col1.subheader(formatted_japanese_date)
+    col1.subheader(header.japanese)
 
     # アメリカ表記の日付を表示
-    col2.subheader(formatted_american_date)
+    col2.subheader(header.american)
 
 
 def draw_clock():
@@ -120,52 +261,22 @@ def draw_clock():
     # 日付表示
     print_date(supabase_client)
 
-    # 時計表示オフセットを選択するセレクトボックス（都市ベース）
-    city_to_offset = {
-        "ロンドン (UTC+0)": 0,
-        "パリ (UTC+1)": 1,
-        "カイロ (UTC+2)": 2,
-        "モスクワ (UTC+3)": 3,
-        "ドバイ (UTC+4)": 4,
-        "イスラマバード (UTC+5)": 5,
-        "ダッカ (UTC+6)": 6,
-        "バンコク (UTC+7)": 7,
-        "北京 (UTC+8)": 8,
-        "東京 (UTC+9)": 9,
-        "シドニー (UTC+10)": 10,
-        "ホニソラ (UTC+11)": 11,
-        "カムチャッカ (UTC+12)": 12,
-        "ベーカー島 (UTC-12)": -12,
-        "ミッドウェー島 (UTC-11)": -11,
-        "ホノルル (UTC-10)": -10,
-        "アラスカ州 (UTC-9)": -9,
-        "L.A. (UTC-8)": -8,
-        "デンバー (UTC-7)": -7,
-        "シカゴ (UTC-6)": -6,
-        "ニューヨーク (UTC-5)": -5,
-        "サンディエゴ (UTC-4)": -4,
-        "ブエノスアイレス (UTC-3)": -3,
-        "サウスジョージア (UTC-2)": -2,
-        "アルバ諸島 (UTC-1)": -1,
+    # 表示する都市を選択する (JST と UTC は常に表示)
+    now = datetime.now(timezone.utc).timestamp()
+    city_labels = {
+        city: f"{city} ({format_utc_offset(get_utc_offset_minutes(tz_name, now))})"
+        for city, tz_name in WORLD_CLOCK_CITIES
     }
-
-    city_list = list(city_to_offset.keys())
-    # デフォルトは L.A.
-    default_index = (
-        city_list.index("L.A. (UTC-8)") if "L.A. (UTC-8)" in city_list else 0
-    )
-    selected_city = st.selectbox(
+    selected_cities = st.multiselect(
         "表示する都市を選択してください:",
-        city_list,
-        index=default_index,
-        key="clock_offset_select",
+        list(city_labels),
+        default=WORLD_CLOCK_DEFAULT_CITIES,
+        format_func=city_labels.get,
+        key="clock_city_select",
     )
-    selected_offset = city_to_offset.get(selected_city, -8)
 
-    # デジタル時計＆アナログ時計の表示（選択したオフセットと都市ラベルで）
-    plot_all_clocks_js_only(
-        other_offset_hours=selected_offset, city_label=selected_city
-    )
+    # デジタル時計＆アナログ時計の表示（選択した都市）
+    plot_all_clocks_js_only(selected_cities)
 
 
 if __name__ == "__main__":
@@ -1,24 +1,151 @@
-from datetime import datetime
-import pytz
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import os
+import jpholiday
+import numpy as np
+import pandas as pd
 from lunardate import LunarDate
+from zoneinfo import ZoneInfo
+
+# 六曜リスト（旧暦の月と日を合計し、6で割った余りによる）
+ROKUYO_LIST = ["大安", "赤口", "先勝", "友引", "先負", "仏滅"]
+
+# 十二支リスト（子年が 4 の年に対応）
+ZYUNISI_LIST = [
+    "子",
+    "丑",
+    "寅",
+    "卯",
+    "辰",
+    "巳",
+    "午",
+    "未",
+    "申",
+    "酉",
+    "戌",
+    "亥",
+]
+
+# 月和名
+MONTH_WAMEI = {
+    1: "睦月",
+    2: "如月",
+    3: "弥生",
+    4: "卯月",
+    5: "皐月",
+    6: "水無月",
+    7: "文月",
+    8: "葉月",
+    9: "長月",
+    10: "神無月",
+    11: "霜月",
+    12: "師走",
+}
+
+# 六曜の変換表（tools/gen_rokuyo_table.py で生成）
+# 西暦の日付ごとの六曜インデックス（ROKUYO_LIST の添字）を uint8 で並べた .npy ファイル
+ROKUYO_TABLE_PATH = os.path.join(os.path.dirname(__file__), "rokuyo_table.npy")
+# 変換表の範囲は lunardate が扱える期間（旧暦 1900年1月1日〜2099年12月末日）
+ROKUYO_TABLE_START = date(1900, 1, 31)
+ROKUYO_TABLE_END = date(2100, 2, 8)
+
+
+# タイムゾーンの切り替わり (夏時間の開始・終了) を探す期間 (日数)
+TZ_TRANSITION_HORIZON_DAYS = 400
 
 
 def get_tz_time(tz_str):
-    # 引数で指定されたタイムゾーンのオブジェクトを取得
-    tz = pytz.timezone(tz_str)
+    # 引数で指定されたタイムゾーンのオブジェクトを取得 (ZoneInfo はインスタンスをキャッシュする)
+    tz = ZoneInfo(tz_str)
 
     # タイムゾーンを指定して現在時刻を取得
     return datetime.now(tz)
 
 
+def get_utc_offset_minutes(tz_name: str, timestamp: float) -> int:
+    """UNIX 時刻 timestamp (秒) における tz_name の UTC オフセット (分)"""
+    offset = datetime.fromtimestamp(timestamp, ZoneInfo(tz_name)).utcoffset()
+    return int(offset.total_seconds()) // 60
+
+
+@lru_cache(maxsize=256)
+def find_tz_transitions(
+    tz_name: str, start_timestamp: int, days: int = TZ_TRANSITION_HORIZON_DAYS
+) -> tuple[tuple[int, int], ...]:
+    """
+    start_timestamp (UNIX 時刻、秒) から days 日の間に UTC オフセットが切り替わる時刻を探す。
+    (切り替わる UNIX 時刻 (秒), 切り替わり後のオフセット (分)) のタプルを時刻順に返す。
+    1日ごとにオフセットを比べ、変化した日の中を二分探索して秒単位で特定する。
+    同じ引数ではキャッシュを返すため、start_timestamp は日の境界などに丸めて渡す。
+    """
+    transitions = []
+    lo = start_timestamp
+    prev_offset = get_utc_offset_minutes(tz_name, lo)
+    for _ in range(days):
+        hi = lo + 86400
+        offset = get_utc_offset_minutes(tz_name, hi)
+        if offset != prev_offset:
+            # (left, right] の中で最初にオフセットが変わる秒を探す
+            left, right = lo, hi
+            while right - left > 1:
+                mid = (left + right) // 2
+                if get_utc_offset_minutes(tz_name, mid) == prev_offset:
+                    left = mid
+                else:
+                    right = mid
+            transitions.append((right, offset))
+            prev_offset = offset
+        lo = hi
+    return tuple(transitions)
+
+
+@lru_cache(maxsize=1)
+def load_rokuyo_table():
+    """
+    六曜の変換表をメモリマップで読み込む（プロセスで1回だけ）。
+    ファイルがない、または範囲が一致しない場合は None を返し、lunardate で計算する。
+    """
+    try:
+        table = np.load(ROKUYO_TABLE_PATH, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    if len(table) != (ROKUYO_TABLE_END - ROKUYO_TABLE_START).days + 1:
+        return None
+    return table
+
+
+def lookup_rokuyo_range(start: date, end: date):
+    """
+    start から end までの六曜インデックス（ROKUYO_LIST の添字）を uint8 配列で返す。
+    変換表があればその範囲を切り出すだけで、なければ build_calendar_attributes で計算する。
+    :param start: 開始日（西暦）
+    :param end: 終了日（西暦、この日を含む）
+    :return: 六曜インデックスの配列（1日1要素）
+    """
+    table = load_rokuyo_table()
+    if table is not None and ROKUYO_TABLE_START <= start and end <= ROKUYO_TABLE_END:
+        offset = (start - ROKUYO_TABLE_START).days
+        return np.asarray(table[offset : offset + (end - start).days + 1])
+
+    return build_calendar_attributes(start, end)["rokuyo"].cat.codes.to_numpy(np.uint8)
+
+
 def calculate_rokuyo(date):
+    # datetime (タイムゾーン付きを含む) はその日付で求める (date との比較は TypeError になるため)
+    date = date.date() if isinstance(date, datetime) else date
+
+    # 変換表があれば、日付の位置を1回引くだけで求める
+    table = load_rokuyo_table()
+    if table is not None and ROKUYO_TABLE_START <= date <= ROKUYO_TABLE_END:
+        return ROKUYO_LIST[table[date.toordinal() - ROKUYO_TABLE_START.toordinal()]]
+
     # 旧暦に変換
     lunar_date = LunarDate.fromSolarDate(date.year, date.month, date.day)
 
-    # 六曜リスト（旧暦の月と日を合計し、6で割った余りによる）
-    rokuyo_list = ["大安", "赤口", "先勝", "友引", "先負", "仏滅"]
+    # 六曜（旧暦の月と日を合計し、6で割った余りによる）
     total = lunar_date.month + lunar_date.day
-    rokuyo = rokuyo_list[total % 6]
+    rokuyo = ROKUYO_LIST[total % 6]
     return rokuyo
 
 
@@ -26,21 +153,7 @@ def get_month_wamei(month):
     """
     月和名
     """
-    month_wamei = {
-        1: "睦月",
-        2: "如月",
-        3: "弥生",
-        4: "卯月",
-        5: "皐月",
-        6: "水無月",
-        7: "文月",
-        8: "葉月",
-        9: "長月",
-        10: "神無月",
-        11: "霜月",
-        12: "師走",
-    }
-    return month_wamei.get(month, "")
+    return MONTH_WAMEI.get(month, "")
 
 
 def format_us_date(dt):
@@ -77,19 +190,81 @@ def get_zyunisi(year: int) -> str:
     :param year: 西暦年
     :return: 十二支（文字列）
     """
-    zyunisi_list = [
-        "子",
-        "丑",
-        "寅",
-        "卯",
-        "辰",
-        "巳",
-        "午",
-        "未",
-        "申",
-        "酉",
-        "戌",
-        "亥",
-    ]
     index = (year - 4) % 12  # 子年が 4 の年に対応
-    return zyunisi_list[index]
+    return ZYUNISI_LIST[index]
+
+
+def iter_lunar_months(start: date, end: date):
+    """
+    start から end までに掛かる旧暦の月を順に返すジェネレーター。
+    旧暦への変換は月の初日ごとに1回だけ行い、月の日数は「30日」が存在するかで判定する。
+    :param start: 開始日（西暦）
+    :param end: 終了日（西暦、この日を含む）
+    :return: (旧暦の月の初日の西暦日付, 旧暦の月, 閏月か, 月の日数, start 時点の旧暦の日) のタプル
+    """
+    lunar_date = LunarDate.fromSolarDate(start.year, start.month, start.day)
+    month_start = start - timedelta(days=lunar_date.day - 1)
+    first_day = lunar_date.day
+
+    while month_start <= end:
+        try:
+            LunarDate(lunar_date.year, lunar_date.month, 30, lunar_date.isLeapMonth).toSolarDate()
+            month_length = 30
+        except ValueError:
+            month_length = 29
+
+        yield month_start, lunar_date.month, lunar_date.isLeapMonth, month_length, first_day
+
+        month_start += timedelta(days=month_length)
+        lunar_date = LunarDate.fromSolarDate(month_start.year, month_start.month, month_start.day)
+        first_day = 1
+
+
+def build_calendar_attributes(start: date, end: date) -> pd.DataFrame:
+    """
+    start から end までの各日の暦情報（六曜、十二支、月和名、祝日）を1回の走査でまとめて計算する。
+    旧暦は月単位で進めて日を配列に埋めるため、日ごとの旧暦変換は行わない。
+    :param start: 開始日（西暦）
+    :param end: 終了日（西暦、この日を含む）
+    :return: 列 date, lunar_month, lunar_day, is_leap_month, rokuyo, zyunisi,
+             month_wamei, holiday_name を持つ DataFrame（1日1行）
+    """
+    days = np.arange(
+        np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+    )
+    lunar_month = np.zeros(len(days), dtype=np.int8)
+    lunar_day = np.zeros(len(days), dtype=np.int8)
+    is_leap_month = np.zeros(len(days), dtype=bool)
+
+    # 旧暦: 月ごとに該当区間へ月と日を埋める
+    for month_start, month, is_leap, month_length, first_day in iter_lunar_months(start, end):
+        offset = (month_start - start).days + first_day - 1
+        count = min(month_length - first_day + 1, len(days) - offset)
+        lunar_month[offset : offset + count] = month
+        lunar_day[offset : offset + count] = np.arange(first_day, first_day + count)
+        is_leap_month[offset : offset + count] = is_leap
+
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+    # 祝日: 期間内の祝日を1回で取得して配列に配置する
+    holiday_name = np.full(len(days), None, dtype=object)
+    for holiday, name in jpholiday.between(start, end):
+        holiday_name[(holiday - start).days] = name
+
+    return pd.DataFrame(
+        {
+            "date": days,
+            "lunar_month": lunar_month,
+            "lunar_day": lunar_day,
+            "is_leap_month": is_leap_month,
+            "rokuyo": pd.Categorical.from_codes(
+                (lunar_month.astype(np.int64) + lunar_day) % 6, categories=ROKUYO_LIST
+            ),
+            "zyunisi": pd.Categorical.from_codes((years - 4) % 12, categories=ZYUNISI_LIST),
+            "month_wamei": pd.Categorical.from_codes(
+                months - 1, categories=list(MONTH_WAMEI.values())
+            ),
+            "holiday_name": holiday_name,
+        }
+    )
@@ -0,0 +1,36 @@
+"""
+六曜の変換表 (tools/rokuyo_table.npy) を生成するスクリプト
+lunardate が扱える全期間について、日付ごとの六曜インデックスを uint8 で保存する。
+lunardate を更新した場合などに実行して作り直す。
+
+実行:
+    python -m tools.gen_rokuyo_table
+"""
+
+import warnings
+
+import numpy as np
+
+from tools.datetime_utils import (
+    ROKUYO_TABLE_END,
+    ROKUYO_TABLE_PATH,
+    ROKUYO_TABLE_START,
+    build_calendar_attributes,
+)
+
+
+def generate_rokuyo_table(path=ROKUYO_TABLE_PATH):
+    """期間内の六曜インデックスを計算し、メモリマップで読める .npy ファイルに保存する"""
+    with warnings.catch_warnings():
+        # lunardate の fromSolarDate などの非推奨警告を抑止する
+        warnings.simplefilter("ignore", DeprecationWarning)
+        attributes = build_calendar_attributes(ROKUYO_TABLE_START, ROKUYO_TABLE_END)
+
+    table = attributes["rokuyo"].cat.codes.to_numpy(np.uint8)
+    np.save(path, table)
+    return table
+
+
+if __name__ == "__main__":
+    table = generate_rokuyo_table()
+    print(f"{ROKUYO_TABLE_PATH}: {len(table):,} 日分 ({ROKUYO_TABLE_START} 〜 {ROKUYO_TABLE_END})")
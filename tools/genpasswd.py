@@ -1,7 +1,41 @@
-import random
+import math
+import os
 import string
+from functools import lru_cache
+from typing import Iterator, NamedTuple, TextIO
+import numpy as np
 import streamlit as st
 
+# 一括生成で一度に読み込む乱数バイト数の下限
+RANDOM_BUFFER_SIZE = 1 << 16
+
+# iter_passwords で一度に生成する個数
+PASSWORD_CHUNK_SIZE = 10_000
+
+# 同じ文字の連続を制限する場合に、違反した行を作り直す回数の上限
+PASSWORD_MAX_RETRIES = 10_000
+
+# 見間違えやすい文字 (exclude_similar で除外する)
+SIMILAR_CHARACTERS = "Il1|O0o"
+
+
+class PasswordPolicy(NamedTuple):
+    """パスワードの生成ルール"""
+
+    length: int = 16
+    include_numbers: bool = True
+    # 使用する特殊文字 (空文字列なら特殊文字を使わない)
+    special_chars: str = ""
+    # 種類ごとに必ず含める最小の文字数
+    min_lowercase: int = 1
+    min_uppercase: int = 1
+    min_digits: int = 1
+    min_special: int = 1
+    # 見間違えやすい文字 (SIMILAR_CHARACTERS) を使わない
+    exclude_similar: bool = False
+    # 同じ文字が連続してよい最大数 (0 は制限なし)
+    max_repeat: int = 0
+
 
 def main():
     # --- アプリの基本設定 ---
@@ -26,10 +60,49 @@ def main():
         # st.multiselect はリストを返すので、文字列に結合する
         selected_special_chars = "".join(selected_list)
 
-    if st.button("パスワード生成！！"):
-        password = generate_password(
-            length, include_numbers, include_special_chars, selected_special_chars
+    policy = policy_from_options(
+        length, include_numbers, include_special_chars, selected_special_chars
+    )
+
+    # 詳細なルール (種類ごとの最小文字数、見間違えやすい文字の除外、同じ文字の連続)
+    with st.expander("詳細なルール"):
+        col1, col2, col3, col4 = st.columns(4)
+        policy = policy._replace(
+            min_lowercase=col1.number_input("小文字の最小数", 0, length, 1),
+            min_uppercase=col2.number_input("大文字の最小数", 0, length, 1),
+            min_digits=col3.number_input("数字の最小数", 0, length, 1),
+            min_special=col4.number_input("特殊文字の最小数", 0, length, 1),
+            exclude_similar=st.checkbox(f"見間違えやすい文字 ({SIMILAR_CHARACTERS}) を使わない"),
+            max_repeat=st.number_input("同じ文字が連続してよい最大数 (0 は制限なし)", 0, length, 0),
         )
+
+    try:
+        st.caption(f"推定エントロピー: {policy_entropy_bits(policy):.1f} ビット")
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    count = st.number_input("生成する個数", min_value=1, max_value=100_000, value=1)
+
+    if st.button("パスワード生成！！"):
+        if count > 1:
+            # 一括生成: 先頭の一部を表示し、全件はテキストファイルでダウンロード
+            try:
+                passwords = list(iter_passwords(policy, count))
+            except ValueError as e:
+                st.error(str(e))
+                return
+            st.success(f"{count:,} 個のパスワードを生成しました")
+            st.download_button(
+                "テキストファイルでダウンロード",
+                "\n".join(passwords) + "\n",
+                file_name="passwords.txt",
+                mime="text/plain",
+            )
+            st.code("\n".join(passwords[:20]))
+            return
+
+        password = generate_password(policy=policy)
         if password:
             col1, col2 = st.columns([2, 3])
             col1.success("生成されたパスワード:")
@@ -40,21 +113,245 @@ def main():
             )
 
 
-def generate_password(
+def policy_from_options(
     length, include_numbers, include_special_chars, selected_special_chars
-):
-    characters = string.ascii_letters
+) -> PasswordPolicy:
+    """画面のオプション (長さ・数字・特殊文字) から生成ルールを作る"""
+    return PasswordPolicy(
+        length=length,
+        include_numbers=include_numbers,
+        special_chars=selected_special_chars if include_special_chars else "",
+    )
 
-    if include_numbers:
-        characters += string.digits
 
-    # CheckboxがON で、かつ text_input に何かしらの文字が入力されている場合
-    if include_special_chars and selected_special_chars:
-        characters += selected_special_chars
+@lru_cache(maxsize=64)
+def build_character_classes(policy: PasswordPolicy) -> tuple[tuple[str, int], ...]:
+    """
+    使用する文字の種類 (小文字・大文字・数字・特殊文字) と、それぞれの最小文字数を返す。
+    見間違えやすい文字の除外はここで反映する。
+    """
+    classes = [
+        (string.ascii_lowercase, policy.min_lowercase),
+        (string.ascii_uppercase, policy.min_uppercase),
+    ]
 
-    # もし使用可能な文字が空だった場合（例：全部OFFにして記号も空にした）
-    if not characters:
-        return None  # エラー処理のためにNoneを返す
+    if policy.include_numbers:
+        classes.append((string.digits, policy.min_digits))
+
+    # 特殊文字が指定されている場合 (重複は除く)
+    if policy.special_chars:
+        classes.append(("".join(dict.fromkeys(policy.special_chars)), policy.min_special))
+
+    if policy.exclude_similar:
+        classes = [
+            ("".join(c for c in characters if c not in SIMILAR_CHARACTERS), min_count)
+            for characters, min_count in classes
+        ]
+
+    for characters, min_count in classes:
+        if not characters.isascii():
+            raise ValueError("ASCII 以外の文字は使用できません")
+        if not characters and min_count:
+            raise ValueError("最小文字数を指定した種類に、使用できる文字がありません")
+    if policy.length < sum(min_count for _, min_count in classes):
+        raise ValueError("パスワードの長さが、種類ごとの最小文字数の合計より短くなっています")
+    if policy.max_repeat and policy.length > policy.max_repeat:
+        if len(set("".join(characters for characters, _ in classes))) < 2:
+            raise ValueError("同じ文字の連続を制限するには、2種類以上の文字が必要です")
+        # 1文字だけの種類を min_count 文字含めるには、max_repeat 文字ごとに別の文字で区切る必要がある
+        for characters, min_count in classes:
+            if len(characters) == 1 and min_count > policy.max_repeat * (policy.length - min_count + 1):
+                raise ValueError(
+                    f"「{characters}」を {min_count} 文字含めると、同じ文字の連続を "
+                    f"{policy.max_repeat} 文字以下にできません"
+                )
 
-    password = "".join(random.choice(characters) for _ in range(length))
-    return password
+    return tuple((characters, min_count) for characters, min_count in classes if characters)
+
+
+@lru_cache(maxsize=64)
+def policy_entropy_bits(policy: PasswordPolicy) -> float:
+    """
+    ルールを満たすパスワードの総数の log2 (ビット)。
+    種類ごとの最小文字数を満たす文字列の数を、種類ごとに使う文字数で場合分けして数える。
+    同じ文字の連続の制限は含めないため、max_repeat を指定した場合は上限の値になる。
+    """
+    classes = build_character_classes(policy)
+
+    # ways[n]: これまでの種類の文字で n 文字分を埋める並べ方の数
+    ways = [1] + [0] * policy.length
+    for characters, min_count in classes:
+        size = len(characters)
+        next_ways = [0] * (policy.length + 1)
+        for used, count in enumerate(ways):
+            if not count:
+                continue
+            for n in range(min_count, policy.length - used + 1):
+                next_ways[used + n] += count * math.comb(used + n, n) * size**n
+        ways = next_ways
+    return math.log2(ways[policy.length])
+
+
+def secure_random_indices(count, size) -> np.ndarray:
+    """
+    0 以上 size 未満の一様な乱数を count 個返す (size は 1〜256)。
+    os.urandom からまとめて読み込んだバイトのうち、size の倍数の範囲に収まるものだけを使う
+    (棄却サンプリング) ため、剰余による偏りがない。
+    """
+    if not 1 <= size <= 256:
+        raise ValueError("size は 1〜256 の範囲で指定してください")
+
+    # 256 を size で割り切れる範囲 [0, limit) のバイトだけを採用する
+    limit = 256 - 256 % size
+    result = np.empty(count, dtype=np.uint8)
+    filled = 0
+    while filled < count:
+        # 採用率 limit / 256 を見込んで、足りない分より少し多めに読み込む
+        need = count - filled
+        buffer = np.frombuffer(
+            os.urandom(max(RANDOM_BUFFER_SIZE, need * 256 // limit + need // 8 + 16)),
+            dtype=np.uint8,
+        )
+        accepted = buffer[buffer < limit][:need]
+        result[filled : filled + len(accepted)] = accepted % size
+        filled += len(accepted)
+    return result
+
+
+def secure_shuffle_rows(codes: np.ndarray) -> np.ndarray:
+    """2次元配列の各行の並びを、os.urandom の乱数をキーにした並べ替えでシャッフルする"""
+    keys = np.frombuffer(os.urandom(codes.size * 8), dtype=np.uint64).reshape(codes.shape)
+    return np.take_along_axis(codes, np.argsort(keys, axis=1), axis=1)
+
+
+def find_repeated_runs(codes: np.ndarray, max_repeat) -> np.ndarray:
+    """同じ文字が max_repeat 文字より長く連続する行を True とする配列を返す"""
+    same = codes[:, 1:] == codes[:, :-1]
+    if same.shape[1] < max_repeat:
+        return np.zeros(len(codes), dtype=bool)
+    # 隣り合う文字の一致が max_repeat 回続けば、max_repeat + 1 文字の連続
+    windows = np.lib.stride_tricks.sliding_window_view(same, max_repeat, axis=1)
+    return windows.all(axis=2).any(axis=1)
+
+
+def generate_password_codes(count, length, classes) -> np.ndarray:
+    """
+    文字の種類 classes ((文字列, 最小文字数) のタプル) から、長さ length のパスワードを
+    count 行の文字コード (uint8) の配列として生成する。
+    各種類から最小文字数ずつ選んだ文字と、全種類を合わせた文字から選んだ残りの文字を並べ、
+    行ごとにシャッフルする (パスワードごとのやり直しは行わない)。
+    """
+    alphabet = "".join(dict.fromkeys("".join(characters for characters, _ in classes)))
+    alphabet_codes = np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)
+
+    codes = np.empty((count, length), dtype=np.uint8)
+    # 先頭の列: 各種類から最小文字数ずつ
+    column = 0
+    for characters, min_count in classes:
+        if not min_count:
+            continue
+        class_codes = np.frombuffer(characters.encode("ascii"), dtype=np.uint8)
+        codes[:, column : column + min_count] = class_codes[
+            secure_random_indices(count * min_count, len(class_codes))
+        ].reshape(count, min_count)
+        column += min_count
+    # 残りの列: 全種類を合わせた文字から
+    rest = length - column
+    codes[:, column:] = alphabet_codes[
+        secure_random_indices(count * rest, len(alphabet_codes))
+    ].reshape(count, rest)
+
+    return secure_shuffle_rows(codes)
+
+
+def generate_passwords_from_policy(
+    count, policy: PasswordPolicy, max_retries=PASSWORD_MAX_RETRIES
+) -> list[str]:
+    """
+    ルール policy に従ってパスワードを count 個生成する (暗号論的に安全な乱数を使用)。
+    同じ文字の連続を制限する場合は、違反した行だけをまとめて作り直す。
+    作り直しが max_retries 回を超えた場合は ValueError を送出する。
+    """
+    classes = build_character_classes(policy)
+    length = policy.length
+
+    codes = generate_password_codes(count, length, classes)
+    if policy.max_repeat:
+        rejected = find_repeated_runs(codes, policy.max_repeat)
+        retries = 0
+        while rejected.any():
+            if retries >= max_retries:
+                raise ValueError(
+                    "同じ文字の連続の制限を満たすパスワードを生成できませんでした。"
+                    "ルールを緩めてください"
+                )
+            retries += 1
+            codes[rejected] = generate_password_codes(int(rejected.sum()), length, classes)
+            rejected[rejected] = find_repeated_runs(codes[rejected], policy.max_repeat)
+
+    text = codes.tobytes().decode("ascii")
+    return [text[i : i + length] for i in range(0, count * length, length)]
+
+
+def iter_password_chunks(
+    policy: PasswordPolicy, count=None, chunk_size=PASSWORD_CHUNK_SIZE
+) -> Iterator[list[str]]:
+    """パスワードを chunk_size 個ずつのリストで順に返す (count が None の場合は無限に続く)"""
+    remaining = count
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        yield generate_passwords_from_policy(size, policy)
+        if remaining is not None:
+            remaining -= size
+
+
+def iter_passwords(
+    policy: PasswordPolicy, count=None, chunk_size=PASSWORD_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    パスワードを1つずつ返すジェネレーター。
+    chunk_size 個ずつまとめて生成するため、メモリに保持するのは1チャンク分だけ。
+    """
+    for chunk in iter_password_chunks(policy, count, chunk_size):
+        yield from chunk
+
+
+def write_passwords(
+    output: TextIO, policy: PasswordPolicy, count, chunk_size=PASSWORD_CHUNK_SIZE
+) -> int:
+    """パスワードを1行ずつ output に書き出し、書き出した個数を返す (チャンク単位で書き込む)"""
+    written = 0
+    for chunk in iter_password_chunks(policy, count, chunk_size):
+        output.write("\n".join(chunk) + "\n")
+        written += len(chunk)
+    return written
+
+
+def generate_passwords(
+    count, length, include_numbers, include_special_chars, selected_special_chars
+) -> list[str]:
+    """パスワードを count 個まとめて生成する (暗号論的に安全な乱数を使用)"""
+    policy = policy_from_options(
+        length, include_numbers, include_special_chars, selected_special_chars
+    )
+    return generate_passwords_from_policy(count, policy)
+
+
+def generate_password(
+    length=16,
+    include_numbers=True,
+    include_special_chars=True,
+    selected_special_chars=string.punctuation,
+    policy: PasswordPolicy | None = None,
+):
+    """パスワードを1つ生成する。policy を指定した場合は、ほかの引数より優先する"""
+    if policy is None:
+        policy = policy_from_options(
+            length, include_numbers, include_special_chars, selected_special_chars
+        )
+
+    # ルールを満たせない場合 (長さが最小文字数の合計に足りないなど)
+    try:
+        return generate_passwords_from_policy(1, policy)[0]
+    except ValueError:
+        return None  # エラー処理のためにNoneを返す
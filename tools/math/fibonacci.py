@@ -1,7 +1,13 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import matplotlib_fontja  # noqa: F401
-from typing import List
+from typing import Iterator, List
+
+# ページで選べる項数の上限 (F(1476) を超えると float で表せず、対数グラフに描けない)
+FIBONACCI_CHART_MAX_TERMS = 1000
+
+# 1項だけを求める場合の n の上限 (ページの入力欄)
+FIBONACCI_TERM_MAX_INDEX = 10 ** 6
 
 def generate_fibonacci(n: int) -> List[int]:
     """
@@ -25,17 +31,110 @@ def generate_fibonacci(n: int) -> List[int]:
         fibonacci.append(fibonacci[-1] + fibonacci[-2])
     return fibonacci
 
+def fibonacci_pair(n: int, modulus: int | None = None) -> tuple[int, int]:
+    """
+    (F(n), F(n + 1)) を高速倍加法で O(log n) 回の乗算で求める関数
+
+    F(2k) = F(k) * (2F(k + 1) - F(k)), F(2k + 1) = F(k)^2 + F(k + 1)^2 を
+    n の上位ビットから順に適用する。
+
+    Args:
+        n (int): 項の番号 (0 以上)
+        modulus (int | None): 指定した場合は modulus で割った余りを求める
+
+    Returns:
+        tuple: (F(n), F(n + 1))
+    """
+    if n < 0:
+        raise ValueError("項の番号は 0 以上で指定してください")
+    if modulus is not None and modulus < 1:
+        raise ValueError("法は 1 以上で指定してください")
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if modulus is not None:
+            c, d = c % modulus, d % modulus
+        a, b = (d, c + d) if bit == "1" else (c, d)
+        if modulus is not None:
+            b %= modulus
+    if modulus is not None:
+        a %= modulus
+    return a, b
+
+def fibonacci(n: int) -> int:
+    """
+    フィボナッチ数 F(n) を返す関数 (F(0) = 0, F(1) = 1)
+
+    Args:
+        n (int): 項の番号 (0 以上)
+
+    Returns:
+        int: F(n)
+    """
+    return fibonacci_pair(n)[0]
+
+def fibonacci_mod(n: int, modulus: int) -> int:
+    """
+    F(n) を modulus で割った余りを返す関数
+    途中の値も modulus で割るため、n が大きくても多倍長整数は大きくならない。
+
+    Args:
+        n (int): 項の番号 (0 以上)
+        modulus (int): 法 (1 以上)
+
+    Returns:
+        int: F(n) mod modulus
+    """
+    return fibonacci_pair(n, modulus)[0]
+
+def iter_fibonacci(start: int = 0, stop: int | None = None, modulus: int | None = None) -> Iterator[int]:
+    """
+    F(start), F(start + 1), ... を順に返すジェネレータ
+    最初の2項だけを高速倍加法で求め、以降は足し算で1項ずつ求める。
+
+    Args:
+        start (int): 最初の項の番号
+        stop (int | None): この番号の手前で終了する (None の場合は無限に続く)
+        modulus (int | None): 指定した場合は modulus で割った余りを返す
+
+    Yields:
+        int: フィボナッチ数
+    """
+    a, b = fibonacci_pair(start, modulus)
+    i = start
+    while stop is None or i < stop:
+        yield a
+        a, b = b, a + b
+        if modulus is not None:
+            b %= modulus
+        i += 1
+
 def gen_chart():
     with st.expander("**フィボナッチ数列**", expanded=True):
-        n = st.slider('フィボナッチ数列の要素数を選択してください', 1, 30, 10)
-        fibonacci_sequence = generate_fibonacci(n)
-        st.write(f"フィボナッチ数列（最初の{n}項）: {fibonacci_sequence}")
+        n = st.slider('フィボナッチ数列の要素数を選択してください', 1, FIBONACCI_CHART_MAX_TERMS, 10)
+        fibonacci_sequence = list(iter_fibonacci(stop=n))
+        if n <= 30:
+            st.write(f"フィボナッチ数列（最初の{n}項）: {fibonacci_sequence}")
+        else:
+            st.write(f"フィボナッチ数列（最初の{n}項）: 最後の項 F({n - 1}) は {len(str(fibonacci_sequence[-1]))} 桁")
 
-        # フィボナッチ数列のグラフ描画
+        # フィボナッチ数列のグラフ描画 (F(0) = 0 を含むため、0 付近を線形にした対数軸)
         fig, ax = plt.subplots()
-        ax.plot(range(n), fibonacci_sequence, marker='o')
+        ax.plot(range(n), [float(f) for f in fibonacci_sequence], marker='o' if n <= 100 else None)
+        ax.set_yscale('symlog', linthresh=1)
         ax.set_title('フィボナッチ数列のグラフ')
         ax.set_xlabel('項の番号')
-        ax.set_ylabel('値')
+        ax.set_ylabel('値 (対数軸)')
         ax.grid(True)
         st.pyplot(fig)
+
+        # 1項だけを求める (高速倍加法)
+        index = st.number_input('項の番号 n', min_value=0, max_value=FIBONACCI_TERM_MAX_INDEX, value=1000)
+        modulus = st.number_input('法 m', min_value=1, value=10 ** 9 + 7)
+        term = fibonacci(index)
+        st.write(
+            f"F({index}) は {term.bit_length()} ビット、下10桁は {term % 10 ** 10:010d}、"
+            f"F({index}) mod {modulus} = {fibonacci_mod(index, modulus)}"
+        )
@@ -1,7 +1,23 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 from collections import Counter
+from math import gcd, isqrt
+import random
+import numpy as np
 import pandas as pd
+from tools.math.sequence_cache import get_sequence, get_sequence_cache_stats
+
+# NumPy で一括判定する際の1チャンクの件数
+KAPREKAR_CHUNK_SIZE = 1 << 20
+
+# int64 で平方数を計算できる最大桁数 (n < 10^9 なら n^2 < 10^18)
+KAPREKAR_NUMPY_MAX_DIGITS = 9
+
+# 約数から求める場合の最大桁数 (10^29 - 1 までは素因数分解が一瞬で終わる)
+KAPREKAR_DIVISOR_MAX_DIGITS = 15
+
+# 探索結果のキャッシュのバージョン (探索方法を変えたら上げる)
+KAPREKAR_CACHE_VERSION = 1
 
 
 def is_kaprekar_number(n: int) -> bool:
@@ -63,6 +79,192 @@ def find_kaprekar_numbers(max_digits: int) -> list:
     return kaprekar_numbers
 
 
+def find_kaprekar_numbers_fast(max_digits: int, chunk_size: int = KAPREKAR_CHUNK_SIZE) -> list:
+    """
+    find_kaprekar_numbers と同じ結果を、文字列を使わずに求める関数。
+    n をチャンク (NumPy の int64 配列) ごとにまとめ、平方数を 10 の累乗で divmod して
+    すべての分割位置を一括で判定する。
+
+    Args:
+        max_digits (int): 最大桁数 (1〜KAPREKAR_NUMPY_MAX_DIGITS)。
+        chunk_size (int): 1チャンクの件数。
+
+    Returns:
+        list: カプレカ数のリスト。
+    """
+    if not 1 <= max_digits <= KAPREKAR_NUMPY_MAX_DIGITS:
+        raise ValueError(f"最大桁数は 1〜{KAPREKAR_NUMPY_MAX_DIGITS} の範囲で指定してください")
+
+    kaprekar_numbers = [1]
+    upper_limit = 10 ** max_digits
+    for start in range(2, upper_limit, chunk_size):
+        n = np.arange(start, min(start + chunk_size, upper_limit), dtype=np.int64)
+        square = n * n
+        found = np.zeros(len(n), dtype=bool)
+        # 右側の桁数 m ごとに、左側 (1以上) + 右側 (0以外) が n になるか判定する
+        for m in range(1, 2 * max_digits):
+            left, right = np.divmod(square, 10 ** m)
+            found |= (left > 0) & (right > 0) & (left + right == n)
+        kaprekar_numbers.extend(n[found].tolist())
+
+    return kaprekar_numbers
+
+
+def is_probable_prime(n: int) -> bool:
+    """ミラー・ラビン法による素数判定 (2^64 未満は確定的、それ以上は十分な確度)"""
+    if n < 2:
+        return False
+    small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in small_primes:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def find_factor(n: int) -> int:
+    """合成数 n の 1 と n 以外の約数を1つ返す (ポラードのロー法、ブレントの改良版)"""
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorize(n: int) -> dict:
+    """n を素因数分解し、{素数: 指数} を返す"""
+    factors = {}
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        root = isqrt(m)
+        if root * root == m:
+            stack.extend((root, root))
+            continue
+        d = find_factor(m)
+        stack.extend((d, m // d))
+    return factors
+
+
+def find_kaprekar_numbers_by_split(m: int) -> list:
+    """
+    平方数を「右側 m 桁」で分割したときにカプレカ数になる n をすべて返す関数。
+    n^2 = q * 10^m + r かつ n = q + r (q >= 1, 0 < r < 10^m) は
+    n(n - 1) = q(10^m - 1) と同値で、n < 10^m となる。
+    10^m - 1 = a * b (a, b は互いに素) と分けるごとに、n ≡ 0 (mod a), n ≡ 1 (mod b) の解が
+    1つずつ決まる (中国剰余定理)。
+
+    Args:
+        m (int): 右側の桁数。
+
+    Returns:
+        list: カプレカ数のリスト (昇順)。
+    """
+    modulus = 10 ** m - 1
+    prime_powers = [p ** e for p, e in factorize(modulus).items()]
+
+    found = set()
+    for mask in range(1 << len(prime_powers)):
+        a = 1
+        for i, prime_power in enumerate(prime_powers):
+            if mask >> i & 1:
+                a *= prime_power
+        b = modulus // a
+        # n ≡ 0 (mod a), n ≡ 1 (mod b) の解 (0 の場合は n = 10^m - 1)
+        n = a * pow(a, -1, b) % modulus or modulus
+        # 左側 q = n(n - 1) / (10^m - 1) が 1 以上であること
+        if n * (n - 1) >= modulus:
+            found.add(n)
+    return sorted(found)
+
+
+def find_kaprekar_numbers_by_divisors(max_digits: int, min_digits: int = 1) -> list:
+    """
+    find_kaprekar_numbers と同じ結果を、10^m - 1 の約数から直接求める関数。
+    n を1つずつ調べないため、10桁以上でも計算できる。
+
+    Args:
+        max_digits (int): 最大桁数 (1〜KAPREKAR_DIVISOR_MAX_DIGITS)。
+        min_digits (int): 最小桁数。
+
+    Returns:
+        list: カプレカ数のリスト。
+    """
+    if not 1 <= max_digits <= KAPREKAR_DIVISOR_MAX_DIGITS:
+        raise ValueError(f"最大桁数は 1〜{KAPREKAR_DIVISOR_MAX_DIGITS} の範囲で指定してください")
+
+    lower_limit = 10 ** (max(min_digits, 1) - 1)
+    upper_limit = 10 ** max_digits
+    found = {1} if lower_limit == 1 else set()
+    # n < 10^m なので右側の桁数は min_digits 以上、
+    # n < 10^max_digits なので平方数の右側の桁数は 2 * max_digits - 1 まで
+    for m in range(max(min_digits, 1), 2 * max_digits):
+        found.update(
+            n for n in find_kaprekar_numbers_by_split(m) if lower_limit <= n < upper_limit
+        )
+    return sorted(found)
+
+
+def find_kaprekar_numbers_cached(max_digits: int) -> list:
+    """
+    find_kaprekar_numbers_by_divisors の結果をキャッシュ (メモリとディスク) から返す関数。
+    より少ない桁数まで計算済みの場合は、足りない桁数だけを計算して延長する。
+
+    Args:
+        max_digits (int): 最大桁数 (1〜KAPREKAR_DIVISOR_MAX_DIGITS)。
+
+    Returns:
+        list: カプレカ数のリスト。
+    """
+    if not 1 <= max_digits <= KAPREKAR_DIVISOR_MAX_DIGITS:
+        raise ValueError(f"最大桁数は 1〜{KAPREKAR_DIVISOR_MAX_DIGITS} の範囲で指定してください")
+
+    return get_sequence(
+        "kaprekar",
+        max_digits,
+        lambda start, end: find_kaprekar_numbers_by_divisors(end, min_digits=start + 1),
+        version=KAPREKAR_CACHE_VERSION,
+    )
+
+
 def gen_chart():
     """
     カプレカ数をグラフ表示し、データフレームで表示する。
@@ -70,10 +272,17 @@ def gen_chart():
     with st.expander("**カプレカ数 (Kaprekar Numbers) グラフ**", expanded=True):
 
 
-        max_digits = st.slider("最大桁数を選択", min_value=1, max_value=6, value=4)
+        max_digits = st.slider(
+            "最大桁数を選択", min_value=1, max_value=KAPREKAR_DIVISOR_MAX_DIGITS, value=4
+        )
         st.write(f"{max_digits}桁までのカプレカ数を表示します。")
 
-        kaprekar_numbers = find_kaprekar_numbers(max_digits)
+        kaprekar_numbers = find_kaprekar_numbers_cached(max_digits)
+        stats = get_sequence_cache_stats()
+        st.caption(
+            f"キャッシュ: ヒット {stats.hits} 回 / ディスク {stats.disk_hits} 回 / "
+            f"延長 {stats.extensions} 回 / ミス {stats.misses} 回"
+        )
 
         # カプレカ数をデータフレームで表示
         with st.expander("**カプレカ数の詳細**", expanded=True):
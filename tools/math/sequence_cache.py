@@ -0,0 +1,152 @@
+"""
+数列の探索結果のキャッシュ
+カプレカ数のように、結果が変わらない「d 桁までの数列」の探索結果をメモリとディスクに保存する。
+d 桁まで計算済みの数列は、d + 1 桁以降だけを追加で計算して延長する。
+"""
+
+from typing import Callable, NamedTuple
+from bisect import bisect_left
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# キャッシュの保存先 (環境変数 SEQUENCE_CACHE_DIR で変更可能)
+SEQUENCE_CACHE_DIR = os.environ.get(
+    "SEQUENCE_CACHE_DIR",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache", "sequences"
+    ),
+)
+# 保存形式を変えたときに上げる (数列ごとの計算方法の変更は get_sequence の version で表す)
+SEQUENCE_CACHE_VERSION = 1
+
+
+class SequenceCacheStats(NamedTuple):
+    """キャッシュの利用状況 (プロセス起動時または clear_sequence_cache からの累計)"""
+
+    hits: int  # メモリ上の結果で足りた回数
+    disk_hits: int  # ディスクから読み込んだ結果で足りた回数
+    extensions: int  # 計算済みの桁数から延長した回数
+    misses: int  # 最初から計算した回数
+
+
+sequence_cache_lock = threading.Lock()
+sequence_cache_state = {
+    "entries": {},
+    "hits": 0,
+    "disk_hits": 0,
+    "extensions": 0,
+    "misses": 0,
+}
+
+
+def sequence_cache_path(name: str, cache_dir: str = SEQUENCE_CACHE_DIR) -> str:
+    """数列 name のキャッシュファイルのパスを返します。"""
+    return os.path.join(cache_dir, f"{name}.json")
+
+
+def load_sequence_entry(name: str, version: int, cache_dir: str = SEQUENCE_CACHE_DIR) -> dict | None:
+    """ディスクからキャッシュを読み込みます。存在しない・壊れている・バージョンが異なる場合は None を返します。"""
+    try:
+        with open(sequence_cache_path(name, cache_dir), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("format") != SEQUENCE_CACHE_VERSION or entry.get("version") != version:
+        return None
+    return entry
+
+
+def save_sequence_entry(name: str, entry: dict, cache_dir: str = SEQUENCE_CACHE_DIR) -> None:
+    """
+    キャッシュをディスクに書き込みます。
+    一時ファイルに書いてから置き換えるため、他のプロセスが途中の状態を読むことはありません。
+    一時ファイルは書き込みごとに別名で作るため、複数のスレッドやプロセスが同時に書き込んでも衝突しません。
+    書き込めない場合はメモリ上のキャッシュだけを使います。
+    """
+    path = sequence_cache_path(name, cache_dir)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("数列のキャッシュを保存できませんでした: %s (%s)", path, e)
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+
+def get_sequence(
+    name: str,
+    digits: int,
+    extend: Callable[[int, int], list[int]],
+    version: int = 1,
+    cache_dir: str = SEQUENCE_CACHE_DIR,
+) -> list[int]:
+    """
+    数列 name のうち digits 桁以下 (10^digits 未満) の項を昇順で返します。
+    メモリ → ディスクの順にキャッシュを探し、足りない桁だけを extend で計算して保存します。
+
+    Args:
+        name (str): 数列の名前 (キャッシュファイル名になる)。
+        digits (int): 最大桁数。
+        extend (Callable): extend(start_digits, end_digits) で
+            start_digits より多く end_digits 以下の桁数の項を昇順で返す関数。
+        version (int): 計算方法のバージョン。異なるキャッシュは使わずに計算し直す。
+        cache_dir (str): ディスクキャッシュの保存先。
+
+    Returns:
+        list[int]: 数列の項のリスト。
+    """
+    with sequence_cache_lock:
+        entry = sequence_cache_state["entries"].get(name)
+        if entry is not None and entry["version"] == version and entry["digits"] >= digits:
+            sequence_cache_state["hits"] += 1
+        else:
+            if entry is None or entry["version"] != version:
+                entry = load_sequence_entry(name, version, cache_dir)
+            if entry is not None and entry["digits"] >= digits:
+                sequence_cache_state["disk_hits"] += 1
+            else:
+                if entry is None:
+                    sequence_cache_state["misses"] += 1
+                    entry = {"format": SEQUENCE_CACHE_VERSION, "version": version, "digits": 0, "values": []}
+                else:
+                    sequence_cache_state["extensions"] += 1
+                entry = {
+                    **entry,
+                    "digits": digits,
+                    "values": entry["values"] + list(extend(entry["digits"], digits)),
+                }
+                save_sequence_entry(name, entry, cache_dir)
+            sequence_cache_state["entries"][name] = entry
+
+    values = entry["values"]
+    return values[: bisect_left(values, 10 ** digits)]
+
+
+def get_sequence_cache_stats() -> SequenceCacheStats:
+    """キャッシュの利用状況を返します。"""
+    with sequence_cache_lock:
+        return SequenceCacheStats(
+            hits=sequence_cache_state["hits"],
+            disk_hits=sequence_cache_state["disk_hits"],
+            extensions=sequence_cache_state["extensions"],
+            misses=sequence_cache_state["misses"],
+        )
+
+
+def clear_sequence_cache() -> None:
+    """メモリ上のキャッシュと利用状況をクリアします (ディスクのキャッシュは残します)。"""
+    with sequence_cache_lock:
+        sequence_cache_state["entries"].clear()
+        for key in ("hits", "disk_hits", "extensions", "misses"):
+            sequence_cache_state[key] = 0
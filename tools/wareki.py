@@ -1,20 +1,189 @@
 from datetime import datetime, date
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple
 import calendar
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
 from supabase import Client
 from libs.supabase_client import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
+# 元号データのスナップショット (環境変数 WAREKI_SNAPSHOT_PATH で保存先を変更可能)
+WAREKI_SNAPSHOT_PATH = os.environ.get(
+    "WAREKI_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "warekis.json"),
+)
+WAREKI_SNAPSHOT_VERSION = 1
+WAREKI_SNAPSHOT_TTL = 3600  # 1時間を過ぎたらバックグラウンドで再検証する
+WAREKI_SNAPSHOT_RETRY_INTERVAL = 60  # 再検証に失敗した場合の再実行間隔
+
+# datetime64[D] の 0 (1970-01-01) に対応する date.toordinal
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+# --- 元号インデックス ---
+class EraIndex(NamedTuple):
+    """元号の開始日・終了日 (date.toordinal) と元号データを start_date の昇順に保持します。"""
+
+    start_ordinals: list[int]
+    end_ordinals: list[int]
+    eras: list[dict]
+
+
+def build_era_index(wareki_data: list[dict]) -> EraIndex:
+    """warekis テーブルの行から、bisect で検索できる元号インデックスを作成します。"""
+    eras = sorted(wareki_data or [], key=lambda d: d["start_date"])
+    return EraIndex(
+        start_ordinals=[date.fromisoformat(d["start_date"]).toordinal() for d in eras],
+        end_ordinals=[date.fromisoformat(d["end_date"]).toordinal() for d in eras],
+        eras=eras,
+    )
+
+
+def find_era(era_index: EraIndex, target_date: date) -> dict | None:
+    """指定日を含む元号データを O(log n) で返します。該当がなければ None を返します。"""
+    ordinal = target_date.toordinal()
+    i = bisect_right(era_index.start_ordinals, ordinal) - 1
+    if i < 0 or ordinal > era_index.end_ordinals[i]:
+        return None
+    return era_index.eras[i]
+
+
+def format_wareki(era_info: dict, target_date: date) -> str:
+    """元号データと日付から「令和元年5月1日」形式の和暦文字列を作成します。"""
+    wareki_year_num = target_date.year - int(era_info["start_date"][:4]) + 1
+    wareki_year_str = "元年" if wareki_year_num == 1 else f"{wareki_year_num}年"
+    return f"{era_info['gengo']}{wareki_year_str}{target_date.month}月{target_date.day}日"
+
+
+def convert_seireki_2_wareki_bulk(era_index: EraIndex, dates) -> pd.DataFrame:
+    """
+    西暦の日付列 (datetime64 配列 / pandas Series など) を一括で和暦に変換します。
+    元号の境界に対する searchsorted で元号を割り当て、和暦年・月・日は配列演算で求めます。
+    和暦文字列は重複しない日付だけを整形し、カテゴリ型の列として展開します。
+    元号が見つからない日付 (NaT を含む) の era / era_year / wareki は欠損値になります。
+
+    Returns:
+        DataFrame: 列 era, era_year, month, day, wareki (Series を渡した場合はその index を引き継ぐ)
+    """
+    index = dates.index if isinstance(dates, pd.Series) else None
+    days = np.asarray(dates)
+    if days.dtype.kind != "M":
+        days = np.asarray(pd.to_datetime(dates))
+    days = days.astype("datetime64[D]")
+    day_numbers = days.astype(np.int64)
+    is_nat = np.isnat(days)
+
+    # 元号の割り当て: 開始日の searchsorted + 終了日の範囲チェック
+    starts = np.array(era_index.start_ordinals, dtype=np.int64) - EPOCH_ORDINAL
+    ends = np.array(era_index.end_ordinals, dtype=np.int64) - EPOCH_ORDINAL
+    codes = np.searchsorted(starts, day_numbers, side="right") - 1
+    valid = ~is_nat & (codes >= 0)
+    valid[valid] = day_numbers[valid] <= ends[codes[valid]]
+    codes[~valid] = -1
+
+    # 和暦年 = 西暦年 - 元号開始西暦年 + 1
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    day_of_month = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+    start_years = np.array(
+        [int(d["start_date"][:4]) for d in era_index.eras] + [0], dtype=np.int64
+    )
+    era_years = years - start_years[codes] + 1
+
+    # 和暦文字列: 重複しない日付だけ整形し、カテゴリのコードとして展開する
+    unique_days, inverse = np.unique(day_numbers[valid], return_inverse=True)
+    unique_codes = np.searchsorted(starts, unique_days, side="right") - 1
+    formatted = [
+        format_wareki(era_index.eras[c], d)
+        for c, d in zip(unique_codes.tolist(), unique_days.astype("datetime64[D]").tolist())
+    ]
+    wareki_codes = np.full(len(days), -1, dtype=np.int64)
+    wareki_codes[valid] = inverse
+
+    return pd.DataFrame(
+        {
+            "era": pd.Categorical.from_codes(
+                codes, categories=[d["gengo"] for d in era_index.eras]
+            ),
+            "era_year": pd.arrays.IntegerArray(era_years, ~valid),
+            "month": pd.arrays.IntegerArray(months, is_nat),
+            "day": pd.arrays.IntegerArray(day_of_month, is_nat),
+            "wareki": pd.Categorical.from_codes(wareki_codes, categories=formatted),
+        },
+        index=index,
+    )
+
+
+def convert_wareki_2_seireki_bulk(
+    era_index: EraIndex, gengo, wareki_year, month, day
+) -> np.ndarray:
+    """
+    和暦 (元号, 和暦年, 月, 日) の列を一括で西暦の datetime64[D] 配列に変換します。
+    存在しない日付や未知の元号は NaT になります。
+    """
+    start_year_map = {d["gengo"]: int(d["start_date"][:4]) for d in era_index.eras}
+    start_years = pd.Series(np.asarray(gengo)).map(start_year_map).to_numpy()
+    seireki_year = start_years + np.asarray(wareki_year) - 1
+
+    seireki = pd.to_datetime(
+        {"year": seireki_year, "month": np.asarray(month), "day": np.asarray(day)},
+        errors="coerce",
+    )
+    return seireki.to_numpy(dtype="datetime64[D]")
+
+
+def get_era_index(_supabase: Client) -> EraIndex:
+    """
+    元号データのスナップショットから作成済みの、プロセスで共有する元号インデックスを返します。
+    インデックスはスナップショットが更新されたときにだけ作り直します。
+    """
+    fetch_wareki_data(_supabase)
+    return wareki_snapshot_state["era_index"]
+
+
 # --- ユーティリティ関数 ---
 # 西暦を和暦に変換する関数
-def convert_seireki_2_wareki(supabase: Client, year: int, month: int, day: int):
-    """西暦の日付を和暦に変換して返します。"""
+def convert_seireki_2_wareki(
+    supabase: Client, year: int, month: int, day: int, verify: bool = False
+):
+    """
+    西暦の日付を和暦に変換して返します。
+    元号インデックスをプロセス内で検索するため、通信は発生しません。
+    verify=True の場合は Supabase RPC (get_era_date) の結果と照合し、
+    食い違いがあれば警告を記録して RPC の結果を返します。
+    """
     try:
-        target_date = datetime(year, month, day).strftime("%Y-%m-%d")
-        res = supabase.rpc("get_era_date", {"seireki_date": target_date}).execute()
-
-        # 修正: Supabase RPC が和暦文字列を直接返すケースを想定
-        if res.data:
-            return res.data
+        target_date = date(year, month, day)
+        era_info = find_era(get_era_index(supabase), target_date)
+        wareki = format_wareki(era_info, target_date) if era_info else None
+
+        if verify:
+            res = supabase.rpc(
+                "get_era_date", {"seireki_date": target_date.strftime("%Y-%m-%d")}
+            ).execute()
+            if res.data and res.data != wareki:
+                logger.warning(
+                    "和暦の変換結果が RPC と一致しません: %s (ローカル: %s, RPC: %s)",
+                    target_date,
+                    wareki,
+                    res.data,
+                )
+                wareki = res.data
+
+        if wareki:
+            return wareki
 
         return "日付に対応する元号が見つかりません"
 
@@ -49,28 +218,45 @@ def create_wareki_year_options(era_info: dict) -> tuple[list[str], int, date]:
     """
     元号情報から和暦年の選択肢リスト（文字列）、デフォルトインデックス、開始日を生成します。
     現在の元号の場合、最大50年後までの選択肢を含みます。
+    選択肢は元号と今年の西暦年ごとにプロセス内でキャッシュし、日付が変わったら作り直します。
     """
-    start_date_obj = datetime.strptime(era_info["start_date"], "%Y-%m-%d").date()
     today = date.today()
+    with wareki_options_lock:
+        if wareki_options_cache_state["day"] != today:
+            build_wareki_year_options.cache_clear()
+            wareki_options_cache_state["day"] = today
+
+    wareki_year_options, default_index, start_date_obj = build_wareki_year_options(
+        era_info["start_date"], era_info["end_date"], today.year
+    )
+    return list(wareki_year_options), default_index, start_date_obj
+
+
+@lru_cache(maxsize=128)
+def build_wareki_year_options(
+    start_date: str, end_date: str, today_year: int
+) -> tuple[tuple[str, ...], int, date]:
+    """元号の開始日・終了日と今年の西暦年から、和暦年の選択肢とデフォルトインデックスを作成します。"""
+    start_date_obj = date.fromisoformat(start_date)
 
     final_wareki_year: int
     default_wareki_year: int
 
-    if era_info["end_date"] == "9999-12-31":
+    if end_date == "9999-12-31":
         # --- 現在の元号 (例: 令和) の場合 ---
 
         # 1. 選択肢の最後の年を計算 (今から50年後)
         # (50年後の西暦年 - 元号開始西暦年 + 1)
-        future_year = today.year + 50
+        future_year = today_year + 50
         final_wareki_year = future_year - start_date_obj.year + 1
 
         # 2. デフォルトで選択される年を計算 (今年の和暦年)
         # (今日の西暦年 - 元号開始西暦年 + 1)
-        default_wareki_year = today.year - start_date_obj.year + 1
+        default_wareki_year = today_year - start_date_obj.year + 1
 
     else:
         # --- 過去の元号 (例: 平成, 昭和) の場合 ---
-        end_date_obj = datetime.strptime(era_info["end_date"], "%Y-%m-%d").date()
+        end_date_obj = date.fromisoformat(end_date)
 
         # 1. 選択肢の最後の年を計算 (元号の終了年)
         # (終了西暦年 - 元号開始西暦年 + 1)
@@ -81,13 +267,10 @@ def create_wareki_year_options(era_info: dict) -> tuple[list[str], int, date]:
         default_wareki_year = final_wareki_year
 
     # 選択肢リストを作成 (1年から final_wareki_year まで)
-    wareki_year_options = []
     # final_wareki_year + 1 にして、その年自身を含むようにします
-    for year in range(1, final_wareki_year + 1):
-        if year == 1:
-            wareki_year_options.append("元年")
-        else:
-            wareki_year_options.append(f"{year}年")
+    wareki_year_options = ("元年",) + tuple(
+        f"{year}年" for year in range(2, final_wareki_year + 1)
+    )
 
     # デフォルトインデックスを計算 (0ベースインデックス)
     # default_wareki_year は 1始まり (例: 令和6年 = 6)
@@ -102,28 +285,165 @@ def create_wareki_year_options(era_info: dict) -> tuple[list[str], int, date]:
     if default_index >= len(wareki_year_options):
         default_index = len(wareki_year_options) - 1
 
-
     return wareki_year_options, default_index, start_date_obj
 
 
-@st.cache_data(ttl=3600)  # 1時間データをキャッシュ
-def fetch_wareki_data(_supabase: Client):
+# 和暦年の選択肢キャッシュを作った日付 (日付が変わったらキャッシュを破棄する)
+wareki_options_lock = threading.Lock()
+wareki_options_cache_state = {"day": None}
+
+# 月・日の選択肢 (プロセスで1回だけ作成)
+MONTH_OPTIONS = list(range(1, 13))
+DAY_OPTIONS = {last_day: list(range(1, last_day + 1)) for last_day in (28, 29, 30, 31)}
+MONTH_LENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def get_month_length(year: int, month: int) -> int:
+    """指定年月の日数を、月の日数表とうるう年判定から返します。"""
+    if month == 2 and calendar.isleap(year):
+        return 29
+    return MONTH_LENGTHS[month - 1]
+
+
+@lru_cache(maxsize=4)
+def get_seireki_year_options(today_year: int) -> list[int]:
+    """西暦年の選択肢 (今年の50年後から1861年まで、降順) を今年の西暦年ごとに作成します。"""
+    return list(range(today_year + 50, 1860, -1))
+
+
+# --- 元号データのスナップショット (オフラインファースト) ---
+def load_wareki_snapshot(path: str = WAREKI_SNAPSHOT_PATH) -> dict | None:
+    """ディスク上のスナップショットを読み込みます。存在しない・形式が古い場合は None を返します。"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("version") != WAREKI_SNAPSHOT_VERSION or not snapshot.get("rows"):
+        return None
+    return snapshot
+
+
+def build_wareki_snapshot(rows: list[dict]) -> dict:
+    """元号データからスナップショットを作成します。etag は行データの SHA-256 です。"""
+    body = json.dumps(rows, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return {
+        "version": WAREKI_SNAPSHOT_VERSION,
+        "etag": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        "fetched_at": time.time(),
+        "rows": rows,
+    }
+
+
+def save_wareki_snapshot(snapshot: dict, path: str = WAREKI_SNAPSHOT_PATH) -> None:
+    """
+    スナップショットをディスクに書き込みます。
+    一時ファイルに書いてから置き換えるため、他のプロセスが途中の状態を読むことはありません。
+    一時ファイルは書き込みごとに別名で作るため、同じプロセスの複数スレッドが同時に書き込んでも衝突しません。
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def set_wareki_snapshot(snapshot: dict) -> None:
+    """メモリ上のスナップショットを差し替え、etag が変わった場合だけ元号インデックスを作り直します。"""
+    with wareki_snapshot_lock:
+        current = wareki_snapshot_state["snapshot"]
+        if current is None or current["etag"] != snapshot["etag"]:
+            wareki_snapshot_state["era_index"] = build_era_index(snapshot["rows"])
+        wareki_snapshot_state["snapshot"] = snapshot
+        wareki_snapshot_state["refresh_at"] = snapshot["fetched_at"] + WAREKI_SNAPSHOT_TTL
+
+
+def fetch_wareki_rows(supabase: Client) -> list[dict]:
     """Supabaseから元号データを取得し、start_dateの昇順でソートします。"""
+    response = (
+        supabase.table("warekis").select("*").order("start_date", desc=False).execute()
+    )
+    return response.data or []
+
+
+def refresh_wareki_snapshot(supabase: Client) -> None:
+    """
+    スナップショットをバックグラウンドで再検証します。
+    他のプロセスが既に新しいスナップショットを書き込んでいればそれを読み込み、
+    そうでなければ Supabase から取得してディスクとメモリを更新します。
+    保存先は呼び出し時の WAREKI_SNAPSHOT_PATH です。
+    """
     try:
-        response = (
-            _supabase.table("warekis")
-            .select("*")
-            .order("start_date", desc=False)
-            .execute()
-        )
-        if response.data:
-            return response.data
-        else:
-            st.error("warekisテーブルからデータを取得できませんでした。")
-            return
+        snapshot = load_wareki_snapshot(WAREKI_SNAPSHOT_PATH)
+        if snapshot is None or time.time() - snapshot["fetched_at"] >= WAREKI_SNAPSHOT_TTL:
+            rows = fetch_wareki_rows(supabase)
+            if not rows:
+                raise ValueError("warekisテーブルからデータを取得できませんでした。")
+            snapshot = build_wareki_snapshot(rows)
+            save_wareki_snapshot(snapshot, WAREKI_SNAPSHOT_PATH)
+        set_wareki_snapshot(snapshot)
     except Exception as e:
-        st.error(f"Supabaseからのデータ取得中にエラーが発生しました: {e}")
-        return []
+        logger.warning("元号データのスナップショット更新に失敗しました: %s", e)
+        # 失敗時は再実行までの間隔を空け、Supabase の障害中にリクエストが集中しないようにする
+        wareki_snapshot_state["refresh_at"] = time.time() + WAREKI_SNAPSHOT_RETRY_INTERVAL
+    finally:
+        wareki_snapshot_state["refreshing"] = False
+
+
+def fetch_wareki_data(_supabase: Client):
+    """
+    元号データ (start_dateの昇順) を返します。
+    スナップショットがあれば常にそれを即座に返し、1時間を過ぎていれば
+    バックグラウンドで再検証します (stale-while-revalidate)。
+    スナップショットが1つもない初回だけ、Supabaseから同期的に取得します。
+    """
+    snapshot = wareki_snapshot_state["snapshot"]
+
+    if snapshot is None:
+        try:
+            rows = fetch_wareki_rows(_supabase)
+            if not rows:
+                st.error("warekisテーブルからデータを取得できませんでした。")
+                return []
+            snapshot = build_wareki_snapshot(rows)
+            try:
+                save_wareki_snapshot(snapshot, WAREKI_SNAPSHOT_PATH)
+            except OSError as e:
+                logger.warning("元号データのスナップショットを保存できませんでした: %s", e)
+            set_wareki_snapshot(snapshot)
+        except Exception as e:
+            st.error(f"Supabaseからのデータ取得中にエラーが発生しました: {e}")
+            return []
+
+    elif time.time() >= wareki_snapshot_state["refresh_at"]:
+        with wareki_snapshot_lock:
+            start_refresh = not wareki_snapshot_state["refreshing"]
+            wareki_snapshot_state["refreshing"] = True
+        if start_refresh:
+            threading.Thread(
+                target=refresh_wareki_snapshot, args=(_supabase,), daemon=True
+            ).start()
+
+    return snapshot["rows"]
+
+
+# スナップショットの状態 (プロセス内で共有)。インポート時にディスクから読み込む
+wareki_snapshot_lock = threading.Lock()
+wareki_snapshot_state = {
+    "snapshot": None,
+    "era_index": build_era_index([]),
+    "refresh_at": 0.0,
+    "refreshing": False,
+}
+if (initial_snapshot := load_wareki_snapshot()) is not None:
+    set_wareki_snapshot(initial_snapshot)
 
 
 # --- Streamlit アプリ本体 ---
@@ -150,22 +470,22 @@ def display_streamlit_app():
         with cols[0]:
             year = st.selectbox(
                 "年 (西暦)",
-                options=list(range(today.year + 50, 1860, -1)),
+                options=get_seireki_year_options(today.year),
                 index=50,
                 key="seireki_year",
             )
         with cols[1]:
             month = st.selectbox(
                 "月",
-                options=list(range(1, 13)),
+                options=MONTH_OPTIONS,
                 index=today.month - 1,
                 key="seireki_month",
             )
         with cols[2]:
-            last_day = calendar.monthrange(year, month)[1]
+            last_day = get_month_length(year, month)
             day = st.selectbox(
                 "日",
-                options=list(range(1, last_day + 1)),
+                options=DAY_OPTIONS[last_day],
                 index=today.day - 1,
                 key="seireki_day",
             )
@@ -223,15 +543,15 @@ def display_streamlit_app():
         with cols[2]:
             month2 = st.selectbox(
                 "月",
-                options=list(range(1, 13)),
+                options=MONTH_OPTIONS,
                 index=today.month - 1,
                 key="wareki_month_2",
             )
         with cols[3]:
-            last_day = calendar.monthrange(start_date_obj.year, month2)[1]
+            last_day = get_month_length(start_date_obj.year, month2)
             day2 = st.selectbox(
                 "日",
-                options=list(range(1, last_day + 1)),
+                options=DAY_OPTIONS[last_day],
                 index=today.day - 1,
                 key="wareki_day_2",
             )